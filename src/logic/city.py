@@ -1,4 +1,9 @@
+import heapq
 import random
+from array import array
+
+from .order import Order
+from .spatial_index import OrderSpatialIndex
 
 
 class City:
@@ -11,6 +16,59 @@ class City:
         self.tiles = map_data.get("tiles")
         self.legend = map_data.get("legend")
         self.goal = map_data.get("goal")
+        self._build_grid()
+
+    def _build_grid(self):
+        """
+        Precalcula la cuadrícula empaquetada (fila mayor, índice y * width + x):
+        - blocked: bytearray con 1 si el tile está bloqueado.
+        - surface: array('f') (float32) con el peso de superficie.
+        Los tiles ausentes o sin leyenda se consideran bloqueados.
+        """
+        legend = self.legend or {}
+        blocked_by_tile = {}
+        weight_by_tile = {}
+        for key, info in legend.items():
+            blocked_by_tile[key] = 1 if info.get("blocked", False) else 0
+            weight_by_tile[key] = info.get("surface_weight", 1.0)
+
+        size = self.width * self.height
+        self.blocked = bytearray(b"\x01") * size
+        self.surface = array("f", [1.0]) * size
+
+        for y in range(min(self.height, len(self.tiles or []))):
+            row = self.tiles[y]
+            base = y * self.width
+            for x in range(min(self.width, len(row))):
+                tile = row[x]
+                if tile in blocked_by_tile:
+                    self.blocked[base + x] = blocked_by_tile[tile]
+                    self.surface[base + x] = weight_by_tile[tile]
+
+    def set_tile(self, x, y, tile):
+        """
+        Cambia un tile (p. ej. una calle cerrada) y actualiza la cuadrícula empaquetada.
+        Quien use un CostModel debe avisarle con `CostModel.update_tiles`.
+        """
+        if not self.in_bounds(x, y):
+            return
+        self.tiles[y][x] = tile
+        info = (self.legend or {}).get(tile)
+        index = y * self.width + x
+        if info is None:
+            self.blocked[index] = 1
+            self.surface[index] = 1.0
+        else:
+            self.blocked[index] = 1 if info.get("blocked", False) else 0
+            self.surface[index] = info.get("surface_weight", 1.0)
+
+    def index(self, x, y):
+        """Índice lineal de (x, y) en la cuadrícula empaquetada."""
+        return y * self.width + x
+
+    def in_bounds(self, x, y):
+        """Verifica si (x, y) está dentro del mapa."""
+        return 0 <= x < self.width and 0 <= y < self.height
     
     def get_tile(self, x, y):
         """Obtiene el tile en coordenadas (x, y)."""
@@ -20,24 +78,27 @@ class City:
     
     def get_surface_weight(self, x, y):
         """Obtiene peso de superficie del tile."""
-        tile = self.get_tile(x, y)
-        if tile and tile in self.legend:
-            return self.legend[tile].get("surface_weight", 1.0)
+        if 0 <= x < self.width and 0 <= y < self.height:
+            return self.surface[y * self.width + x]
         return 1.0
     
     def is_blocked(self, x, y):
         """Verifica si un tile está bloqueado."""
-        tile = self.get_tile(x, y)
-        if tile and tile in self.legend:
-            return self.legend[tile].get("blocked", False)
+        if 0 <= x < self.width and 0 <= y < self.height:
+            return self.blocked[y * self.width + x] == 1
         return True
     
-    def get_random_walkable_position(self):
-        """Retorna posición aleatoria caminable (calle o parque)."""
+    def get_random_walkable_position(self, rng: random.Random | None = None):
+        """
+        Retorna posición aleatoria caminable (calle o parque).
+        Args:
+            rng: Generador a usar (por defecto el módulo random global).
+        """
+        rng = rng if rng is not None else random
         attempts = 0
         while attempts < 100:
-            x = random.randint(0, self.width - 1)
-            y = random.randint(0, self.height - 1)
+            x = rng.randint(0, self.width - 1)
+            y = rng.randint(0, self.height - 1)
             
             if not self.is_blocked(x, y):
                 return [x, y]
@@ -54,30 +115,116 @@ class City:
 
 
 class OrderManager:
-    """Gestiona pedidos disponibles del API."""
+    """Gestiona pedidos disponibles del API (convertidos a `Order` al recibirlos)."""
     
-    def __init__(self, orders_data):
-        self.all_orders = orders_data
-        self.available_orders = []
+    def __init__(self, orders_data, distance_index=None, order_table=None):
+        self.all_orders = [Order.from_dict(data) for data in orders_data]
+        # Pedidos disponibles por id (el dict conserva el orden de liberación)
+        self._available: dict = {}
+        # Vista ordenada de los disponibles; se regenera solo si cambiaron
+        self._available_view = None
         self.released_ids = set()
-    
+        # Pedidos disponibles por tile de recogida (consultas por tile, radio y cercanía)
+        self.spatial_index = OrderSpatialIndex()
+        # Tablas de distancia real hacia recogidas/entregas (ver DistanceIndex)
+        self.distance_index = distance_index
+        # Tabla columnar opcional para puntuar todos los pedidos a la vez (ver OrderTable)
+        self.order_table = order_table
+        # Pedidos aún no liberados, en un heap por release_time
+        # (el índice desempata sin comparar los pedidos)
+        self._unreleased = [
+            (order.release_time, i, order)
+            for i, order in enumerate(self.all_orders)
+        ]
+        heapq.heapify(self._unreleased)
+
     def update_available(self, elapsed_time):
-        """Actualiza pedidos disponibles según release_time."""
-        for order in self.all_orders:
-            order_id = order.get("id")
-            release = order.get("release_time", 0)
-            
-            if release <= elapsed_time and order_id not in self.released_ids:
-                self.available_orders.append(order)
-                self.released_ids.add(order_id)
-    
+        """Actualiza pedidos disponibles según release_time (solo revisa los que vencen)."""
+        unreleased = self._unreleased
+        while unreleased and unreleased[0][0] <= elapsed_time:
+            _, _, order = heapq.heappop(unreleased)
+            order_id = order.id
+            if order_id in self.released_ids:
+                continue
+            self._available[order_id] = order
+            self._available_view = None
+            self.spatial_index.add(order_id, order.pickup, order)
+            self.released_ids.add(order_id)
+            if self.distance_index is not None:
+                self.distance_index.add_order(order)
+            if self.order_table is not None:
+                self.order_table.add(order, self.travel_distance(order.dropoff, order.pickup))
+
+    def next_release_time(self):
+        """release_time del próximo pedido por liberar (None si no quedan)."""
+        return self._unreleased[0][0] if self._unreleased else None
+
+    @property
+    def available_orders(self):
+        return self.get_available()
+
     def get_available(self):
-        """Retorna pedidos disponibles."""
-        return self.available_orders
-    
+        """Retorna pedidos disponibles (en orden de liberación)."""
+        if self._available_view is None:
+            self._available_view = list(self._available.values())
+        return self._available_view
+
+    def get_order(self, order_id):
+        """Pedido disponible con ese id, o None."""
+        return self._available.get(order_id)
+
+    def is_available(self, order_id):
+        return order_id in self._available
+
+    def available_count(self):
+        return len(self._available)
+
     def remove_order(self, order_id):
         """Remueve pedido aceptado de disponibles."""
-        self.available_orders = [
-            o for o in self.available_orders 
-            if o.get("id") != order_id
-        ]
\ No newline at end of file
+        order = self._available.pop(order_id, None)
+        if order is None:
+            return
+        self._available_view = None
+        self.spatial_index.remove(order_id)
+        if self.order_table is not None:
+            self.order_table.remove(order_id)
+        if self.distance_index is not None:
+            self.distance_index.release_order(order)
+
+    def orders_at(self, pos):
+        """Pedidos disponibles con recogida en `pos`."""
+        return self.spatial_index.orders_at(pos)
+
+    def nearest_orders(self, pos, k=1):
+        """Los k pedidos disponibles con recogida más cercana a `pos` (Manhattan)."""
+        return self.spatial_index.nearest(pos, k)
+
+    def orders_by_pickup(self):
+        """Pedidos disponibles agrupados por tile de recogida: pares (tile, pedidos)."""
+        return self.spatial_index.groups()
+
+    def orders_within(self, pos, radius):
+        """Pedidos disponibles con recogida a distancia Manhattan <= radius."""
+        return self.spatial_index.within_radius(pos, radius)
+
+    def get_order_table(self):
+        """Tabla columnar de pedidos abiertos (None si no se configuró), al día con los costos."""
+        table = self.order_table
+        if table is None:
+            return None
+        if self.distance_index is not None:
+            table.sync_fields(self.distance_index)
+        elif table.is_stale():
+            table.refresh_delivery(self.travel_distance)
+        return table
+
+    def travel_distance(self, target, pos):
+        """
+        Distancia de viaje desde pos hasta target.
+        Usa las tablas precalculadas si target está indexado; si no, Manhattan.
+        """
+        if self.distance_index is not None:
+            distance = self.distance_index.distance(target, pos)
+            if distance is not None:
+                return distance
+        return abs(target[0] - pos[0]) + abs(target[1] - pos[1])
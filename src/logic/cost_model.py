@@ -0,0 +1,163 @@
+import math
+from array import array
+
+from .city import City
+
+
+class CostModel:
+    """
+    Modelo de costo de viaje sobre la cuadrícula de la ciudad.
+
+    Sigue la fórmula de `Player.calculate_speed`:
+        velocidad = factor_jugador * m_clima * surface_weight
+    y el costo de entrar a un tile es el tiempo que toma recorrerlo (1 / velocidad).
+
+    El costo se separa en dos partes:
+    - Costo relativo por tile (1 / surface_weight): es lo único que decide
+      qué ruta es mejor, porque el clima y el factor del jugador afectan a
+      todas las aristas por igual.
+    - Escala (segundos por unidad de costo relativo) = 1 / (factor_jugador * m_clima),
+      que convierte el costo relativo en tiempo real de viaje.
+    """
+
+    # Cantidad de cambios incrementales que se recuerdan para `changes_since`
+    CHANGE_HISTORY = 64
+
+    def __init__(self, city: City, speed_factor: float = 3.0, weather_mult: float = 1.0):
+        self.city = city
+        self.speed_factor = speed_factor
+        self.weather_mult = weather_mult
+        self.version = 0
+        self.rebuild()
+
+    def _compute_tile_cost(self, index: int) -> float:
+        if self.city.blocked[index]:
+            return math.inf
+        weight = self.city.surface[index]
+        return 1.0 / weight if weight > 0 else math.inf
+
+    def rebuild(self):
+        """Recalcula los costos relativos desde la cuadrícula empaquetada de la ciudad."""
+        size = len(self.city.blocked)
+        self.tile_costs = array("f", [math.inf]) * size
+        # Conteo de tiles caminables por costo (para mínimo/uniformidad incrementales)
+        self._cost_counts: dict[float, int] = {}
+        for i in range(size):
+            cost = self._compute_tile_cost(i)
+            if cost == math.inf:
+                continue
+            self.tile_costs[i] = cost
+            stored = self.tile_costs[i]
+            self._cost_counts[stored] = self._cost_counts.get(stored, 0) + 1
+
+        self._refresh_summary()
+        self.version += 1
+        # Un rebuild completo no tiene lista de tiles cambiados
+        self._changes: list[tuple[int, set | None]] = [(self.version, None)]
+
+    def _refresh_summary(self):
+        self.min_tile_cost = min(self._cost_counts) if self._cost_counts else 1.0
+        self.uniform = len(self._cost_counts) <= 1
+
+    def update_tiles(self, tiles):
+        """
+        Actualiza el costo de algunos tiles después de `City.set_tile`.
+        Solo recalcula esos tiles y registra el cambio para los planificadores
+        incrementales (ver `changes_since`).
+        """
+        width = self.city.width
+        changed = set()
+        for x, y in tiles:
+            if not self.city.in_bounds(x, y):
+                continue
+            index = y * width + x
+            old = self.tile_costs[index]
+            self.tile_costs[index] = self._compute_tile_cost(index)
+            new = self.tile_costs[index]
+            if new == old:
+                continue
+            if old != math.inf:
+                self._cost_counts[old] -= 1
+                if self._cost_counts[old] == 0:
+                    del self._cost_counts[old]
+            if new != math.inf:
+                self._cost_counts[new] = self._cost_counts.get(new, 0) + 1
+            changed.add((x, y))
+
+        if not changed:
+            return
+        self._refresh_summary()
+        self.version += 1
+        self._changes.append((self.version, changed))
+        if len(self._changes) > self.CHANGE_HISTORY:
+            self._changes.pop(0)
+
+    def changes_since(self, version: int) -> set | None:
+        """
+        Tiles cuyo costo cambió después de `version`.
+        Returns:
+            set de (x, y), o None si hubo un rebuild completo o el historial no alcanza.
+        """
+        if version == self.version:
+            return set()
+        if not self._changes or self._changes[0][0] > version + 1:
+            return None
+        tiles = set()
+        for change_version, changed in self._changes:
+            if change_version <= version:
+                continue
+            if changed is None:
+                return None
+            tiles |= changed
+        return tiles
+
+    def set_weather(self, weather_mult: float):
+        """Actualiza el multiplicador de clima (interpolado durante transiciones)."""
+        self.weather_mult = weather_mult
+
+    def set_speed_factor(self, speed_factor: float):
+        """Actualiza el factor de velocidad del jugador (ver `Player.get_speed_factor`)."""
+        self.speed_factor = speed_factor
+
+    @property
+    def seconds_per_unit(self) -> float:
+        """Segundos que toma recorrer una unidad de costo relativo."""
+        return self.seconds_per_unit_for(self.speed_factor)
+
+    def seconds_per_unit_for(self, speed_factor: float) -> float:
+        """Igual que `seconds_per_unit` pero con el factor de velocidad de un agente concreto."""
+        speed = speed_factor * self.weather_mult
+        return 1.0 / speed if speed > 0 else math.inf
+
+    def tile_cost(self, x: int, y: int) -> float:
+        """Costo relativo de entrar al tile (x, y); infinito si está bloqueado."""
+        if not self.city.in_bounds(x, y):
+            return math.inf
+        return self.tile_costs[y * self.city.width + x]
+
+    def step_cost(self, x: int, y: int) -> float:
+        """Tiempo (segundos) de entrar al tile (x, y) con el clima actual."""
+        return self.tile_cost(x, y) * self.seconds_per_unit
+
+    def heuristic(self, a: tuple[int, int], b: tuple[int, int]) -> float:
+        """Cota inferior admisible del costo relativo entre a y b."""
+        return (abs(a[0] - b[0]) + abs(a[1] - b[1])) * self.min_tile_cost
+
+    def path_cost(self, path: list[tuple[int, int]]) -> float:
+        """Costo relativo total de una ruta (sin incluir el tile inicial)."""
+        return sum(self.tile_cost(x, y) for x, y in path)
+
+    def travel_time(self, path: list[tuple[int, int]], speed_factor: float | None = None) -> float:
+        """
+        Tiempo estimado (segundos) para recorrer la ruta con el clima actual.
+        Args:
+            path: Ruta sin el tile inicial.
+            speed_factor: Factor del agente (`Player.get_speed_factor`); por defecto el del modelo.
+        """
+        if speed_factor is None:
+            speed_factor = self.speed_factor
+        return self.path_cost(path) * self.seconds_per_unit_for(speed_factor)
+
+    def is_uniform(self) -> bool:
+        """True si todos los tiles caminables tienen el mismo costo."""
+        return self.uniform
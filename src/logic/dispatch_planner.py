@@ -0,0 +1,260 @@
+import math
+
+from .order import Order
+
+
+# Penalización (en unidades de pago) por cada segundo de atraso en una entrega
+LATE_PENALTY = 2.0
+
+
+class Stop:
+    """Parada de un plan: recoger o entregar un pedido."""
+
+    __slots__ = ("order", "pickup", "pos")
+
+    def __init__(self, order: Order, pickup: bool):
+        self.order = order
+        self.pickup = pickup
+        self.pos = order.pickup if pickup else order.dropoff
+
+    def __repr__(self):
+        return f"Stop({self.order.id}, {'pickup' if self.pickup else 'dropoff'}, {self.pos})"
+
+
+class DispatchPlan:
+    """
+    Secuencia de paradas que resultó de `DispatchPlanner.plan`.
+    Args:
+        stops: Paradas en orden de visita.
+        cost: Costo relativo de recorrerlas desde el inicio.
+        lateness: Segundos de atraso estimados sumando todas las entregas.
+        value: Pago de los pedidos nuevos menos el costo ponderado del plan.
+    """
+
+    def __init__(self, stops: list[Stop], cost: float, lateness: float, value: float):
+        self.stops = stops
+        self.cost = cost
+        self.lateness = lateness
+        self.value = value
+
+    @property
+    def next_stop(self) -> Stop | None:
+        return self.stops[0] if self.stops else None
+
+    def advance(self) -> Stop | None:
+        """Da por visitada la primera parada y retorna la siguiente."""
+        if self.stops:
+            self.stops.pop(0)
+        return self.next_stop
+
+    def new_orders(self) -> list[Order]:
+        """Pedidos que el plan recoge (aún no están en el inventario)."""
+        return [stop.order for stop in self.stops if stop.pickup]
+
+    def __len__(self) -> int:
+        return len(self.stops)
+
+
+class DispatchPlanner:
+    """
+    Planificador de recogidas y entregas para varios pedidos a la vez.
+
+    Parte de las entregas de los pedidos que ya se llevan y agrega pedidos
+    abiertos por inserción más barata: cada ronda prueba todas las
+    posiciones (recogida antes que entrega) de cada candidato y agrega el
+    que deja más ganancia (pago - costo extra). Luego mejora el orden con
+    búsqueda local (or-opt: mover tramos de 1 a 3 paradas; 2-opt: invertir
+    tramos) mientras baje el costo.
+
+    Un plan es viable si el peso cargado nunca supera `max_weight` y ningún
+    pedido nuevo llega tarde (ni después del horizonte). Los pedidos que ya
+    se llevan pueden atrasarse, pero cada segundo de atraso cuesta `late_penalty`.
+
+    Args:
+        distance: Función (desde, hasta) -> costo relativo del viaje
+            (math.inf si no hay camino), p. ej. las tablas de DistanceIndex.
+        seconds_per_unit: Segundos que toma una unidad de costo relativo.
+        cost_weight: Unidades de pago que vale una unidad de costo relativo.
+        max_weight: Peso máximo que se puede cargar.
+        max_stops: Tope de paradas del plan (acota el costo de planificar).
+        load_factor: Recargo de cada tramo por unidad de peso sobre `free_load`
+            (cargar mucho gasta más resistencia y obliga a descansar).
+        free_load: Peso que se puede cargar sin recargo.
+    """
+
+    # Largo máximo de los tramos que mueve or-opt
+    OR_OPT_SEGMENT = 3
+    # Rondas de búsqueda local como máximo
+    MAX_IMPROVEMENT_ROUNDS = 20
+
+    def __init__(self, distance, seconds_per_unit: float = 1.0, cost_weight: float = 1.0,
+                 max_weight: float = 10, late_penalty: float = LATE_PENALTY, max_stops: int = 12,
+                 load_factor: float = 0.0, free_load: float = 0.0):
+        self.distance = distance
+        self.seconds_per_unit = seconds_per_unit
+        self.cost_weight = cost_weight
+        self.max_weight = max_weight
+        self.late_penalty = late_penalty
+        self.max_stops = max_stops
+        self.load_factor = load_factor
+        self.free_load = free_load
+        self._distances: dict = {}
+
+    def _distance(self, a, b) -> float:
+        key = (a, b)
+        distance = self._distances.get(key)
+        if distance is None:
+            distance = 0.0 if a == b else self.distance(a, b)
+            self._distances[key] = distance
+        return distance
+
+    def evaluate(self, stops: list[Stop]) -> tuple[float, float, float] | None:
+        """
+        Recorre el plan desde el inicio de la planificación en curso.
+        Returns:
+            tuple: (objetivo, costo, atraso) o None si el plan no es viable.
+        """
+        pos = self._start
+        elapsed = 0.0
+        cost = 0.0
+        lateness = 0.0
+        load = self._load
+        picked = set()
+        for stop in stops:
+            step = self._distance(pos, stop.pos)
+            if step == math.inf:
+                return None
+            if self.load_factor and load > self.free_load:
+                step *= 1.0 + self.load_factor * (load - self.free_load)
+            cost += step
+            elapsed += step * self.seconds_per_unit
+            pos = stop.pos
+            order = stop.order
+            if stop.pickup:
+                load += order.weight
+                if load > self.max_weight:
+                    return None
+                picked.add(order.id)
+                continue
+            if order.id in self._new_ids and order.id not in picked:
+                return None
+            load -= order.weight
+            arrival = self._now + elapsed
+            if order.id in self._new_ids and arrival > self._horizon:
+                return None
+            late = arrival - order.deadline_ts
+            if late > 0:
+                if order.id in self._new_ids:
+                    return None
+                lateness += late
+        return self.cost_weight * cost + self.late_penalty * lateness, cost, lateness
+
+    def _objective(self, stops: list[Stop]) -> float:
+        result = self.evaluate(stops)
+        return math.inf if result is None else result[0]
+
+    def _best_insertion(self, stops: list[Stop], dropoff: Stop,
+                        pickup: Stop | None = None) -> tuple[float, list[Stop] | None]:
+        """Mejor lugar para insertar la entrega (y su recogida antes) en `stops`."""
+        best = (math.inf, None)
+        n = len(stops)
+        pickup_positions = range(n + 1) if pickup is not None else (None,)
+        for i in pickup_positions:
+            with_pickup = stops if i is None else stops[:i] + [pickup] + stops[i:]
+            first = 0 if i is None else i + 1
+            for j in range(first, len(with_pickup) + 1):
+                candidate = with_pickup[:j] + [dropoff] + with_pickup[j:]
+                objective = self._objective(candidate)
+                if objective < best[0]:
+                    best = (objective, candidate)
+        return best
+
+    def _neighbors(self, stops: list[Stop]):
+        """Vecinos de la búsqueda local: primero or-opt y luego 2-opt."""
+        n = len(stops)
+        # or-opt: mover un tramo de 1..3 paradas a otra posición
+        for length in range(1, min(self.OR_OPT_SEGMENT, n - 1) + 1):
+            for i in range(n - length + 1):
+                segment = stops[i:i + length]
+                rest = stops[:i] + stops[i + length:]
+                for j in range(len(rest) + 1):
+                    if j != i:
+                        yield rest[:j] + segment + rest[j:]
+        # 2-opt: invertir el tramo i..j-1
+        for i in range(n - 1):
+            for j in range(i + 2, n + 1):
+                yield stops[:i] + stops[i:j][::-1] + stops[j:]
+
+    def _improve(self, stops: list[Stop], objective: float) -> tuple[list[Stop], float]:
+        """Búsqueda local con primera mejora hasta que ningún vecino baje el objetivo."""
+        for _ in range(self.MAX_IMPROVEMENT_ROUNDS):
+            for candidate in self._neighbors(stops):
+                value = self._objective(candidate)
+                if value < objective - 1e-9:
+                    stops, objective = candidate, value
+                    break
+            else:
+                break
+        return stops, objective
+
+    def plan(self, start: tuple[int, int], now_ts: float, carried: list[Order],
+             candidates: list[Order], load: float | None = None,
+             horizon_ts: float = math.inf) -> DispatchPlan:
+        """
+        Arma el plan de paradas.
+        Args:
+            start: Posición actual del agente.
+            now_ts: Hora actual del juego (segundos epoch).
+            carried: Pedidos en el inventario (solo falta entregarlos).
+            candidates: Pedidos abiertos que se pueden agregar.
+            load: Peso cargado ahora (por defecto la suma de `carried`).
+            horizon_ts: Hora límite (p. ej. el fin de la partida) para entregar los pedidos nuevos.
+        Returns:
+            DispatchPlan: Paradas en orden; vacío si no hay nada que hacer.
+        """
+        self._start = tuple(start)
+        self._now = now_ts
+        self._horizon = horizon_ts
+        self._load = sum(order.weight for order in carried) if load is None else load
+        self._new_ids = set()
+        self._distances = {}
+
+        # Entregas pendientes, de la más urgente a la menos
+        stops: list[Stop] = []
+        for order in sorted(carried, key=lambda o: o.deadline_ts):
+            objective, inserted = self._best_insertion(stops, Stop(order, False))
+            # Sin camino viable se deja al final (no se descarta un pedido que se lleva)
+            stops = inserted if inserted is not None else stops + [Stop(order, False)]
+        objective = self._objective(stops)
+
+        # Inserción más barata de pedidos nuevos mientras dejen ganancia
+        remaining = [order for order in candidates if order.weight <= self.max_weight]
+        if objective == math.inf:
+            # Alguna entrega pendiente no tiene camino: no se agregan pedidos
+            remaining = []
+        value = 0.0
+        while remaining and len(stops) + 2 <= self.max_stops:
+            best = None
+            for order in remaining:
+                self._new_ids.add(order.id)
+                new_objective, inserted = self._best_insertion(
+                    stops, Stop(order, False), Stop(order, True)
+                )
+                self._new_ids.discard(order.id)
+                if inserted is None:
+                    continue
+                profit = order.payout - (new_objective - objective)
+                if best is None or profit > best[0]:
+                    best = (profit, order, inserted, new_objective)
+            if best is None or best[0] <= 0:
+                break
+            profit, order, stops, objective = best
+            self._new_ids.add(order.id)
+            remaining.remove(order)
+            value += order.payout
+
+        if objective != math.inf:
+            stops, objective = self._improve(stops, objective)
+        result = self.evaluate(stops)
+        cost, lateness = (result[1], result[2]) if result is not None else (math.inf, math.inf)
+        return DispatchPlan(stops, cost, lateness, value - objective)
@@ -0,0 +1,263 @@
+import heapq
+import math
+from array import array
+from collections import deque
+
+from .cost_model import CostModel
+from .order import Order
+
+
+class FieldBuild:
+    """
+    Cálculo reanudable de un campo de distancias hacia `target` (Dijkstra inverso).
+    El costo de un paso es el del tile al que se entra, así que al expandir
+    hacia atrás desde u se suma el costo de u. Si todos los tiles cuestan
+    lo mismo se usa BFS.
+    `step(n)` procesa a lo sumo n tiles y retorna True cuando el campo está completo.
+    """
+
+    def __init__(self, cost_model: CostModel, target: tuple[int, int]):
+        self.cost_model = cost_model
+        self.target = tuple(target)
+        self.version = cost_model.version
+        city = cost_model.city
+        self.field = array("f", [math.inf]) * (city.width * city.height)
+        self.uniform = cost_model.is_uniform()
+        self.done = False
+        self.nodes = 0  # tiles procesados hasta ahora
+        self._frontier = deque() if self.uniform else []
+
+        tx, ty = self.target
+        if not city.in_bounds(tx, ty) or cost_model.tile_costs[ty * city.width + tx] == math.inf:
+            self.done = True
+            return
+        start = ty * city.width + tx
+        self.field[start] = 0.0
+        if self.uniform:
+            self._frontier.append(start)
+        else:
+            self._frontier.append((0.0, start))
+
+    def step(self, max_nodes: int) -> bool:
+        if self.done:
+            return True
+        city = self.cost_model.city
+        width, height = city.width, city.height
+        tile_costs = self.cost_model.tile_costs
+        field = self.field
+        frontier = self._frontier
+        processed = 0
+
+        if self.uniform:
+            step = self.cost_model.min_tile_cost
+            while frontier and processed < max_nodes:
+                u = frontier.popleft()
+                processed += 1
+                next_dist = field[u] + step
+                ux, uy = u % width, u // width
+                for v, ok in ((u - 1, ux > 0), (u + 1, ux < width - 1),
+                              (u - width, uy > 0), (u + width, uy < height - 1)):
+                    if ok and field[v] == math.inf and tile_costs[v] != math.inf:
+                        field[v] = next_dist
+                        frontier.append(v)
+        else:
+            while frontier and processed < max_nodes:
+                dist, u = heapq.heappop(frontier)
+                if dist > field[u]:
+                    continue
+                processed += 1
+                next_dist = dist + tile_costs[u]
+                ux, uy = u % width, u // width
+                for v, ok in ((u - 1, ux > 0), (u + 1, ux < width - 1),
+                              (u - width, uy > 0), (u + width, uy < height - 1)):
+                    if ok and tile_costs[v] != math.inf and next_dist < field[v]:
+                        field[v] = next_dist
+                        heapq.heappush(frontier, (field[v], v))
+
+        self.nodes += processed
+        if not frontier:
+            self.done = True
+            self._frontier = None
+        return self.done
+
+
+def distance_field(cost_model: CostModel, target: tuple[int, int]) -> array:
+    """
+    Calcula de una vez el costo relativo desde cada tile hasta `target` (ver `FieldBuild`).
+    Returns:
+        array('f') en orden fila mayor; math.inf donde no hay camino.
+    """
+    build = FieldBuild(cost_model, target)
+    while not build.step(1 << 30):
+        pass
+    return build.field
+
+
+class DistanceIndex:
+    """
+    Tablas de distancia precalculadas hacia los puntos de interés (recogidas y entregas).
+    Cada punto tiene un campo de distancias a todo el mapa, de modo que la
+    distancia real desde cualquier posición es una consulta O(1).
+    Los campos se cuentan por referencia: un tile compartido por varios
+    pedidos se calcula una sola vez y se libera cuando ningún pedido lo usa.
+
+    Con `deferred=True` los campos no se calculan al agregar el punto ni al
+    cambiar los costos: quedan en una cola que `build` avanza por partes con
+    un presupuesto de tiles por tick. Mientras un campo no esté listo,
+    `distance` retorna None (y `OrderManager.travel_distance` usa Manhattan).
+
+    `generation` aumenta con cada campo que queda listo y cuando los costos
+    descartan o recalculan todos; `ready_since` dice qué campos cambiaron desde
+    una generación dada, para que quien copia valores (p. ej. OrderTable)
+    actualice solo esos.
+    """
+
+    def __init__(self, cost_model: CostModel, deferred: bool = False):
+        self.cost_model = cost_model
+        self.deferred = deferred
+        self._fields: dict[tuple[int, int], array] = {}
+        self._refs: dict[tuple[int, int], int] = {}
+        # Campos por calcular, en orden de llegada (el primero puede estar a medias)
+        self._queue: deque[tuple[int, int]] = deque()
+        self._build: FieldBuild | None = None
+        self._model_version = cost_model.version
+        # Aumenta cada vez que un campo queda listo o se descartan por cambio de costos
+        self.generation = 0
+        # Generación del último cambio de costos y campos listos desde entonces, en orden
+        self._reset_generation = 0
+        self._ready_log: list[tuple[int, int]] = []
+
+    def _sync(self):
+        """Recalcula (o vuelve a encolar) los campos si cambiaron los costos relativos del mapa."""
+        if self.cost_model.version == self._model_version:
+            return
+        self._model_version = self.cost_model.version
+        self.generation += 1
+        self._reset_generation = self.generation
+        self._ready_log.clear()
+        if not self.deferred:
+            for tile in self._fields:
+                self._fields[tile] = distance_field(self.cost_model, tile)
+            return
+        # Los repetidos en la cola se saltan en `build` cuando el campo ya está listo
+        self._queue.extend(self._fields)
+        self._fields.clear()
+        self._build = None
+
+    def _ready(self, tile, field: array):
+        self._fields[tile] = field
+        self._ready_log.append(tile)
+        self.generation += 1
+
+    def add(self, tile):
+        """Registra un punto de interés y calcula (o encola) su campo si no existe."""
+        tile = tuple(tile)
+        self._sync()
+        if tile not in self._refs and tile not in self._fields:
+            if self.deferred:
+                self._queue.append(tile)
+            else:
+                self._ready(tile, distance_field(self.cost_model, tile))
+        self._refs[tile] = self._refs.get(tile, 0) + 1
+
+    def release(self, tile):
+        """Libera una referencia; el campo se descarta cuando llega a cero."""
+        tile = tuple(tile)
+        refs = self._refs.get(tile, 0) - 1
+        if refs > 0:
+            self._refs[tile] = refs
+        else:
+            self._refs.pop(tile, None)
+            self._fields.pop(tile, None)
+
+    def build(self, max_nodes: int | None = None) -> int:
+        """
+        Avanza los campos encolados en orden de llegada.
+        Args:
+            max_nodes: Tiles máximos a procesar (None = terminar la cola).
+        Returns:
+            int: Campos que quedaron listos.
+        """
+        self._sync()
+        finished = 0
+        budget = max_nodes if max_nodes is not None else 1 << 30
+        while self._queue and budget > 0:
+            tile = self._queue[0]
+            if tile not in self._refs or tile in self._fields:
+                # Se liberó (o ya se calculó) mientras esperaba
+                self._queue.popleft()
+                self._build = None
+                continue
+            if self._build is None or self._build.target != tile:
+                self._build = FieldBuild(self.cost_model, tile)
+            build = self._build
+            before = build.nodes
+            done = build.step(budget)
+            budget -= build.nodes - before
+            if done:
+                self._queue.popleft()
+                self._ready(tile, build.field)
+                self._build = None
+                finished += 1
+        return finished
+
+    def pending(self) -> int:
+        """Campos que faltan por calcular (un tile repetido en la cola cuenta una vez)."""
+        return len({tile for tile in self._queue if tile in self._refs and tile not in self._fields})
+
+    def add_order(self, order: Order):
+        self.add(order.pickup)
+        self.add(order.dropoff)
+
+    def release_order(self, order: Order):
+        self.release(order.pickup)
+        self.release(order.dropoff)
+
+    def __contains__(self, tile) -> bool:
+        return tuple(tile) in self._refs
+
+    def __len__(self) -> int:
+        return len(self._refs)
+
+    def is_ready(self, tile) -> bool:
+        """True si el campo de `tile` ya está calculado."""
+        self._sync()
+        return tuple(tile) in self._fields
+
+    def field(self, tile) -> array | None:
+        """Campo de distancias hacia `tile` (None si no está indexado o aún no está listo)."""
+        self._sync()
+        return self._fields.get(tuple(tile))
+
+    def ready_since(self, generation) -> list | None:
+        """
+        Tiles cuyo campo quedó listo después de `generation` (pueden ya no
+        estar indexados). None si desde entonces cambiaron los costos y hay
+        que releer todos los campos.
+        """
+        self._sync()
+        if generation is None or generation < self._reset_generation:
+            return None
+        return self._ready_log[generation - self._reset_generation:]
+
+    def ready_fields(self) -> dict:
+        """Campos listos por tile (solo lectura), al día con los costos del mapa."""
+        self._sync()
+        return self._fields
+
+    def distance(self, target, pos) -> float | None:
+        """
+        Costo relativo desde `pos` hasta `target`.
+        Returns:
+            float (math.inf si no hay camino) o None si `target` no está
+            indexado o su campo aún no está listo.
+        """
+        self._sync()
+        field = self._fields.get(tuple(target))
+        if field is None:
+            return None
+        city = self.cost_model.city
+        x, y = pos
+        if not city.in_bounds(x, y):
+            return math.inf
+        return field[y * city.width + x]
@@ -0,0 +1,199 @@
+import heapq
+import math
+
+from .cost_model import CostModel
+
+
+class DStarLite:
+    """
+    Planificador incremental D* Lite (Koenig y Likhachev) sobre la cuadrícula.
+
+    Busca hacia atrás desde la meta, así que g(u) es el costo de u hasta la meta.
+    Cuando el agente avanza solo se actualiza `km`; cuando cambia el costo de
+    algunos tiles (`CostModel.update_tiles`) solo se reparan los nodos cuyo
+    costo hasta la meta se ve afectado, en lugar de repetir la búsqueda completa.
+
+    Trabaja con los costos relativos del modelo: el clima escala todas las
+    aristas por igual, así que un cambio de clima no requiere reparar nada.
+    """
+
+    def __init__(self, cost_model: CostModel, start: tuple[int, int], goal: tuple[int, int]):
+        self.cost_model = cost_model
+        self.start = tuple(start)
+        self.goal = tuple(goal)
+        self.version = cost_model.version
+        # La heurística usa el costo mínimo al crear el planificador; si baja, se reinicia
+        self.h_unit = cost_model.min_tile_cost
+        self.expansions = 0
+        self._reset()
+
+    def _reset(self):
+        self.km = 0.0
+        self.last = self.start
+        self.g: dict[tuple[int, int], float] = {}
+        self.rhs: dict[tuple[int, int], float] = {self.goal: 0.0}
+        self.open_keys: dict[tuple[int, int], tuple[float, float]] = {}
+        self.heap: list = []
+        self._push(self.goal)
+
+    # --- Utilidades ---
+
+    def _h(self, a: tuple[int, int], b: tuple[int, int]) -> float:
+        return (abs(a[0] - b[0]) + abs(a[1] - b[1])) * self.h_unit
+
+    def _key(self, u: tuple[int, int]) -> tuple[float, float]:
+        best = min(self.g.get(u, math.inf), self.rhs.get(u, math.inf))
+        return (best + self._h(self.start, u) + self.km, best)
+
+    def _push(self, u: tuple[int, int]):
+        key = self._key(u)
+        self.open_keys[u] = key
+        heapq.heappush(self.heap, (key[0], key[1], u))
+
+    def _top(self):
+        """Entrada válida de menor llave (descarta las obsoletas)."""
+        heap = self.heap
+        while heap:
+            k1, k2, u = heap[0]
+            if self.open_keys.get(u) == (k1, k2):
+                return (k1, k2), u
+            heapq.heappop(heap)
+        return (math.inf, math.inf), None
+
+    def _neighbors(self, u: tuple[int, int]):
+        city = self.cost_model.city
+        x, y = u
+        for v in ((x - 1, y), (x + 1, y), (x, y - 1), (x, y + 1)):
+            if city.in_bounds(*v):
+                yield v
+
+    def _cost(self, v: tuple[int, int]) -> float:
+        """Costo de entrar a v (igual para cualquier vecino de origen)."""
+        return self.cost_model.tile_cost(*v)
+
+    def _best_successor_cost(self, u: tuple[int, int]) -> float:
+        g = self.g
+        best = math.inf
+        for v in self._neighbors(u):
+            cost = self._cost(v) + g.get(v, math.inf)
+            if cost < best:
+                best = cost
+        return best
+
+    def _update_vertex(self, u: tuple[int, int]):
+        consistent = self.g.get(u, math.inf) == self.rhs.get(u, math.inf)
+        if not consistent:
+            self._push(u)
+        else:
+            self.open_keys.pop(u, None)
+
+    # --- API ---
+
+    def compute(self):
+        """Calcula (o repara) la ruta más corta desde `start`."""
+        g, rhs = self.g, self.rhs
+        start = self.start
+        while True:
+            top_key, u = self._top()
+            if u is None:
+                break
+            start_key = self._key(start)
+            if not (top_key < start_key or rhs.get(start, math.inf) > g.get(start, math.inf)):
+                break
+
+            new_key = self._key(u)
+            if top_key < new_key:
+                self._push(u)
+                continue
+
+            self.expansions += 1
+            del self.open_keys[u]
+            g_u = g.get(u, math.inf)
+            rhs_u = rhs.get(u, math.inf)
+            enter_u = self._cost(u)
+            if g_u > rhs_u:
+                g[u] = rhs_u
+                for p in self._neighbors(u):
+                    if p != self.goal:
+                        candidate = enter_u + rhs_u
+                        if candidate < rhs.get(p, math.inf):
+                            rhs[p] = candidate
+                    self._update_vertex(p)
+            else:
+                g[u] = math.inf
+                for p in list(self._neighbors(u)) + [u]:
+                    if p != self.goal and (p == u or rhs.get(p, math.inf) == enter_u + g_u):
+                        rhs[p] = self._best_successor_cost(p)
+                    self._update_vertex(p)
+
+    def update_start(self, start: tuple[int, int]):
+        """El agente se movió: se ajusta `km` sin rehacer la búsqueda."""
+        start = tuple(start)
+        if start == self.start:
+            return
+        self.km += self._h(self.last, start)
+        self.last = start
+        self.start = start
+
+    def notify_changes(self, tiles):
+        """Repara la búsqueda tras cambios de costo en `tiles` (costos ya actualizados en el modelo)."""
+        if self.cost_model.min_tile_cost < self.h_unit:
+            # La heurística dejaría de ser admisible: se reinicia la búsqueda
+            self.h_unit = self.cost_model.min_tile_cost
+            self._reset()
+            return
+        rhs = self.rhs
+        for v in tiles:
+            # Cambió el costo de entrar a v: afecta a las aristas p -> v
+            for p in self._neighbors(v):
+                if p != self.goal:
+                    rhs[p] = self._best_successor_cost(p)
+                self._update_vertex(p)
+
+    def sync(self) -> bool:
+        """
+        Aplica los cambios del modelo de costo desde la última sincronización.
+        Returns:
+            bool: True si hubo cambios.
+        """
+        if self.version == self.cost_model.version:
+            return False
+        changes = self.cost_model.changes_since(self.version)
+        self.version = self.cost_model.version
+        if changes is None:
+            self.h_unit = self.cost_model.min_tile_cost
+            self._reset()
+        else:
+            self.notify_changes(changes)
+        return True
+
+    def extract_path(self, max_steps: int | None = None) -> list[tuple[int, int]]:
+        """Ruta desde `start` (sin incluirlo) siguiendo el mejor sucesor hasta la meta."""
+        g = self.g
+        if self.start == self.goal:
+            return []
+        if g.get(self.start, math.inf) == math.inf and self.rhs.get(self.start, math.inf) == math.inf:
+            return []
+
+        city = self.cost_model.city
+        limit = max_steps or city.width * city.height
+        path = []
+        current = self.start
+        while current != self.goal and len(path) < limit:
+            best, best_cost = None, math.inf
+            for v in self._neighbors(current):
+                cost = self._cost(v) + g.get(v, math.inf)
+                if cost < best_cost:
+                    best, best_cost = v, cost
+            if best is None or best_cost == math.inf:
+                return []
+            path.append(best)
+            current = best
+        return path if current == self.goal else []
+
+    def plan(self, start: tuple[int, int]) -> list[tuple[int, int]]:
+        """Actualiza el inicio, aplica cambios pendientes, repara y retorna la ruta."""
+        self.update_start(start)
+        self.sync()
+        self.compute()
+        return self.extract_path()
@@ -0,0 +1,150 @@
+import math
+from collections import OrderedDict
+
+from .cost_model import CostModel
+from .distance_index import distance_field
+from .path_service import DIRECTIONS
+
+
+# Códigos del arreglo de direcciones (índices de DIRECTIONS, o uno de estos)
+_UNKNOWN = 254
+_NONE = 255
+
+
+class FlowField:
+    """
+    Campo de flujo hacia una meta: un campo de integración (costo relativo de
+    cada tile hasta la meta) y un arreglo empaquetado con la dirección del
+    siguiente paso de cada tile. Cualquier agente lee su siguiente paso en
+    O(1) desde su tile actual, sin buscar una ruta propia.
+
+    Las direcciones se calculan la primera vez que se consulta cada tile.
+    Si ya existe el campo de distancias hacia la meta (p. ej. de
+    `DistanceIndex`) se pasa como `integration` y no se recalcula.
+    """
+
+    def __init__(self, cost_model: CostModel, goal: tuple[int, int], integration=None):
+        self.cost_model = cost_model
+        self.goal = tuple(goal)
+        self.version = cost_model.version
+        self.width = cost_model.city.width
+        self.height = cost_model.city.height
+        if integration is None:
+            integration = distance_field(cost_model, self.goal)
+        self.integration = integration
+        self.directions = bytearray([_UNKNOWN]) * (self.width * self.height)
+
+    def cost(self, pos) -> float:
+        """Costo relativo desde `pos` hasta la meta (math.inf si no hay camino)."""
+        x, y = pos
+        if not (0 <= x < self.width and 0 <= y < self.height):
+            return math.inf
+        return self.integration[y * self.width + x]
+
+    def _direction(self, index: int) -> int:
+        width = self.width
+        field = self.integration
+        tile_costs = self.cost_model.tile_costs
+        if field[index] == math.inf or field[index] == 0.0:
+            return _NONE
+
+        x, y = index % width, index // width
+        best, best_cost = _NONE, math.inf
+        for code, (dx, dy) in enumerate(DIRECTIONS):
+            nx, ny = x + dx, y + dy
+            if not (0 <= nx < width and 0 <= ny < self.height):
+                continue
+            v = ny * width + nx
+            cost = tile_costs[v] + field[v]
+            if cost < best_cost:
+                best, best_cost = code, cost
+        return best
+
+    def next_step(self, pos) -> tuple[int, int] | None:
+        """
+        Siguiente tile desde `pos` hacia la meta.
+        Returns:
+            tuple[int, int] | None: None si `pos` es la meta, está fuera del mapa o no hay camino.
+        """
+        x, y = pos
+        if not (0 <= x < self.width and 0 <= y < self.height):
+            return None
+        index = y * self.width + x
+        code = self.directions[index]
+        if code == _UNKNOWN:
+            code = self._direction(index)
+            self.directions[index] = code
+        if code == _NONE:
+            return None
+        dx, dy = DIRECTIONS[code]
+        return (x + dx, y + dy)
+
+    def path_from(self, start) -> list[tuple[int, int]]:
+        """Ruta completa desde `start` (sin incluirlo) siguiendo el campo."""
+        path = []
+        current = tuple(start)
+        if self.cost(current) == math.inf:
+            return path
+        limit = self.width * self.height
+        while current != self.goal and len(path) < limit:
+            current = self.next_step(current)
+            if current is None:
+                return []
+            path.append(current)
+        return path
+
+
+class FlowFieldCache:
+    """
+    Campos de flujo compartidos por meta con desalojo LRU.
+    Varios rivales que van al mismo pedido usan un solo campo; los campos se
+    recalculan cuando cambian los costos relativos del mapa.
+    """
+
+    def __init__(self, cost_model: CostModel, max_fields: int = 16):
+        self.cost_model = cost_model
+        self.max_fields = max_fields
+        self._fields: OrderedDict[tuple[int, int], FlowField] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, goal, integration=None) -> FlowField:
+        """
+        Campo de flujo hacia `goal` (lo calcula si no está o quedó obsoleto).
+        Args:
+            integration: Campo de distancias ya calculado hacia `goal` para
+                usar en vez de calcularlo (ver `FlowField`).
+        """
+        goal = tuple(goal)
+        field = self.cached(goal)
+        if field is not None:
+            self.hits += 1
+            self._fields.move_to_end(goal)
+            return field
+
+        self.misses += 1
+        field = FlowField(self.cost_model, goal, integration)
+        self._fields[goal] = field
+        self._fields.move_to_end(goal)
+        if len(self._fields) > self.max_fields:
+            self._fields.popitem(last=False)
+        return field
+
+    def cached(self, goal) -> FlowField | None:
+        """Campo de `goal` si está en la caché y al día (no calcula nada)."""
+        field = self._fields.get(tuple(goal))
+        if field is not None and field.version == self.cost_model.version:
+            return field
+        return None
+
+    def next_step(self, pos, goal) -> tuple[int, int] | None:
+        return self.get(goal).next_step(pos)
+
+    def clear(self):
+        self._fields.clear()
+
+    def __contains__(self, goal) -> bool:
+        return tuple(goal) in self._fields
+
+    def __len__(self) -> int:
+        return len(self._fields)
@@ -1,62 +1,58 @@
 import pygame
-import random
-from datetime import datetime, timedelta, timezone
+from datetime import datetime
 from src.logic.proxy import Proxy
-from src.logic.city import City, OrderManager
-from src.logic.player import Player
-
-from src.logic.strategies.easy_strategy import EasyStrategy
-from src.logic.strategies.medium_strategy import MediumStrategy
-from src.logic.strategies.hard_strategy import HardStrategy
-
 from src.logic.order import Order
 from src.logic.game_state import GameState
+from src.logic.simulation import Simulation
 from src.logic.ui import UIManager
-from src.config.config import WEATHER_MULTIPLIERS
 
-# 1.3 para version final, 0.6 para testing
-RIVAL_INTERACTION_RATE = 0.6  # segundos entre interacciones del rival
+# Ticks fijos máximos por frame: si un frame tarda mucho se descarta el resto
+MAX_TICKS_PER_FRAME = 8
+
+
+def _delegate(name):
+    """Atributo de Game que en realidad vive en la simulación."""
+    return property(
+        lambda self: getattr(self.simulation, name),
+        lambda self, value: setattr(self.simulation, name, value),
+    )
 
-class Game:
-    """Bucle principal del juego."""
 
-    def __init__(self, player_name, difficulty: str):
+class Game:
+    """Bucle principal del juego: dibuja y lee el teclado sobre una Simulation."""
+
+    city = _delegate("city")
+    path_service = _delegate("path_service")
+    order_manager = _delegate("order_manager")
+    weather = _delegate("weather")
+    player = _delegate("player")
+    rival = _delegate("rival")
+    rivals = _delegate("rivals")
+    elapsed_time = _delegate("elapsed_time")
+    game_duration = _delegate("game_duration")
+    game_start_datetime = _delegate("game_start_datetime")
+    current_weather = _delegate("current_weather")
+    weather_timer = _delegate("weather_timer")
+    game_over = _delegate("game_over")
+    victory = _delegate("victory")
+    message = _delegate("message")
+    message_timer = _delegate("message_timer")
+
+    def __init__(self, player_name, difficulty: str, seed: int | None = None):
         pygame.init()
         self.screen = pygame.display.set_mode((1200, 800))
         pygame.display.set_caption("Courier Quest")
         self.clock = pygame.time.Clock()
 
         proxy = Proxy()
-        map_data = proxy.get_map()
-        jobs_data = proxy.get_jobs()
-        self.weather = proxy.get_weather()
-
-        self.city = City(map_data)
-        self.order_manager = OrderManager(jobs_data)
-        self.player = Player(1, 1, self.city.goal)
+        self.simulation = Simulation(
+            proxy.get_map(), proxy.get_jobs(), proxy.get_weather(), difficulty, seed=seed
+        )
         self.player_name = player_name
         self.game_state = GameState()
-        self.ui = UIManager(1200, 800)
+        self.ui = UIManager(1200, 800, self.simulation.streams.get("ui"))
 
-        self.game_duration = 900
-        # Usar UTC para evitar problemas con zona horaria local
-        self.game_start_datetime = datetime(2025, 9, 1, 12, 0, 0, tzinfo=timezone.utc)
-
-        self.elapsed_time = 0.0
         self.running = True
-        self.game_over = False
-        self.victory = False
-
-        self.current_weather = self.weather.state
-        self.next_weather = self.weather.state
-        self.weather_timer = random.uniform(45, 60)
-        self.weather_transition_time = 0.0
-        self.in_transition = False
-
-        self.message = ""
-        self.message_timer = 0.0
-
-        self.player_moved_this_frame = False
 
         self.exit_reason = "menu"
 
@@ -66,20 +62,6 @@ class Game:
         self.saving_overlay_timer = 0.0
         self.saving_overlay_duration = 0.7 
         self._saving_overlay_message = "Juego guardado. Volviendo al menú..."
-        
-        from src.logic.rival import Rival
-        self.rival = Rival(0, 0, self.city.goal, None)
-
-        strategy_map = {
-            "easy": EasyStrategy,
-            "medium": MediumStrategy,
-            "hard": HardStrategy
-        }
-        
-        StrategyClass = strategy_map.get(difficulty.lower(), HardStrategy)
-        self.rival.set_strategy(StrategyClass(self, self.rival))
-       
-        self.rival_interaction_rate = RIVAL_INTERACTION_RATE
    
     def handle_input(self):
         """Maneja input del jugador (eventos + movimiento por polling)."""
@@ -98,19 +80,13 @@ class Game:
 
             if event.type == pygame.KEYDOWN:
                 if event.key == pygame.K_n:
-                    self.player.inventory.view_next_order()
-                    self.show_message("Siguiente pedido")
+                    self.simulation.execute("next_order")
                 elif event.key == pygame.K_p:
-                    self.player.inventory.view_prev_order()
-                    self.show_message("Pedido anterior")
+                    self.simulation.execute("prev_order")
                 elif event.key == pygame.K_s:
-                    self.player.inventory.sort_inventory(lambda o: o.priority)
-                    self.show_message("Ordenado por prioridad")
+                    self.simulation.execute("view", "priority")
                 elif event.key == pygame.K_d:
-                    self.player.inventory.sort_inventory(
-                        lambda o: self._normalize_datetime(o.deadline)
-                    )
-                    self.show_message("Ordenado por deadline")
+                    self.simulation.execute("view", "deadline")
 
                 elif event.key == pygame.K_a:
                     self.accept_order_at_location()
@@ -119,8 +95,7 @@ class Game:
                     self.complete_delivery()
 
                 elif event.key == pygame.K_c:
-                    if self.player.cancel_order():
-                        self.show_message("Pedido cancelado (-4 reputación)")
+                    self.simulation.execute("cancel")
 
                 elif event.key == pygame.K_F5:
                     slot = self.save_game_auto()
@@ -142,27 +117,13 @@ class Game:
 
             arrow_pressed_now = (dx != 0 or dy != 0)
             if arrow_pressed_now and not self._arrow_was_pressed:
-                new_x = self.player.x + dx
-                new_y = self.player.y + dy
-
-                if not self.city.is_blocked(new_x, new_y):
-                    if self.player.can_move():
-                        self.player.consume_stamina(self.current_weather)
-                        self.player.x = new_x
-                        self.player.y = new_y
-                        self.player_moved_this_frame = True
-
-                        self.game_state.save_state(
-                            self.player,
-                            self.player.inventory,
-                            self.elapsed_time,
-                            self.current_weather
-                        )
-                        self.check_delivery_points()
-                    else:
-                        self.show_message("¡Exhausto! Descansa para recuperarte")
-                else:
-                    self.show_message("No puedes moverte ahí")
+                if self.simulation.execute("move", dx, dy):
+                    self.game_state.save_state(
+                        self.player,
+                        self.player.inventory,
+                        self.elapsed_time,
+                        self.current_weather
+                    )
 
             self._arrow_was_pressed = arrow_pressed_now
 
@@ -173,105 +134,17 @@ class Game:
         self.saving_overlay_timer = self.saving_overlay_duration
         self._saving_overlay_message = message
 
-
-    def _normalize_datetime(self, dt_string):
-        dt = datetime.fromisoformat(dt_string)
-        if dt.tzinfo is None:
-            dt = dt.replace(tzinfo=timezone.utc)
-        return dt
-
     def get_current_game_datetime(self):
-        return self.game_start_datetime + timedelta(seconds=self.elapsed_time)
+        return self.simulation.get_current_game_datetime()
 
     def show_message(self, text, duration=2.0):
-        self.message = text
-        self.message_timer = duration
+        self.simulation.show_message(text, duration)
 
     def accept_order_at_location(self):
-        available = self.order_manager.get_available()
-        for order_data in available:
-            pickup = order_data['pickup']
-            if [self.player.x, self.player.y] == pickup:
-                order = Order.from_dict(order_data)
-                if self.player.accept_order(order):
-                    self.order_manager.remove_order(order_data['id'])
-                    self.show_message(f"Pedido {order.id} aceptado!")
-                    return
-                else:
-                    self.show_message("Inventario lleno")
-                    return
-        self.show_message("No hay pedidos en esta ubicación")
-
-    def check_delivery_points(self):
-        if self.player.inventory.current_order:
-            dropoff = self.player.inventory.current_order.order.dropoff
-            if [self.player.x, self.player.y] == dropoff:
-                self.show_message("¡Punto de entrega! Presiona ENTER")
+        self.simulation.execute("accept")
 
     def complete_delivery(self):
-        if self.player.inventory.current_order is None:
-            self.show_message("No hay pedido para entregar")
-            return
-        dropoff = self.player.inventory.current_order.order.dropoff
-        if [self.player.x, self.player.y] != dropoff:
-            self.show_message("Debes estar en el punto de entrega")
-            return
-
-        current_game_time = self.get_current_game_datetime()
-        result = self.player.complete_delivery(current_game_time)
-        if result:
-            msg = f"¡Entregado! +${int(result['payout'])} | Rep: {result['rep_change']:+d}"
-            self.show_message(msg, 3.0)
-
-    def accept_order_at_location_rival(self, rival_player, order_data):
-        """Permite al rival aceptar un pedido en su ubicación."""
-        pickup = order_data['pickup']
-        if [rival_player.x, rival_player.y] == pickup:
-            order = Order.from_dict(order_data)
-            if rival_player.accept_order(order):
-                self.order_manager.remove_order(order_data['id'])
-               
-                return True
-        return False
-
-    def complete_delivery_rival(self, rival_player):
-        """Permite al rival completar una entrega."""
-        if rival_player.inventory.current_order is None:
-            return False
-        
-        dropoff = rival_player.inventory.current_order.order.dropoff
-        if [rival_player.x, rival_player.y] != dropoff:
-            return False
-
-        current_game_time = self.get_current_game_datetime()
-       
-        result = rival_player.complete_delivery(current_game_time)
-        
-        if result:
-           
-            return True
-        return False
-
-    def update_weather(self, dt):
-        self.weather_timer -= dt
-        if self.in_transition:
-            self.weather_transition_time += dt
-            if self.weather_transition_time >= 4:
-                self.current_weather = self.next_weather
-                self.in_transition = False
-        if self.weather_timer <= 0 and not self.in_transition:
-            self.next_weather = self.weather.next_state()
-            self.weather_timer = random.uniform(45, 60)
-            self.weather_transition_time = 0
-            self.in_transition = True
-
-    def get_current_weather_multiplier(self):
-        if not self.in_transition:
-            return WEATHER_MULTIPLIERS.get(self.current_weather, 1.0)
-        progress = self.weather_transition_time / 4.0
-        current_mult = WEATHER_MULTIPLIERS.get(self.current_weather, 1.0)
-        next_mult = WEATHER_MULTIPLIERS.get(self.next_weather, 1.0)
-        return current_mult + (next_mult - current_mult) * progress
+        self.simulation.execute("deliver")
 
     def update(self, dt):
         
@@ -286,64 +159,22 @@ class Game:
         if self.game_over:
             return
 
-        if not self.player_moved_this_frame:
-            self.player.recover_stamina(dt*0.22)
-
-        self.elapsed_time += dt
-        self.update_weather(dt)
+        self.simulation.advance(dt, max_steps=MAX_TICKS_PER_FRAME)
         self.ui.update_weather_effects(self.current_weather, dt)
-        self.order_manager.update_available(self.elapsed_time)
 
-        current_game_time = self.get_current_game_datetime()
-        if self.player.inventory.first:
-            node = self.player.inventory.first
-            orders_to_expire = []
-            while node:
-                deadline = self._normalize_datetime(node.order.deadline)
-                if current_game_time > deadline:
-                    orders_to_expire.append(node.order)
-                node = node.next
-            for order in orders_to_expire:
-                self.player.expire_order(order)
-                self.show_message(f"Pedido {order.id} expirado! (-6 Rep)", 3.0)
-
-        if self.message_timer > 0:
-            self.message_timer -= dt
-
-        if self.player.is_defeated():
-            self.end_game(False)
-
-        if self.elapsed_time >= self.game_duration:
-            if self.player.has_won():
-                self.end_game(True)
-            else:
-                self.end_game(False)
-                
-        if self.rival_interaction_rate > 0:
-            
-            self.rival.recover_stamina(dt * 0.22) 
-            
-            self.rival_interaction_rate -= dt
-            
-        else:
-           
-            if hasattr(self.rival, 'strategy') and self.rival.strategy:
-                self.rival.strategy.decide_job_action(dt) 
-            
-            self.rival.decide_next_move(self.city, self.current_weather) 
-            
-            self.rival_interaction_rate = RIVAL_INTERACTION_RATE    
+        if self.game_over:
+            self.end_game(self.victory)
 
     def draw(self):
         self.screen.fill((20, 20, 30))
 
         available = self.order_manager.get_available()
-        self.ui.draw_map(self.screen, self.city, self.player.x, self.player.y, available, self.rival)
+        self.ui.draw_map(self.screen, self.city, self.player.x, self.player.y, available, self.rivals)
         self.ui.draw_weather_effects(self.screen, self.current_weather)
 
         current_game_time = self.get_current_game_datetime()
         self.ui.draw_hud(
-            self.screen, self.player, self.rival, self.game_duration,
+            self.screen, self.player, self.rivals, self.game_duration,
             self.current_weather, self.elapsed_time, current_game_time
         )
         self.ui.draw_current_order(self.screen, self.player.inventory, self.city)
@@ -392,10 +223,10 @@ class Game:
     def run(self):
         while self.running:
             dt = self.clock.tick(60) / 1000.0
-            self.player_moved_this_frame = False
             self.handle_input()
             self.update(dt)
             self.draw()
+        self.simulation.close()
         return self.exit_reason
 
     def save_game_auto(self):
@@ -434,18 +265,11 @@ class Game:
         return True
 
     def calculate_score(self):
-        bonus = 0
-        if self.victory and self.elapsed_time < self.game_duration * 0.8:
-            bonus = 500
-        score_base = self.player.total_income
-        penalties = self.player.total_penalties
-        final_score = score_base + bonus - penalties
-        return int(max(0, final_score))
+        return self.simulation.calculate_score()
 
     def end_game(self, victory):
-        """Finaliza el juego y calcula puntaje."""
-        self.game_over = True
-        self.victory = victory
+        """Finaliza el juego y guarda el puntaje."""
+        self.simulation.end_game(victory)
 
         score = self.calculate_score()
 
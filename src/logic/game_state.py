@@ -132,15 +132,7 @@ class GameState:
         orders = []
         node = inventory.first
         while node:
-            orders.append({
-                'id': node.order.id,
-                'pickup': node.order.pickup,
-                'dropoff': node.order.dropoff,
-                'payout': node.order.payout,
-                'deadline': node.order.deadline,
-                'weight': node.order.weight,
-                'priority': node.order.priority
-            })
+            orders.append(node.order.to_dict())
             node = node.next
         return orders
     
@@ -0,0 +1,311 @@
+import heapq
+import math
+
+from .cost_model import CostModel
+from .path_service import AStarSearch, _ResumableSearch, _reconstruct, manhattan
+
+
+class HierarchicalPathfinder:
+    """
+    Capa de abstracción HPA* (Hierarchical Pathfinding A*) sobre la ciudad.
+
+    El mapa se divide en clusters de `cluster_size` x `cluster_size` tiles.
+    En cada borde entre clusters vecinos se buscan tramos caminables a ambos
+    lados ("entradas") y se colocan nodos de transición: uno al centro si el
+    tramo es corto, o uno en cada extremo si es largo. Dentro de cada cluster
+    se precalcula el costo entre todos sus nodos con un Dijkstra local.
+
+    Una consulta conecta el inicio y la meta a los nodos de su cluster, busca
+    en el grafo abstracto (pequeño) y refina cada tramo con un A* limitado al
+    cluster. El costo de la consulta crece con la longitud de la ruta en
+    clusters y no con el área del mapa. La ruta es casi óptima (no exacta).
+    Si inicio y meta están en el mismo cluster o en clusters vecinos, además
+    se prueba un A* local (esos clusters más `LOCAL_MARGIN` alrededor), ya
+    que ahí los nodos de transición pueden obligar a un rodeo largo.
+
+    Los costos son dirigidos: entrar a un tile cuesta su costo relativo en el modelo.
+    """
+
+    # Tramos de entrada con al menos este largo reciben dos nodos de transición
+    LONG_ENTRANCE = 6
+    # Clusters de margen alrededor del A* local entre clusters vecinos
+    LOCAL_MARGIN = 1
+
+    def __init__(self, cost_model: CostModel, cluster_size: int = 16):
+        self.cost_model = cost_model
+        self.cluster_size = cluster_size
+        self.version = -1
+        self.build()
+
+    # --- Preprocesamiento ---
+
+    def build(self):
+        """(Re)construye el grafo abstracto desde el modelo de costo."""
+        city = self.cost_model.city
+        cs = self.cluster_size
+        self.cols = math.ceil(city.width / cs)
+        self.rows = math.ceil(city.height / cs)
+        self.nodes_by_cluster: dict[tuple[int, int], set] = {}
+        self.edges: dict[tuple[int, int], dict] = {}
+
+        self._build_entrances()
+        for cluster, nodes in self.nodes_by_cluster.items():
+            self._build_intra_edges(cluster, nodes)
+
+        self.version = self.cost_model.version
+
+    def sync(self):
+        """Reconstruye si cambiaron los costos relativos del mapa."""
+        if self.version != self.cost_model.version:
+            self.build()
+
+    def cluster_of(self, tile: tuple[int, int]) -> tuple[int, int]:
+        return (tile[0] // self.cluster_size, tile[1] // self.cluster_size)
+
+    def cluster_bounds(self, cluster: tuple[int, int]) -> tuple[int, int, int, int]:
+        city = self.cost_model.city
+        cs = self.cluster_size
+        x0, y0 = cluster[0] * cs, cluster[1] * cs
+        return (x0, y0, min(x0 + cs, city.width), min(y0 + cs, city.height))
+
+    def local_bounds(self, a: tuple[int, int], b: tuple[int, int]) -> tuple[int, int, int, int] | None:
+        """
+        Límites del A* local entre a y b: sus clusters más LOCAL_MARGIN alrededor.
+        Returns: None si los clusters no son el mismo ni vecinos (también en diagonal).
+        """
+        (ax, ay), (bx, by) = self.cluster_of(a), self.cluster_of(b)
+        if abs(ax - bx) > 1 or abs(ay - by) > 1:
+            return None
+        city = self.cost_model.city
+        cs = self.cluster_size
+        margin = self.LOCAL_MARGIN
+        return (
+            max(0, (min(ax, bx) - margin) * cs),
+            max(0, (min(ay, by) - margin) * cs),
+            min(city.width, (max(ax, bx) + 1 + margin) * cs),
+            min(city.height, (max(ay, by) + 1 + margin) * cs),
+        )
+
+    def _walkable(self, x: int, y: int) -> bool:
+        return self.cost_model.tile_cost(x, y) != math.inf
+
+    def _add_node(self, tile: tuple[int, int]):
+        self.nodes_by_cluster.setdefault(self.cluster_of(tile), set()).add(tile)
+        self.edges.setdefault(tile, {})
+
+    def _add_edge(self, a: tuple[int, int], b: tuple[int, int], cost: float):
+        edges = self.edges.setdefault(a, {})
+        if cost < edges.get(b, math.inf):
+            edges[b] = cost
+
+    def _add_transition(self, a: tuple[int, int], b: tuple[int, int]):
+        """a y b son tiles adyacentes en clusters distintos."""
+        self._add_node(a)
+        self._add_node(b)
+        self._add_edge(a, b, self.cost_model.tile_cost(*b))
+        self._add_edge(b, a, self.cost_model.tile_cost(*a))
+
+    def _add_entrance_run(self, run: list[tuple[tuple[int, int], tuple[int, int]]]):
+        if len(run) < self.LONG_ENTRANCE:
+            self._add_transition(*run[len(run) // 2])
+        else:
+            self._add_transition(*run[0])
+            self._add_transition(*run[-1])
+
+    def _build_entrances(self):
+        city = self.cost_model.city
+        cs = self.cluster_size
+
+        # Bordes verticales: entre (cx, cy) y (cx + 1, cy)
+        for x in range(cs - 1, city.width - 1, cs):
+            run = []
+            for y in range(city.height):
+                if y % cs == 0 and run:
+                    self._add_entrance_run(run)  # el tramo no cruza clusters
+                    run = []
+                if self._walkable(x, y) and self._walkable(x + 1, y):
+                    run.append(((x, y), (x + 1, y)))
+                elif run:
+                    self._add_entrance_run(run)
+                    run = []
+            if run:
+                self._add_entrance_run(run)
+
+        # Bordes horizontales: entre (cx, cy) y (cx, cy + 1)
+        for y in range(cs - 1, city.height - 1, cs):
+            run = []
+            for x in range(city.width):
+                if x % cs == 0 and run:
+                    self._add_entrance_run(run)
+                    run = []
+                if self._walkable(x, y) and self._walkable(x, y + 1):
+                    run.append(((x, y), (x, y + 1)))
+                elif run:
+                    self._add_entrance_run(run)
+                    run = []
+            if run:
+                self._add_entrance_run(run)
+
+    def _build_intra_edges(self, cluster: tuple[int, int], nodes: set):
+        bounds = self.cluster_bounds(cluster)
+        for node in nodes:
+            dist = self._local_dijkstra(node, bounds)
+            for other in nodes:
+                if other != node and other in dist:
+                    self._add_edge(node, other, dist[other])
+
+    def _local_dijkstra(self, source: tuple[int, int], bounds, reverse: bool = False) -> dict:
+        """
+        Dijkstra limitado a `bounds`.
+        reverse=False: costo desde source hacia cada tile.
+        reverse=True: costo desde cada tile hacia source.
+        """
+        width = self.cost_model.city.width
+        tile_costs = self.cost_model.tile_costs
+        x0, y0, x1, y1 = bounds
+        dist = {source: 0.0}
+        heap = [(0.0, source)]
+        while heap:
+            d, current = heapq.heappop(heap)
+            if d > dist[current]:
+                continue
+            cx, cy = current
+            if reverse:
+                step_back = tile_costs[cy * width + cx]
+            for x, y in ((cx - 1, cy), (cx + 1, cy), (cx, cy - 1), (cx, cy + 1)):
+                if not (x0 <= x < x1 and y0 <= y < y1):
+                    continue
+                cost = tile_costs[y * width + x]
+                if cost == math.inf:
+                    continue
+                nd = d + (step_back if reverse else cost)
+                if nd < dist.get((x, y), math.inf):
+                    dist[(x, y)] = nd
+                    heapq.heappush(heap, (nd, (x, y)))
+        return dist
+
+    # --- Consultas ---
+
+    def node_count(self) -> int:
+        return len(self.edges)
+
+    def search(self, start: tuple[int, int], goal: tuple[int, int]) -> "HierarchicalSearch":
+        self.sync()
+        return HierarchicalSearch(self, start, goal)
+
+    def find_path(self, start: tuple[int, int], goal: tuple[int, int]) -> list[tuple[int, int]]:
+        return self.search(start, goal).run()
+
+
+class HierarchicalSearch(_ResumableSearch):
+    """
+    Consulta HPA* reanudable. Cada unidad de trabajo de `step` es la expansión
+    de un nodo abstracto o el refinamiento de un tramo dentro de un cluster.
+    """
+
+    def __init__(self, hierarchy: HierarchicalPathfinder, start: tuple[int, int], goal: tuple[int, int]):
+        super().__init__(hierarchy.cost_model, start, goal)
+        self.hierarchy = hierarchy
+        self._work = self._run()
+
+    def step(self, max_expansions: int) -> bool:
+        if self.done:
+            return True
+        for _ in range(max_expansions):
+            try:
+                next(self._work)
+            except StopIteration:
+                self.done = True
+                self._work = None
+                return True
+            self.expansions += 1
+        return False
+
+    def _run(self):
+        start, goal = self.start, self.goal
+        if start == goal:
+            return
+        hierarchy = self.hierarchy
+        cost_model = self.cost_model
+        if cost_model.tile_cost(*goal) == math.inf:
+            return
+
+        start_cluster = hierarchy.cluster_of(start)
+        goal_cluster = hierarchy.cluster_of(goal)
+
+        # 1. Conectar inicio y meta a los nodos abstractos de su cluster
+        start_dist = hierarchy._local_dijkstra(start, hierarchy.cluster_bounds(start_cluster))
+        start_edges = {
+            node: start_dist[node]
+            for node in hierarchy.nodes_by_cluster.get(start_cluster, ())
+            if node in start_dist and node != start
+        }
+        goal_dist = hierarchy._local_dijkstra(goal, hierarchy.cluster_bounds(goal_cluster), reverse=True)
+        to_goal = {
+            node: goal_dist[node]
+            for node in hierarchy.nodes_by_cluster.get(goal_cluster, ())
+            if node in goal_dist
+        }
+        # Cerca de la meta la ruta directa puede ser mucho mejor que pasar por
+        # los nodos de transición: se ofrece como arista inicio -> meta
+        direct = None
+        local_bounds = hierarchy.local_bounds(start, goal)
+        if local_bounds is not None:
+            direct = AStarSearch(cost_model, start, goal, local_bounds).run()
+            yield
+            if direct:
+                start_edges[goal] = cost_model.path_cost(direct)
+
+        # 2. A* sobre el grafo abstracto
+        h_unit = cost_model.min_tile_cost
+        open_set = [(manhattan(start, goal) * h_unit, start)]
+        g_score = {start: 0.0}
+        came_from = {}
+        closed = set()
+        found = False
+        while open_set:
+            _, current = heapq.heappop(open_set)
+            if current == goal:
+                found = True
+                break
+            if current in closed:
+                continue
+            closed.add(current)
+            yield
+
+            if current == start:
+                neighbors = dict(hierarchy.edges.get(start, {}))
+                for node, cost in start_edges.items():
+                    if cost < neighbors.get(node, math.inf):
+                        neighbors[node] = cost
+            else:
+                neighbors = hierarchy.edges.get(current, {})
+            items = list(neighbors.items())
+            if current in to_goal:
+                items.append((goal, to_goal[current]))
+
+            for neighbor, cost in items:
+                tentative = g_score[current] + cost
+                if tentative < g_score.get(neighbor, math.inf):
+                    g_score[neighbor] = tentative
+                    came_from[neighbor] = current
+                    heapq.heappush(open_set, (tentative + manhattan(neighbor, goal) * h_unit, neighbor))
+
+        if not found:
+            return
+
+        # 3. Refinar cada tramo abstracto con un A* local
+        waypoints = [start] + _reconstruct(came_from, goal)
+        if len(waypoints) == 2 and direct:
+            self.path = direct
+            return
+        path = []
+        for a, b in zip(waypoints, waypoints[1:]):
+            if manhattan(a, b) == 1:
+                path.append(b)
+                continue
+            # Ambos extremos de un tramo intra-cluster están en el mismo cluster
+            bounds = hierarchy.cluster_bounds(hierarchy.cluster_of(a))
+            path.extend(AStarSearch(cost_model, a, b, bounds).run())
+            yield
+        self.path = path
@@ -1,13 +1,77 @@
+import heapq
+import itertools
+import logging
+import math
+from bisect import bisect_left, bisect_right
+
 from .order import Order
 
+logger = logging.getLogger(__name__)
+
 class Node:
-    def __init__(self, order: Order):
+    def __init__(self, order: Order, seq: int = 0):
         self.order = order
         self.next = None
         self.prev = None
+        # Orden de llegada (desempata en las vistas ordenadas)
+        self.seq = seq
+        # False cuando el nodo sale del inventario (el heap de deadlines lo ignora)
+        self.linked = True
+
+
+class _SortedView:
+    """Nodos del inventario ordenados por una llave fija (búsqueda binaria)."""
+
+    def __init__(self, key):
+        self.key = key
+        self._keys = []
+        self._nodes = []
+
+    def _entry_key(self, node: Node):
+        return (self.key(node.order), node.seq)
+
+    def insert(self, node: Node):
+        entry = self._entry_key(node)
+        i = bisect_right(self._keys, entry)
+        self._keys.insert(i, entry)
+        self._nodes.insert(i, node)
+
+    def index(self, node: Node) -> int:
+        entry = self._entry_key(node)
+        i = bisect_left(self._keys, entry)
+        if i < len(self._keys) and self._keys[i] == entry:
+            return i
+        return -1
+
+    def remove(self, node: Node):
+        i = self.index(node)
+        if i >= 0:
+            del self._keys[i]
+            del self._nodes[i]
+
+    def __len__(self) -> int:
+        return len(self._nodes)
+
+    def __getitem__(self, i) -> Node:
+        return self._nodes[i]
+
+    def __iter__(self):
+        return iter(self._nodes)
+
+
+def _value_density(order: Order) -> float:
+    return order.payout / order.weight if order.weight else math.inf
 
 
 class Inventory:
+    # Vistas ordenadas que se mantienen siempre al día (la primera es la más importante):
+    # prioridad descendente, deadline más próximo primero, pago por kg descendente
+    VIEWS = {
+        "priority": lambda o: -o.priority,
+        "deadline": lambda o: o.deadline_ts,
+        "value": lambda o: -_value_density(o),
+    }
+
     def __init__(self, max_weight=10):
         self.first = None
         self.last = None
@@ -15,12 +79,20 @@ class Inventory:
         self.max_weight = max_weight
         self.current_weight = 0
         self.order_count = 0
+        # Índice id -> nodo para encontrar pedidos sin recorrer la lista
+        self._nodes: dict = {}
+        # Heap (deadline_ts, secuencia, nodo) con borrado perezoso
+        self._deadlines = []
+        self._sequence = itertools.count()
+        self._views = {name: _SortedView(key) for name, key in self.VIEWS.items()}
+        # Vista activa para navegar (None = orden de la lista)
+        self.view = None
 
     def add_order(self, order: Order):
         if self.current_weight + order.weight > self.max_weight:
             raise ValueError(f"Cannot add {order.id}. Exceeds maximum weight.")
 
-        new_node = Node(order)
+        new_node = Node(order, next(self._sequence))
         if self.first is None:
             self.first = new_node
             self.last = new_node
@@ -32,65 +104,125 @@ class Inventory:
 
         self.current_weight += order.weight
         self.order_count += 1
-        print(f"Order {order.id} added to inventory.")
+        self._nodes[order.id] = new_node
+        for view in self._views.values():
+            view.insert(new_node)
+        heapq.heappush(self._deadlines, (order.deadline_ts, new_node.seq, new_node))
+        logger.info("Order %s added to inventory.", order.id)
         return True
 
+    def _neighbor(self, node, step):
+        """Nodo siguiente (step=1) o anterior (step=-1) según la vista activa."""
+        if node is None:
+            return None
+        if self.view is None:
+            return node.next if step > 0 else node.prev
+        view = self._views[self.view]
+        i = view.index(node) + step
+        return view[i] if 0 <= i < len(view) else None
+
     def view_next_order(self):
-        if self.current_order and self.current_order.next:
-            self.current_order = self.current_order.next
-            print(f"Viewing order: {self.current_order.order.id}")
+        following = self._neighbor(self.current_order, 1)
+        if following:
+            self.current_order = following
+            logger.debug("Viewing order: %s", self.current_order.order.id)
         else:
-            print("Already at the last order.")
+            logger.debug("Already at the last order.")
 
     def view_prev_order(self):
-        if self.current_order and self.current_order.prev:
-            self.current_order = self.current_order.prev
-            print(f"Viewing order: {self.current_order.order.id}")
+        previous = self._neighbor(self.current_order, -1)
+        if previous:
+            self.current_order = previous
+            logger.debug("Viewing order: %s", self.current_order.order.id)
         else:
-            print("Already at the first order.")
+            logger.debug("Already at the first order.")
 
-    def complete_current_order(self):
-        if self.current_order is None:
-            print("No order selected to complete.")
-            return
+    def select(self, order_id) -> bool:
+        """Hace de `order_id` el pedido actual (O(1)). Retorna False si no está."""
+        node = self._nodes.get(order_id)
+        if node is None:
+            return False
+        self.current_order = node
+        return True
 
-        completed_order = self.current_order.order
+    def set_view(self, name):
+        """
+        Cambia el orden de navegación a una vista mantenida ("priority",
+        "deadline", "value") o a la lista (None). O(1): no reordena nada.
+        El pedido actual no cambia.
+        """
+        if name is not None and name not in self._views:
+            raise ValueError(f"Unknown inventory view: {name}")
+        self.view = name
 
-        if self.current_order.prev:
-            self.current_order.prev.next = self.current_order.next
-        else:
-            self.first = self.current_order.next
+    def orders_by(self, name):
+        """Pedidos en el orden de la vista `name`."""
+        return [node.order for node in self._views[name]]
+
+    def first_by(self, name):
+        """Primer pedido de la vista `name` (O(1)), o None si está vacío."""
+        view = self._views[name]
+        return view[0].order if len(view) else None
 
-        if self.current_order.next:
-            self.current_order.next.prev = self.current_order.prev
+    def most_urgent(self):
+        """Pedido con el deadline más próximo."""
+        return self.first_by("deadline")
+
+    def next_by(self, name, order_id):
+        """Pedido que sigue a `order_id` en la vista `name` (O(log n)), o None."""
+        node = self._nodes.get(order_id)
+        if node is None:
+            return None
+        view = self._views[name]
+        i = view.index(node) + 1
+        return view[i].order if i < len(view) else None
+
+    def _unlink(self, node):
+        """Quita el nodo de la lista y de los índices; mueve current_order si hace falta."""
+        if node is self.current_order:
+            # Avanza al siguiente pedido si existe, sino al anterior
+            self.current_order = self._neighbor(node, 1) or self._neighbor(node, -1)
+
+        if node.prev:
+            node.prev.next = node.next
         else:
-            self.last = self.current_order.prev
+            self.first = node.next
 
-        # Avanza al siguiente pedido si existe, sino al anterior
-        if self.current_order.next:
-            self.current_order = self.current_order.next
+        if node.next:
+            node.next.prev = node.prev
         else:
-            self.current_order = self.current_order.prev
+            self.last = node.prev
 
-        self.current_weight -= completed_order.weight
+        node.linked = False
+        self._nodes.pop(node.order.id, None)
+        for view in self._views.values():
+            view.remove(node)
+        self.current_weight -= node.order.weight
         self.order_count -= 1
-        print(f"Order {completed_order.id} completed!")
+
+    def complete_current_order(self):
+        if self.current_order is None:
+            logger.warning("No order selected to complete.")
+            return
+
+        completed_order = self.current_order.order
+        self._unlink(self.current_order)
+        logger.info("Order %s completed!", completed_order.id)
         return completed_order
 
     def sort_inventory(self, key):
         """
         Ordena el inventario in-place en orden DESCENDENTE según la función key.
         Usa algoritmo de ordenamiento por inserción optimizado.
+        Para prioridad, deadline o pago/kg es mejor `set_view`, que es O(1).
         
         Args:
             key (callable): Función que toma un Order y retorna un valor comparable
         """
         if not self.first or not self.first.next:
-            print("Inventory has less than 2 items, no sorting needed.")
+            logger.debug("Inventory has less than 2 items, no sorting needed.")
             return
 
-        current_id = self.current_order.order.id if self.current_order else None
-
         nodes_list = []
         current = self.first
         while current:
@@ -111,50 +243,55 @@ class Inventory:
                 self.last = node
                 node.next = None
 
-        if current_id is not None:
-            node = self.first
-            while node:
-                if node.order.id == current_id:
-                    self.current_order = node
-                    break
-                node = node.next
-        else:
+        # Los nodos se reutilizan: current_order (y los índices) siguen válidos.
+        # La navegación vuelve al orden de la lista recién ordenada.
+        self.view = None
+        if self.current_order is None:
             self.current_order = self.first
 
-        print("Inventory sorted successfully.")
+        logger.debug("Inventory sorted successfully.")
 
     def remove_order_by_id(self, order_id):
-        """Elimina un pedido del inventario por su ID."""
-        node_to_remove = None
-        current = self.first
-        while current:
-            if current.order.id == order_id:
-                node_to_remove = current
-                break
-            current = current.next
-
+        """Elimina un pedido del inventario por su ID (O(1) con el índice de nodos)."""
+        node_to_remove = self._nodes.get(order_id)
         if node_to_remove is None:
             return False
 
-        # Si el pedido a eliminar es el actual, mover el puntero `current_order`
-        if node_to_remove == self.current_order:
-            if self.current_order.next:
-                self.current_order = self.current_order.next
-            else:
-                self.current_order = self.current_order.prev
+        self._unlink(node_to_remove)
+        logger.info("Order %s removed from inventory.", order_id)
+        return True
 
-        # Desconectar el nodo de la lista
-        if node_to_remove.prev:
-            node_to_remove.prev.next = node_to_remove.next
-        else:
-            self.first = node_to_remove.next
+    def get_order(self, order_id):
+        """Pedido del inventario con ese id, o None."""
+        node = self._nodes.get(order_id)
+        return node.order if node is not None else None
 
-        if node_to_remove.next:
-            node_to_remove.next.prev = node_to_remove.prev
-        else:
-            self.last = node_to_remove.prev
+    def __contains__(self, order_id) -> bool:
+        return order_id in self._nodes
 
-        self.current_weight -= node_to_remove.order.weight
-        self.order_count -= 1
-        print(f"Order {order_id} removed from inventory.")
-        return True
\ No newline at end of file
+    def _prune_deadlines(self):
+        """Descarta del tope del heap los nodos que ya salieron del inventario."""
+        deadlines = self._deadlines
+        while deadlines and not deadlines[0][2].linked:
+            heapq.heappop(deadlines)
+
+    def next_deadline(self):
+        """Deadline más próximo (segundos epoch) o None si el inventario está vacío."""
+        self._prune_deadlines()
+        return self._deadlines[0][0] if self._deadlines else None
+
+    def pop_expired(self, now_ts):
+        """
+        Pedidos cuyo deadline ya pasó, del más antiguo al más reciente.
+        Solo revisa el tope del heap: O(1) si no vence nada.
+        Los pedidos siguen en el inventario; el llamador decide qué hacer con ellos.
+        Args:
+            now_ts (float): Hora actual del juego en segundos epoch.
+        """
+        expired = []
+        deadlines = self._deadlines
+        while True:
+            self._prune_deadlines()
+            if not deadlines or deadlines[0][0] >= now_ts:
+                return expired
+            expired.append(heapq.heappop(deadlines)[2].order)
@@ -0,0 +1,242 @@
+import heapq
+import math
+
+from .cost_model import CostModel
+from .path_service import _ResumableSearch, manhattan
+
+
+class JumpTable:
+    """
+    Tablas precalculadas de JPS (estilo JPS+) para que cada salto sea O(1).
+    Todas son listas planas en orden fila mayor (índice y * width + x):
+    - run_h / run_v: id del tramo caminable horizontal/vertical (-1 si bloqueado).
+    - h_stop[dx]: x del primer tile con vecino forzado desde x en dirección dx
+      dentro del tramo, o -1 si antes hay un muro.
+    - v_stop[dy]: y del primer tile donde un salto vertical debe detenerse
+      (vecino forzado o un salto horizontal que encuentra algo), o -1.
+    Las condiciones que dependen de la meta se revisan en cada consulta.
+    """
+
+    def __init__(self, cost_model: CostModel):
+        self.cost_model = cost_model
+        self.version = cost_model.version
+        city = cost_model.city
+        self.width = width = city.width
+        self.height = height = city.height
+        blocked = city.blocked
+        size = width * height
+
+        def walkable(x, y):
+            return 0 <= x < width and 0 <= y < height and not blocked[y * width + x]
+
+        self.run_h = [-1] * size
+        self.run_v = [-1] * size
+        run = 0
+        for y in range(height):
+            previous = False
+            for x in range(width):
+                if blocked[y * width + x]:
+                    previous = False
+                    continue
+                if not previous:
+                    run += 1
+                self.run_h[y * width + x] = run
+                previous = True
+        for x in range(width):
+            previous = False
+            for y in range(height):
+                if blocked[y * width + x]:
+                    previous = False
+                    continue
+                if not previous:
+                    run += 1
+                self.run_v[y * width + x] = run
+                previous = True
+
+        self.h_stop = {1: [-1] * size, -1: [-1] * size}
+        for dx in (1, -1):
+            table = self.h_stop[dx]
+            xs = range(width - 1, -1, -1) if dx == 1 else range(width)
+            for y in range(height):
+                following = -1
+                for x in xs:
+                    if not walkable(x, y):
+                        following = -1
+                        continue
+                    if (walkable(x, y - 1) and not walkable(x - dx, y - 1)) or \
+                       (walkable(x, y + 1) and not walkable(x - dx, y + 1)):
+                        following = x
+                    table[y * width + x] = following
+
+        h_stop = self.h_stop
+        self.v_stop = {1: [-1] * size, -1: [-1] * size}
+        for dy in (1, -1):
+            table = self.v_stop[dy]
+            ys = range(height - 1, -1, -1) if dy == 1 else range(height)
+            for x in range(width):
+                following = -1
+                for y in ys:
+                    if not walkable(x, y):
+                        following = -1
+                        continue
+                    if (walkable(x - 1, y) and not walkable(x - 1, y - dy)) or \
+                       (walkable(x + 1, y) and not walkable(x + 1, y - dy)) or \
+                       (walkable(x + 1, y) and h_stop[1][y * width + x + 1] != -1) or \
+                       (walkable(x - 1, y) and h_stop[-1][y * width + x - 1] != -1):
+                        following = y
+                    table[y * width + x] = following
+
+
+class JumpPointSearch(_ResumableSearch):
+    """
+    Jump Point Search para cuadrículas 4-conectadas de costo uniforme.
+
+    En lugar de meter al heap cada vecino, la búsqueda "salta" en línea recta
+    hasta encontrar un punto de salto: la meta, un tile con vecino forzado
+    (un obstáculo que termina justo al lado) o, al moverse en vertical, un
+    tile desde el cual un salto horizontal encuentra un punto de salto.
+    Solo los puntos de salto entran al heap, lo que elimina la mayoría de las
+    rutas simétricas. Las rutas tienen el mismo costo que las de A*.
+
+    Los saltos se resuelven en O(1) con un `JumpTable` precalculado.
+    Requiere que `cost_model.is_uniform()` sea True.
+    """
+
+    def __init__(self, cost_model: CostModel, start: tuple[int, int], goal: tuple[int, int],
+                 table: JumpTable | None = None):
+        super().__init__(cost_model, start, goal)
+        if table is None or table.version != cost_model.version:
+            table = JumpTable(cost_model)
+        self.table = table
+        city = cost_model.city
+        self.width = city.width
+        self.height = city.height
+        self.blocked = city.blocked
+        self.step_cost = cost_model.min_tile_cost
+        self.goal_index = goal[1] * city.width + goal[0] if city.in_bounds(*goal) else -1
+
+        self.open_set = [(manhattan(start, goal) * self.step_cost, start)]
+        self.came_from = {}
+        self.g_score = {start: 0.0}
+        self.closed = set()
+        self.heap_pushes = 1
+
+    def _walkable(self, x: int, y: int) -> bool:
+        return 0 <= x < self.width and 0 <= y < self.height and not self.blocked[y * self.width + x]
+
+    def _jump_horizontal(self, x: int, y: int, dx: int):
+        """Salta en horizontal desde (x, y) (ya avanzado un paso) en dirección dx."""
+        if not self._walkable(x, y):
+            return None
+        table = self.table
+        index = y * self.width + x
+        stop = table.h_stop[dx][index]
+
+        gx, gy = self.goal
+        if gy == y and self.goal_index >= 0 and table.run_h[index] == table.run_h[self.goal_index] \
+           and (gx - x) * dx >= 0 and (stop == -1 or (gx - stop) * dx < 0):
+            return (gx, gy)
+        if stop == -1:
+            return None
+        return (stop, y)
+
+    def _jump_vertical(self, x: int, y: int, dy: int):
+        """Salta en vertical; se detiene donde un salto horizontal encuentra algo."""
+        if not self._walkable(x, y):
+            return None
+        table = self.table
+        width = self.width
+        index = y * width + x
+        stop = table.v_stop[dy][index]
+
+        # La fila de la meta: desde (x, gy) un salto horizontal llega a la meta
+        gx, gy = self.goal
+        if self.goal_index >= 0 and (gy - y) * dy >= 0 and (stop == -1 or (gy - stop) * dy < 0):
+            row_index = gy * width + x
+            if table.run_v[row_index] == table.run_v[index] \
+               and table.run_h[row_index] == table.run_h[self.goal_index]:
+                return (x, gy)
+        if stop == -1:
+            return None
+        return (x, stop)
+
+    def _neighbors(self, node: tuple[int, int]):
+        """Direcciones a explorar desde `node` según la dirección con la que se llegó."""
+        x, y = node
+        parent = self.came_from.get(node)
+        if parent is None:
+            return [(-1, 0), (1, 0), (0, -1), (0, 1)]
+
+        dx = (x > parent[0]) - (x < parent[0])
+        dy = (y > parent[1]) - (y < parent[1])
+        if dx != 0:
+            return [(0, -1), (0, 1), (dx, 0)]
+        return [(-1, 0), (1, 0), (0, dy)]
+
+    def step(self, max_expansions: int) -> bool:
+        if self.done:
+            return True
+
+        open_set, came_from, g_score, closed = self.open_set, self.came_from, self.g_score, self.closed
+        step_cost = self.step_cost
+        goal = self.goal
+
+        expanded = 0
+        while open_set and expanded < max_expansions:
+            _, current = heapq.heappop(open_set)
+
+            if current == goal:
+                self.path = self._expand_path(current)
+                break
+            if current in closed:
+                continue
+            closed.add(current)
+            expanded += 1
+
+            cx, cy = current
+            for dx, dy in self._neighbors(current):
+                if dx != 0:
+                    jump_point = self._jump_horizontal(cx + dx, cy, dx)
+                else:
+                    jump_point = self._jump_vertical(cx, cy + dy, dy)
+                if jump_point is None or jump_point in closed:
+                    continue
+
+                tentative_g = g_score[current] + manhattan(current, jump_point) * step_cost
+                if tentative_g < g_score.get(jump_point, math.inf):
+                    g_score[jump_point] = tentative_g
+                    came_from[jump_point] = current
+                    heapq.heappush(open_set, (tentative_g + manhattan(jump_point, goal) * step_cost, jump_point))
+                    self.heap_pushes += 1
+        else:
+            if open_set:
+                self.expansions += expanded
+                return False
+
+        self.expansions += expanded
+        self._finish()
+        return True
+
+    def _expand_path(self, current: tuple[int, int]) -> list[tuple[int, int]]:
+        """Convierte la cadena de puntos de salto en la ruta completa tile por tile."""
+        jump_points = [current]
+        while current in self.came_from:
+            current = self.came_from[current]
+            jump_points.append(current)
+        jump_points.reverse()
+
+        path = []
+        for (ax, ay), (bx, by) in zip(jump_points, jump_points[1:]):
+            dx = (bx > ax) - (bx < ax)
+            dy = (by > ay) - (by < ay)
+            x, y = ax, ay
+            while (x, y) != (bx, by):
+                x += dx
+                y += dy
+                path.append((x, y))
+        return path
+
+
+def jump_point_search(cost_model: CostModel, start: tuple[int, int], goal: tuple[int, int]) -> list[tuple[int, int]]:
+    """JPS completo (ver `JumpPointSearch`)."""
+    return JumpPointSearch(cost_model, start, goal).run()
@@ -0,0 +1,96 @@
+import logging
+from collections import deque
+from contextlib import contextmanager
+
+# Logger padre de todos los módulos de src.logic (cada módulo usa logging.getLogger(__name__))
+LOGIC_LOGGER = "src.logic"
+
+# Por cada handler que bajó el nivel del logger: el nivel anterior y los niveles
+# de los demás handlers que se subieron mientras tanto (se restauran al quitarlo)
+_previous_levels: dict[logging.Handler, tuple[int, dict[logging.Handler, int]]] = {}
+
+
+class RingBufferHandler(logging.Handler):
+    """
+    Guarda en memoria los últimos `capacity` registros (para depurar sin
+    escribir a la terminal). Los mensajes se formatean solo al leerlos.
+    """
+
+    def __init__(self, capacity: int = 1000, level=logging.NOTSET):
+        super().__init__(level)
+        self.records: deque[logging.LogRecord] = deque(maxlen=capacity)
+
+    def emit(self, record: logging.LogRecord):
+        self.records.append(record)
+
+    def messages(self) -> list[str]:
+        return [self.format(record) for record in self.records]
+
+    def clear(self):
+        self.records.clear()
+
+
+def configure_console(level=logging.INFO, fmt: str = "%(message)s") -> logging.Handler:
+    """
+    Muestra en la terminal los mensajes de src.logic desde `level`.
+    Sin configurar, solo las advertencias llegan a stderr y el resto cuesta
+    apenas la revisión de nivel (el mensaje nunca se formatea).
+    """
+    logger = logging.getLogger(LOGIC_LOGGER)
+    handler = logging.StreamHandler()
+    handler.setFormatter(logging.Formatter(fmt))
+    logger.addHandler(handler)
+    _previous_levels[handler] = (logger.level, {})
+    logger.setLevel(level)
+    return handler
+
+
+def attach_ring_buffer(capacity: int = 1000, level=logging.DEBUG) -> RingBufferHandler:
+    """
+    Agrega un RingBufferHandler al logger de src.logic y lo retorna.
+    Si hace falta baja el nivel del logger; para que los registros extra solo
+    lleguen al buffer, los demás handlers (también los de loggers padres, p. ej.
+    la terminal) suben al nivel efectivo que tenía. `detach_handler` deshace ambos.
+    """
+    logger = logging.getLogger(LOGIC_LOGGER)
+    handler = RingBufferHandler(capacity)
+    effective = logger.getEffectiveLevel()
+    if logger.level == logging.NOTSET or logger.level > level:
+        raised = {}
+        current = logger
+        while current is not None:
+            for other in current.handlers:
+                if other.level < effective and other not in raised:
+                    raised[other] = other.level
+                    other.setLevel(effective)
+            current = current.parent if current.propagate else None
+        _previous_levels[handler] = (logger.level, raised)
+        logger.setLevel(level)
+    logger.addHandler(handler)
+    return handler
+
+
+def detach_handler(handler: logging.Handler):
+    """Quita el handler y devuelve el logger (y los demás handlers) a su nivel anterior."""
+    logger = logging.getLogger(LOGIC_LOGGER)
+    logger.removeHandler(handler)
+    previous = _previous_levels.pop(handler, None)
+    if previous is not None:
+        level, raised = previous
+        logger.setLevel(level)
+        for other, other_level in raised.items():
+            other.setLevel(other_level)
+
+
+@contextmanager
+def ring_buffer(capacity: int = 1000, level=logging.DEBUG):
+    """
+    RingBufferHandler activo solo dentro del bloque `with`:
+        with ring_buffer() as handler:
+            ...
+    """
+    handler = attach_ring_buffer(capacity, level)
+    try:
+        yield handler
+    finally:
+        detach_handler(handler)
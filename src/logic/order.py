@@ -1,27 +1,91 @@
+import math
+from datetime import datetime, timezone
+
+
+def parse_deadline(value) -> float:
+    """
+    Convierte un deadline (ISO 8601, datetime o número) a segundos epoch UTC.
+    Las fechas sin zona horaria se asumen en UTC; sin deadline retorna math.inf.
+    """
+    if value is None:
+        return math.inf
+    if isinstance(value, (int, float)):
+        return float(value)
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value)
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.timestamp()
+
+
+def _coords(value):
+    return tuple(value) if value is not None else None
+
+
 class Order:
+    """
+    Pedido inmutable y compacto (con __slots__).
+    Se crea una sola vez al recibir los trabajos del API:
+    - pickup/dropoff son tuplas (x, y).
+    - deadline conserva el texto original (UI y guardado) y deadline_ts es
+      el mismo instante en segundos epoch UTC.
+    - release_time son segundos de juego (float).
+    """
+
+    __slots__ = ("id", "pickup", "dropoff", "payout", "deadline", "deadline_ts",
+                 "weight", "priority", "release_time")
+
     def __init__(self, id, pickup, dropoff, payout, deadline, weight, priority, release_time):
-        self.id = id
-        self.pickup = pickup
-        self.dropoff = dropoff
-        self.payout = payout
-        self.deadline = deadline
-        self.weight = weight
-        self.priority = priority
-        self.release_time = release_time
+        set_field = object.__setattr__
+        set_field(self, "id", id)
+        set_field(self, "pickup", _coords(pickup))
+        set_field(self, "dropoff", _coords(dropoff))
+        set_field(self, "payout", payout)
+        set_field(self, "deadline", deadline)
+        # Deadline ya convertido (segundos epoch), para no parsear el string en cada frame
+        set_field(self, "deadline_ts", parse_deadline(deadline))
+        set_field(self, "weight", weight)
+        set_field(self, "priority", priority)
+        set_field(self, "release_time", float(release_time or 0))
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"Order es inmutable (no se puede asignar '{name}')")
+
+    def __delattr__(self, name):
+        raise AttributeError(f"Order es inmutable (no se puede borrar '{name}')")
+
+    def __reduce__(self):
+        return (Order, (self.id, self.pickup, self.dropoff, self.payout, self.deadline,
+                        self.weight, self.priority, self.release_time))
 
     def __repr__(self):
         return f"Pedido({self.id} - Prio: {self.priority})"
 
     @classmethod
     def from_dict(cls, data):
-        """Crea una instancia de Order desde un diccionario."""
+        """Crea una instancia de Order desde un diccionario (o retorna la misma si ya es Order)."""
+        if isinstance(data, Order):
+            return data
         return cls(
             id=data.get('id'),
             pickup=data.get('pickup'),
             dropoff=data.get('dropoff'),
-            payout=data.get('payout'),
+            payout=data.get('payout', 0),
             deadline=data.get('deadline'),
-            weight=data.get('weight'),
-            priority=data.get('priority'),
-            release_time=data.get('release_time')
-        )
\ No newline at end of file
+            weight=data.get('weight', 0),
+            priority=data.get('priority', 0),
+            release_time=data.get('release_time', 0)
+        )
+
+    def to_dict(self):
+        """Diccionario con los campos originales (para guardar partidas)."""
+        return {
+            'id': self.id,
+            'pickup': list(self.pickup) if self.pickup is not None else None,
+            'dropoff': list(self.dropoff) if self.dropoff is not None else None,
+            'payout': self.payout,
+            'deadline': self.deadline,
+            'weight': self.weight,
+            'priority': self.priority,
+            'release_time': self.release_time,
+        }
@@ -0,0 +1,290 @@
+import math
+
+import numpy as np
+
+from .cost_model import CostModel
+from .order import Order
+
+
+class OrderTable:
+    """
+    Tabla columnar (NumPy) de los pedidos abiertos para puntuarlos todos a la vez.
+
+    Cada columna es un arreglo: recogida x/y, entrega x/y, pago, peso,
+    prioridad, deadline (segundos epoch) y la distancia de entrega
+    (recogida -> entrega), que se calcula una vez al agregar el pedido.
+    Las filas 0..len-1 siempre están ocupadas: al quitar un pedido la última
+    fila ocupa su lugar, así que agregar y quitar son O(1).
+
+    Para puntuar con distancias reales, los campos listos de DistanceIndex
+    hacia las recogidas se copian como filas de `_stack` (una por tile de
+    recogida) y la columna `pickup_slot` dice qué fila usa cada pedido (-1 si
+    su campo aún no está listo). Así la distancia desde una posición a todas
+    las recogidas es una sola lectura indexada de NumPy. La columna
+    `delivery` se actualiza igual: cuando queda listo el campo de una
+    entrega, solo se releen las filas de los pedidos que entregan ahí.
+
+    `OrderManager` la mantiene sincronizada al liberar y aceptar pedidos.
+    """
+
+    COLUMNS = {
+        "pickup_x": np.int32,
+        "pickup_y": np.int32,
+        "dropoff_x": np.int32,
+        "dropoff_y": np.int32,
+        "payout": np.float64,
+        "weight": np.float64,
+        "priority": np.float64,
+        "deadline": np.float64,
+        "delivery": np.float64,
+        "pickup_slot": np.int32,
+    }
+
+    def __init__(self, cost_model: CostModel, capacity: int = 64):
+        self.cost_model = cost_model
+        self.size = 0
+        self.orders: list[Order] = []
+        self._rows: dict = {}
+        for name, dtype in self.COLUMNS.items():
+            setattr(self, name, np.zeros(capacity, dtype=dtype))
+        # Versión del modelo de costo con la que se calculó la columna `delivery`
+        self.version = cost_model.version
+        # Índice y generación con los que se leyeron los campos (ver `sync_fields`)
+        self._distance_index = None
+        self.distance_generation = None
+        self._pickup_rows: dict = {}  # tile -> ids de los pedidos que recogen ahí
+        self._dropoff_rows: dict = {}  # tile -> ids de los pedidos que entregan ahí
+        self._slots: dict = {}  # tile -> fila de `_stack`
+        self._free_slots: list[int] = []
+        city = cost_model.city
+        self._stack = np.empty((0, city.width * city.height), dtype=np.float32)
+
+    def __len__(self) -> int:
+        return self.size
+
+    def __contains__(self, order_id) -> bool:
+        return order_id in self._rows
+
+    def _grow(self):
+        for name in self.COLUMNS:
+            column = getattr(self, name)
+            grown = np.zeros(len(column) * 2, dtype=column.dtype)
+            grown[:self.size] = column[:self.size]
+            setattr(self, name, grown)
+
+    def add(self, order: Order, delivery_distance: float):
+        """Agrega un pedido (o actualiza su fila si ya estaba)."""
+        row = self._rows.get(order.id)
+        if row is None:
+            if self.size == len(self.payout):
+                self._grow()
+            row = self.size
+            self.size += 1
+            self._rows[order.id] = row
+            self.orders.append(order)
+        else:
+            self._forget(self.orders[row])
+            self.orders[row] = order
+        self._pickup_rows.setdefault(order.pickup, set()).add(order.id)
+        self._dropoff_rows.setdefault(order.dropoff, set()).add(order.id)
+        self.pickup_slot[row] = self._slot_for(order.pickup)
+        self.pickup_x[row], self.pickup_y[row] = order.pickup
+        self.dropoff_x[row], self.dropoff_y[row] = order.dropoff
+        self.payout[row] = order.payout
+        self.weight[row] = order.weight
+        self.priority[row] = order.priority
+        self.deadline[row] = order.deadline_ts
+        self.delivery[row] = delivery_distance
+
+    def remove(self, order_id):
+        """Quita un pedido moviendo la última fila a su lugar."""
+        row = self._rows.pop(order_id, None)
+        if row is None:
+            return
+        self._forget(self.orders[row])
+        last = self.size - 1
+        if row != last:
+            for name in self.COLUMNS:
+                column = getattr(self, name)
+                column[row] = column[last]
+            moved = self.orders[last]
+            self.orders[row] = moved
+            self._rows[moved.id] = row
+        self.orders.pop()
+        self.size = last
+
+    def _forget(self, order: Order):
+        """Quita el pedido de sus tiles y libera el slot de la recogida si nadie más lo usa."""
+        ids = self._dropoff_rows.get(order.dropoff)
+        if ids is not None:
+            ids.discard(order.id)
+            if not ids:
+                del self._dropoff_rows[order.dropoff]
+        ids = self._pickup_rows.get(order.pickup)
+        if ids is None:
+            return
+        ids.discard(order.id)
+        if not ids:
+            del self._pickup_rows[order.pickup]
+            slot = self._slots.pop(order.pickup, None)
+            if slot is not None:
+                self._free_slots.append(slot)
+
+    def _slot_for(self, tile) -> int:
+        """
+        Fila de `_stack` con el campo hacia `tile`; la copia si el campo está
+        listo y aún no tiene fila. Returns: -1 si no hay campo listo.
+        """
+        slot = self._slots.get(tile)
+        if slot is not None:
+            return slot
+        index = self._distance_index
+        field = index.field(tile) if index is not None else None
+        if field is None:
+            return -1
+        if not self._free_slots:
+            used = len(self._stack)
+            grown = np.empty((max(8, used * 2), self._stack.shape[1]), dtype=np.float32)
+            grown[:used] = self._stack
+            self._stack = grown
+            self._free_slots = list(range(len(grown) - 1, used - 1, -1))
+        slot = self._free_slots.pop()
+        self._stack[slot] = np.frombuffer(field, dtype=np.float32)
+        self._slots[tile] = slot
+        return slot
+
+    def _row_array(self, ids) -> np.ndarray:
+        rows = self._rows
+        return np.fromiter((rows[order_id] for order_id in ids), dtype=np.intp, count=len(ids))
+
+    def sync_fields(self, distance_index):
+        """
+        Pone al día la tabla con los campos de `distance_index`: copia a `_stack`
+        los campos de recogida y relee `delivery` solo para los tiles cuyo campo
+        quedó listo desde la última vez (ver `DistanceIndex.ready_since`). Si
+        cambiaron los costos o el índice, relee todo (Manhattan donde no hay campo).
+        """
+        changed = None
+        if distance_index is self._distance_index:
+            changed = distance_index.ready_since(self.distance_generation)
+        else:
+            self._distance_index = distance_index
+        n = self.size
+        if changed is None:
+            self._slots.clear()
+            self._free_slots = list(range(len(self._stack) - 1, -1, -1))
+            self.pickup_slot[:n] = -1
+            self.delivery[:n] = (np.abs(self.dropoff_x[:n] - self.pickup_x[:n])
+                                 + np.abs(self.dropoff_y[:n] - self.pickup_y[:n]))
+            changed = set(self._pickup_rows).union(self._dropoff_rows)
+
+        width = self.cost_model.city.width
+        for tile in changed:
+            ids = self._pickup_rows.get(tile)
+            if ids and tile not in self._slots:
+                slot = self._slot_for(tile)
+                if slot >= 0:
+                    self.pickup_slot[self._row_array(ids)] = slot
+            ids = self._dropoff_rows.get(tile)
+            field = distance_index.field(tile) if ids else None
+            if field is not None:
+                rows = self._row_array(ids)
+                cells = self.pickup_y[rows] * width + self.pickup_x[rows]
+                self.delivery[rows] = np.frombuffer(field, dtype=np.float32)[cells]
+        self.version = self.cost_model.version
+        self.distance_generation = distance_index.generation
+
+    def is_stale(self) -> bool:
+        """True si cambiaron los costos del mapa desde que se calculó `delivery`."""
+        return self.version != self.cost_model.version
+
+    def refresh_delivery(self, distance_fn):
+        """
+        Recalcula toda la columna de distancia de entrega (sin DistanceIndex;
+        con índice ver `sync_fields`).
+        Args:
+            distance_fn: Función (target, pos) -> distancia (p. ej. OrderManager.travel_distance).
+        """
+        for row, order in enumerate(self.orders):
+            self.delivery[row] = distance_fn(order.dropoff, order.pickup)
+        self.version = self.cost_model.version
+
+    def pickup_distances(self, pos, distance_index=None) -> np.ndarray:
+        """
+        Distancia desde `pos` hasta la recogida de cada pedido.
+        Args:
+            pos: Posición del agente.
+            distance_index: `DistanceIndex` con los campos de las recogidas; de
+                cada campo listo se lee el valor en `pos` (una sola lectura
+                indexada para toda la tabla, sin calcular nada por agente).
+                Sin índice, o si el campo de una recogida aún no está listo,
+                se usa Manhattan.
+        """
+        n = self.size
+        px = self.pickup_x[:n]
+        py = self.pickup_y[:n]
+        distances = (np.abs(px - pos[0]) + np.abs(py - pos[1])).astype(np.float64)
+        if distance_index is None:
+            return distances
+
+        city = self.cost_model.city
+        if not city.in_bounds(*pos):
+            distances[:] = math.inf
+            return distances
+        self.sync_fields(distance_index)
+        slots = self.pickup_slot[:n]
+        ready = slots >= 0
+        distances[ready] = self._stack[slots[ready], pos[1] * city.width + pos[0]]
+        return distances
+
+    def score(self, pos, payout_weight: float = 1.0, pickup_weight: float = 1.0,
+              delivery_weight: float = 0.0, penalty: float = 0.0,
+              max_weight: float | None = None, distance_index=None) -> np.ndarray:
+        """
+        Puntúa todos los pedidos en una sola pasada vectorizada:
+            score = payout_weight*pago - pickup_weight*dist_recogida
+                    - delivery_weight*dist_entrega - penalty
+        Los pedidos sin camino o que exceden `max_weight` quedan en -inf.
+        Returns:
+            np.ndarray: Un puntaje por fila (alineado con `orders`).
+        """
+        n = self.size
+        pickup = self.pickup_distances(pos, distance_index)
+        scores = payout_weight * self.payout[:n] - penalty
+        scores -= pickup_weight * pickup
+        if delivery_weight:
+            scores -= delivery_weight * self.delivery[:n]
+        unreachable = np.isinf(pickup) | np.isinf(self.delivery[:n])
+        if max_weight is not None:
+            unreachable |= self.weight[:n] > max_weight
+        scores[unreachable] = -math.inf
+        return scores
+
+    def best(self, pos, **score_args) -> tuple[Order | None, float]:
+        """
+        Pedido con el mayor puntaje (ver `score`).
+        Returns:
+            tuple: (pedido, puntaje); (None, -inf) si ninguno es viable.
+        """
+        if self.size == 0:
+            return None, -math.inf
+        scores = self.score(pos, **score_args)
+        row = int(np.argmax(scores))
+        if scores[row] == -math.inf:
+            return None, -math.inf
+        return self.orders[row], float(scores[row])
+
+    def top(self, pos, k: int, **score_args) -> list[Order]:
+        """
+        Los `k` pedidos viables con mejor puntaje (ver `score`), del mejor al peor.
+        Usa argpartition, así que no ordena toda la tabla.
+        """
+        if self.size == 0 or k <= 0:
+            return []
+        scores = self.score(pos, **score_args)
+        if k < self.size:
+            rows = np.argpartition(-scores, k - 1)[:k]
+        else:
+            rows = np.arange(self.size)
+        rows = rows[np.argsort(-scores[rows], kind="stable")]
+        return [self.orders[row] for row in rows if scores[row] != -math.inf]
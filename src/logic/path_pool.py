@@ -0,0 +1,133 @@
+import math
+import os
+from concurrent.futures import Future, ProcessPoolExecutor
+from multiprocessing.shared_memory import SharedMemory
+
+from .cost_model import CostModel
+from .path_service import AStarSearch, GreedySearch
+
+
+class _SharedCity:
+    """Lo mínimo de City que usan las búsquedas: tamaño y bloqueos."""
+
+    def __init__(self, width: int, height: int, blocked):
+        self.width = width
+        self.height = height
+        self.blocked = blocked
+
+
+class _SharedCostModel:
+    """Vista de solo lectura de un CostModel sobre la memoria compartida."""
+
+    def __init__(self, width: int, height: int, min_tile_cost: float, buffer):
+        size = width * height
+        self.tile_costs = buffer[:size * 4].cast("f")
+        self.city = _SharedCity(width, height, buffer[size * 4:size * 5])
+        self.min_tile_cost = min_tile_cost
+
+
+# Segmento al que está conectado este worker: (nombre, SharedMemory, modelo)
+_attached = None
+
+
+def _attach(name: str, width: int, height: int, min_tile_cost: float) -> _SharedCostModel:
+    global _attached
+    if _attached is not None and _attached[0] == name:
+        return _attached[2]
+    if _attached is not None:
+        model = _attached[2]
+        model.tile_costs.release()
+        model.city.blocked.release()
+        _attached[1].close()
+    # El worker solo lee; el segmento lo crea y lo borra el proceso principal
+    # (los workers comparten su resource_tracker, así que no queda registrado dos veces)
+    shm = SharedMemory(name=name)
+    model = _SharedCostModel(width, height, min_tile_cost, shm.buf)
+    _attached = (name, shm, model)
+    return model
+
+
+def solve_batch(grid: tuple, queries: list) -> list[list[tuple[int, int]]]:
+    """
+    Resuelve en un worker un lote de consultas sobre la cuadrícula compartida.
+    Args:
+        grid: (nombre del segmento, ancho, alto, costo mínimo por tile).
+        queries: Tuplas (método, inicio, meta); "greedy" usa Greedy Best-First
+            y cualquier otro método A* ponderado (mismo costo que JPS/HPA*).
+    Returns:
+        list: Una ruta por consulta (sin incluir el inicio).
+    """
+    model = _attach(*grid)
+    paths = []
+    for method, start, goal in queries:
+        search_class = GreedySearch if method == "greedy" else AStarSearch
+        paths.append(search_class(model, start, goal).run())
+    return paths
+
+
+class PathWorkerPool:
+    """
+    Resuelve lotes de rutas en un ProcessPoolExecutor.
+
+    Los costos de los tiles (float32) y los bloqueos (un byte por tile) se
+    copian a un segmento de memoria compartida que los workers solo leen, así
+    que cada lote solo envía las consultas y recibe las rutas. Cuando cambia
+    el modelo de costo se publica un segmento nuevo y se borra el anterior.
+    """
+
+    def __init__(self, cost_model: CostModel, workers: int | None = None):
+        self.cost_model = cost_model
+        self.workers = workers or os.cpu_count() or 1
+        self._executor = ProcessPoolExecutor(max_workers=self.workers)
+        self._shm: SharedMemory | None = None
+        self.version = None
+        self.batches = 0
+        self.queries = 0
+
+    def publish(self):
+        """Copia el modelo de costo a un segmento nuevo si cambió desde la última vez."""
+        if self._shm is not None and self.version == self.cost_model.version:
+            return
+        city = self.cost_model.city
+        size = city.width * city.height
+        shm = SharedMemory(create=True, size=size * 5)
+        shm.buf[:size * 4] = memoryview(self.cost_model.tile_costs).cast("B")
+        shm.buf[size * 4:size * 5] = city.blocked
+        self._release_segment()
+        self._shm = shm
+        self.version = self.cost_model.version
+
+    def _release_segment(self):
+        if self._shm is not None:
+            self._shm.close()
+            self._shm.unlink()
+            self._shm = None
+
+    def submit(self, queries: list) -> list[Future]:
+        """
+        Reparte `queries` (tuplas (método, inicio, meta)) en un lote por worker.
+        Returns:
+            list[Future]: Un futuro por lote; cada uno da las rutas de su parte
+            en el mismo orden (ver `split`).
+        """
+        self.publish()
+        city = self.cost_model.city
+        min_cost = self.cost_model.min_tile_cost
+        if min_cost == math.inf:
+            min_cost = 1.0
+        grid = (self._shm.name, city.width, city.height, min_cost)
+        self.batches += 1
+        self.queries += len(queries)
+        return [self._executor.submit(solve_batch, grid, chunk) for chunk in self.split(queries)]
+
+    def split(self, queries: list) -> list[list]:
+        """Parte las consultas en a lo sumo `workers` lotes contiguos."""
+        chunks = min(self.workers, len(queries))
+        if chunks == 0:
+            return []
+        size = math.ceil(len(queries) / chunks)
+        return [queries[i:i + size] for i in range(0, len(queries), size)]
+
+    def close(self):
+        self._executor.shutdown(wait=True, cancel_futures=True)
+        self._release_segment()
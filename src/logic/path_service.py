@@ -0,0 +1,714 @@
+import heapq
+import math
+import time
+import weakref
+from abc import ABC, abstractmethod
+from collections import OrderedDict, deque
+
+from .city import City
+from .cost_model import CostModel
+
+
+DIRECTIONS = [(-1, 0), (1, 0), (0, -1), (0, 1)]
+
+
+def manhattan(a: tuple[int, int], b: tuple[int, int]) -> int:
+    return abs(a[0] - b[0]) + abs(a[1] - b[1])
+
+
+def _reconstruct(came_from: dict, current: tuple[int, int]) -> list[tuple[int, int]]:
+    """Reconstruye el camino (sin incluir el inicio) desde el diccionario came_from."""
+    path = []
+    while current in came_from:
+        path.append(current)
+        current = came_from[current]
+    path.reverse()
+    return path
+
+
+class _ResumableSearch(ABC):
+    """
+    Base de las búsquedas reanudables.
+    `step(n)` expande a lo sumo n nodos y retorna True cuando la búsqueda terminó;
+    el resultado queda en `path` (lista vacía si no hay camino).
+    """
+
+    def __init__(self, cost_model: CostModel, start: tuple[int, int], goal: tuple[int, int]):
+        self.cost_model = cost_model
+        self.start = start
+        self.goal = goal
+        self.done = False
+        self.path: list[tuple[int, int]] = []
+        self.expansions = 0
+
+    @abstractmethod
+    def step(self, max_expansions: int) -> bool:
+        pass
+
+    def _finish(self):
+        self.done = True
+        # Libera memoria de la búsqueda; solo se conserva la ruta
+        self.open_set = []
+        self.came_from = {}
+        self.g_score = {}
+        self.closed = set()
+
+    def run(self) -> list[tuple[int, int]]:
+        """Ejecuta la búsqueda hasta terminar."""
+        while not self.step(1 << 30):
+            pass
+        return self.path
+
+
+class AStarSearch(_ResumableSearch):
+    """
+    Búsqueda A* reanudable en una cuadrícula 4-conectada ponderada por terreno.
+    El costo de entrar a un tile es su costo relativo en el modelo (1 / surface_weight)
+    y la heurística es Manhattan * costo mínimo por tile, que es admisible y consistente.
+    """
+
+    def __init__(self, cost_model: CostModel, start: tuple[int, int], goal: tuple[int, int],
+                 bounds: tuple[int, int, int, int] | None = None):
+        super().__init__(cost_model, start, goal)
+        # Rectángulo (x0, y0, x1, y1) fuera del cual no se expande (x1/y1 exclusivos)
+        city = cost_model.city
+        self.bounds = bounds or (0, 0, city.width, city.height)
+        # (f, h, nodo): en empates se expande primero el nodo más cercano a la meta
+        h_start = manhattan(start, goal) * cost_model.min_tile_cost
+        self.open_set = [(h_start, h_start, start)]
+        self.came_from = {}
+        self.g_score = {start: 0.0}
+        self.closed = set()
+
+    def step(self, max_expansions: int) -> bool:
+        if self.done:
+            return True
+
+        width = self.cost_model.city.width
+        x0, y0, x1, y1 = self.bounds
+        tile_costs = self.cost_model.tile_costs
+        h_unit = self.cost_model.min_tile_cost
+        gx, gy = self.goal
+        open_set, came_from, g_score, closed = self.open_set, self.came_from, self.g_score, self.closed
+
+        expanded = 0
+        while open_set and expanded < max_expansions:
+            _, _, current = heapq.heappop(open_set)
+
+            if current == self.goal:
+                self.path = _reconstruct(came_from, current)
+                break
+            if current in closed:
+                continue
+            closed.add(current)
+            expanded += 1
+
+            cx, cy = current
+            current_g = g_score[current]
+            for dx, dy in DIRECTIONS:
+                x, y = cx + dx, cy + dy
+                if not (x0 <= x < x1 and y0 <= y < y1):
+                    continue  # fuera del mapa (o del área permitida)
+                step = tile_costs[y * width + x]
+                if step == math.inf:
+                    continue  # edificio o muro
+
+                neighbor = (x, y)
+                tentative_g = current_g + step
+                if tentative_g < g_score.get(neighbor, math.inf):
+                    came_from[neighbor] = current
+                    g_score[neighbor] = tentative_g
+                    h = (abs(x - gx) + abs(y - gy)) * h_unit
+                    heapq.heappush(open_set, (tentative_g + h, h, neighbor))
+        else:
+            if open_set:
+                self.expansions += expanded
+                return False  # presupuesto agotado, continúa en la siguiente llamada
+
+        self.expansions += expanded
+        self._finish()
+        return True
+
+
+class GreedySearch(_ResumableSearch):
+    """
+    Greedy Best-First Search reanudable: la prioridad es solo la heurística
+    (distancia al final), ignorando el costo recorrido.
+    """
+
+    def __init__(self, cost_model: CostModel, start: tuple[int, int], goal: tuple[int, int]):
+        super().__init__(cost_model, start, goal)
+        self.open_set = [(manhattan(start, goal), start)]
+        self.came_from = {}
+        self.g_score = {}
+        self.closed = {start}  # visitados, evita ciclos
+
+    def step(self, max_expansions: int) -> bool:
+        if self.done:
+            return True
+
+        city = self.cost_model.city
+        width, height = city.width, city.height
+        blocked = city.blocked
+        goal = self.goal
+        open_set, came_from, visited = self.open_set, self.came_from, self.closed
+
+        expanded = 0
+        while open_set and expanded < max_expansions:
+            _, current = heapq.heappop(open_set)
+            expanded += 1
+
+            if current == goal:
+                self.path = _reconstruct(came_from, current)
+                break
+
+            cx, cy = current
+            for dx, dy in DIRECTIONS:
+                x, y = cx + dx, cy + dy
+                if not (0 <= x < width and 0 <= y < height):
+                    continue  # Fuera del mapa
+                if blocked[y * width + x]:
+                    continue  # Obstáculo
+
+                neighbor = (x, y)
+                if neighbor in visited:
+                    continue  # Ya explorado
+
+                visited.add(neighbor)
+                came_from[neighbor] = current
+                heapq.heappush(open_set, (manhattan(neighbor, goal), neighbor))
+        else:
+            if open_set:
+                self.expansions += expanded
+                return False
+
+        self.expansions += expanded
+        self._finish()
+        return True
+
+
+def astar(cost_model: CostModel, start: tuple[int, int], goal: tuple[int, int]) -> list[tuple[int, int]]:
+    """A* completo (ver `AStarSearch`). Retorna las casillas desde el siguiente paso hasta la meta."""
+    return AStarSearch(cost_model, start, goal).run()
+
+
+def greedy_best_first(cost_model: CostModel, start: tuple[int, int], goal: tuple[int, int]) -> list[tuple[int, int]]:
+    """Greedy Best-First Search completo (ver `GreedySearch`)."""
+    return GreedySearch(cost_model, start, goal).run()
+
+
+class PathRequest:
+    """
+    Solicitud de ruta resuelta por partes en `PathService.advance`.
+    Mientras `done` sea False el agente debe esperar o seguir su ruta anterior.
+    Si el modelo de costo cambia antes de terminar, la solicitud se cancela.
+    """
+
+    def __init__(self, method: str, start: tuple[int, int], goal: tuple[int, int], epoch: int,
+                 search=None, remote: bool = False):
+        self.method = method
+        self.start = start
+        self.goal = goal
+        self.epoch = epoch
+        self.search = search
+        self.path: list[tuple[int, int]] = []
+        # Las solicitudes remotas las resuelve el pool de workers (ver PathService.flush)
+        self.done = search is None and not remote
+        self.cancelled = False
+        # Agentes que esperan esta solicitud (las idénticas se comparten)
+        self.waiters = 1
+
+    @property
+    def key(self):
+        return (self.method, self.start, self.goal, self.epoch)
+
+    def _complete(self, path):
+        self.path = list(path)
+        self.search = None
+        self.done = True
+
+    def _cancel(self):
+        self.search = None
+        self.done = True
+        self.cancelled = True
+
+
+class PathService:
+    """
+    Servicio central de búsqueda de rutas compartido por todas las estrategias.
+    Guarda los resultados en una caché LRU acotada con llave
+    (método, inicio, meta, época de costo). La época solo aumenta cuando el
+    modelo de costo cambia de verdad, así que las rutas repetidas entre
+    rivales o entre re-planificaciones salen de la caché.
+
+    El clima solo escala el tiempo de viaje de todas las aristas por igual
+    (ver `CostModel`), por lo que cambiarlo no invalida las rutas; la época
+    aumenta cuando cambian los costos relativos de los tiles (`CostModel.version`)
+    o al llamar `invalidate`.
+
+    Además de `find_path` (síncrono) ofrece búsquedas por partes:
+    `request_path` devuelve un `PathRequest` y `advance`, llamado una vez
+    por frame, avanza las búsquedas pendientes sin pasar de un presupuesto
+    de tiempo o de nodos expandidos. Con `frame_expansions` la expansión
+    inmediata de `request_path` también sale de ese presupuesto, y `cancel`
+    saca de la cola las solicitudes que ya nadie espera.
+
+    Las consultas "astar" siempre dan la ruta óptima: con costos uniformes
+    usan Jump Point Search (`jps.JumpPointSearch`), misma longitud que A* con
+    muchas menos operaciones de heap, y si no A* ponderado. Las consultas
+    "auto" además usan HPA* (`hpa.HierarchicalPathfinder`) en mapas grandes
+    (área >= HPA_MIN_AREA), más rápido pero casi óptimo.
+    También pueden pedirse explícitamente con method="jps" o method="hpa".
+
+    Para agentes que ya siguen una ruta, `repair_path` mantiene un
+    planificador D* Lite por agente que solo repara la parte afectada
+    cuando cambian costos o se bloquean tiles.
+
+    Cuando varios agentes van a la misma meta (ver `head_to`), `shared_flow_field`
+    les da un campo de flujo compartido por meta (`flow_field.FlowFieldCache`)
+    del que leen el siguiente paso en O(1) en vez de buscar cada uno su ruta.
+    El campo se arma con la tabla de `DistanceIndex` de esa meta, así que no
+    se calcula nada en el momento; sin tabla lista se busca una ruta normal.
+
+    Con un `path_pool.PathWorkerPool` conectado (`attach_pool`), las
+    solicitudes que no salen de la caché ni de la expansión inmediata se
+    juntan en un lote; `flush` lo envía a los workers y el siguiente
+    `advance` espera y entrega sus rutas, así las búsquedas corren en
+    paralelo con el resto del frame y el resultado no depende de qué tan
+    rápido respondan los workers.
+    """
+
+    METHODS = {
+        "astar": AStarSearch,
+        "greedy": GreedySearch,
+    }
+
+    # Nodos expandidos entre cada revisión del reloj en `advance`
+    CLOCK_CHECK_INTERVAL = 64
+
+    HPA_MIN_AREA = 128 * 128
+    HPA_CLUSTER_SIZE = 16
+
+    # Campos de flujo que se conservan (uno por meta)
+    FLOW_FIELD_CACHE_SIZE = 16
+    # Agentes que deben ir a la misma meta para compartir su campo de flujo
+    FLOW_FIELD_MIN_AGENTS = 2
+
+    def __init__(self, city: City, cost_model: CostModel | None = None, cache_size: int = 256,
+                 frame_expansions: int | None = None):
+        self.city = city
+        self.cost_model = cost_model or CostModel(city)
+        self._model_version = self.cost_model.version
+        self.cache_size = cache_size
+        self.cost_epoch = 0
+        self.hits = 0
+        self.misses = 0
+        self._cache: OrderedDict = OrderedDict()
+        self._pending: deque[PathRequest] = deque()
+        self._pending_by_key: dict = {}
+        self._hierarchy = None
+        self._jump_table = None
+        self._planners = weakref.WeakKeyDictionary()
+        self._flow_fields = None
+        # Meta de cada agente y cuántos agentes van a cada meta (ver `head_to`)
+        self._goal_of = weakref.WeakKeyDictionary()
+        self._heading: dict[tuple[int, int], int] = {}
+        self._distance_index = None
+        self._pool = None
+        self._remote_batch: list[PathRequest] = []
+        self._in_flight: list[tuple[list, list[PathRequest]]] = []
+        # Nodos por frame entre la expansión inmediata y `advance` (None = sin tope)
+        self.frame_expansions = frame_expansions
+        # Nodos expandidos de inmediato desde el último `advance`
+        self._eager_expansions = 0
+
+    def _resolve_method(self, method: str) -> str:
+        if method not in ("astar", "auto"):
+            return method
+        if self.cost_model.is_uniform():
+            return "jps"
+        if method == "auto" and self.city.width * self.city.height >= self.HPA_MIN_AREA:
+            return "hpa"
+        return "astar"
+
+    def _make_search(self, method: str, start: tuple[int, int], goal: tuple[int, int]):
+        if method == "hpa":
+            return self.get_hierarchy().search(start, goal)
+        if method == "jps":
+            from .jps import JumpPointSearch
+            return JumpPointSearch(self.cost_model, start, goal, self.get_jump_table())
+        return self.METHODS[method](self.cost_model, start, goal)
+
+    def warm_up(self, method: str = "astar"):
+        """Precalcula las estructuras auxiliares (JPS o HPA*) de `method` fuera del bucle del juego."""
+        method = self._resolve_method(method)
+        if method == "jps":
+            self.get_jump_table()
+        elif method == "hpa":
+            self.get_hierarchy().sync()
+
+    def get_jump_table(self):
+        """Tablas de saltos de JPS (se recalculan si cambia el modelo de costo)."""
+        if self._jump_table is None or self._jump_table.version != self.cost_model.version:
+            from .jps import JumpTable
+            self._jump_table = JumpTable(self.cost_model)
+        return self._jump_table
+
+    def get_hierarchy(self):
+        """Grafo abstracto HPA* (se construye la primera vez que se usa)."""
+        if self._hierarchy is None:
+            from .hpa import HierarchicalPathfinder
+            self._hierarchy = HierarchicalPathfinder(self.cost_model, self.HPA_CLUSTER_SIZE)
+        return self._hierarchy
+
+    def get_flow_fields(self):
+        """Caché de campos de flujo por meta (se crea la primera vez que se usa)."""
+        if self._flow_fields is None:
+            from .flow_field import FlowFieldCache
+            self._flow_fields = FlowFieldCache(self.cost_model, self.FLOW_FIELD_CACHE_SIZE)
+        return self._flow_fields
+
+    def flow_step(self, pos, goal) -> tuple[int, int] | None:
+        """
+        Siguiente tile desde `pos` hacia `goal` según el campo de flujo compartido.
+        Returns:
+            tuple[int, int] | None: None si ya está en la meta o no hay camino.
+        """
+        return self.get_flow_fields().next_step(tuple(pos), goal)
+
+    def attach_distance_index(self, distance_index):
+        """Usa las tablas de `distance_index` (un DistanceIndex) para los campos de flujo compartidos."""
+        self._distance_index = distance_index
+
+    def head_to(self, agent, goal):
+        """Registra que `agent` va hacia `goal` (reemplaza su meta anterior)."""
+        goal = tuple(goal)
+        previous = self._goal_of.get(agent)
+        if previous == goal:
+            return
+        if previous is not None:
+            self.leave(agent)
+        self._goal_of[agent] = goal
+        self._heading[goal] = self._heading.get(goal, 0) + 1
+
+    def leave(self, agent):
+        """`agent` ya no va hacia ninguna meta."""
+        goal = self._goal_of.pop(agent, None)
+        if goal is None:
+            return
+        count = self._heading.get(goal, 0) - 1
+        if count > 0:
+            self._heading[goal] = count
+        else:
+            self._heading.pop(goal, None)
+
+    def shared_flow_field(self, goal):
+        """
+        Campo de flujo hacia `goal` si al menos FLOW_FIELD_MIN_AGENTS agentes
+        van hacia allá y hay un campo listo (en la caché o en DistanceIndex).
+        Nunca calcula un campo en el momento.
+        Returns:
+            FlowField | None
+        """
+        goal = tuple(goal)
+        if self._heading.get(goal, 0) < self.FLOW_FIELD_MIN_AGENTS:
+            return None
+        flow_fields = self.get_flow_fields()
+        field = flow_fields.cached(goal)
+        if field is not None:
+            return flow_fields.get(goal)
+        if self._distance_index is None:
+            return None
+        integration = self._distance_index.ready_fields().get(goal)
+        if integration is None:
+            return None
+        return flow_fields.get(goal, integration)
+
+    def find_path(self, start, goal, method: str = "astar") -> list[tuple[int, int]]:
+        """
+        Retorna una ruta desde start hasta goal (sin incluir start).
+        Args:
+            start: Coordenadas de inicio.
+            goal: Coordenadas de destino.
+            method (str): "astar", "auto", "greedy", "jps" o "hpa".
+        Returns:
+            list[tuple[int, int]]: Copia de la ruta; el llamador puede consumirla.
+        """
+        start = tuple(start)
+        goal = tuple(goal)
+        method = self._resolve_method(method)
+        self.sync_cost_model()
+        key = (method, start, goal, self.cost_epoch)
+
+        cached = self._cache.get(key)
+        if cached is not None:
+            self.hits += 1
+            self._cache.move_to_end(key)
+            return list(cached)
+
+        self.misses += 1
+        path = self._make_search(method, start, goal).run()
+        self._store(key, path)
+        return list(path)
+
+    def _store(self, key, path):
+        self._cache[key] = tuple(path)
+        if len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+
+    def request_path(self, start, goal, method: str = "astar", eager_expansions: int = 0) -> PathRequest:
+        """
+        Pide una ruta sin bloquear el bucle del juego.
+        Si está en caché la solicitud se entrega ya resuelta; si otra solicitud
+        idéntica está en curso se comparte. Con `eager_expansions` > 0 se intenta
+        resolver de inmediato (útil para rutas cortas) antes de encolarla; con
+        `frame_expansions` definido, esos nodos se descuentan del presupuesto
+        del siguiente `advance` y no pueden pasar del presupuesto del frame.
+        Con un pool de workers conectado `eager_expansions` se ignora y la
+        búsqueda va directo al siguiente lote remoto.
+        Args:
+            start: Coordenadas de inicio.
+            goal: Coordenadas de destino.
+            method (str): "astar", "auto", "greedy", "jps" o "hpa".
+            eager_expansions (int): Nodos a expandir en la misma llamada.
+        Returns:
+            PathRequest: Revisar `done` y luego `path`.
+        """
+        start = tuple(start)
+        goal = tuple(goal)
+        method = self._resolve_method(method)
+        self.sync_cost_model()
+        key = (method, start, goal, self.cost_epoch)
+
+        pending = self._pending_by_key.get(key)
+        if pending is not None:
+            pending.waiters += 1
+            return pending
+
+        cached = self._cache.get(key)
+        if cached is not None:
+            self.hits += 1
+            self._cache.move_to_end(key)
+            request = PathRequest(method, start, goal, self.cost_epoch)
+            request._complete(cached)
+            return request
+
+        self.misses += 1
+        if self._pool is not None:
+            # Con pool la búsqueda nunca corre en este hilo: va al siguiente lote
+            request = PathRequest(method, start, goal, self.cost_epoch, remote=True)
+            self._remote_batch.append(request)
+            self._pending_by_key[key] = request
+            return request
+
+        if self.frame_expansions is not None:
+            eager_expansions = min(eager_expansions, self.frame_expansions - self._eager_expansions)
+        search = self._make_search(method, start, goal)
+        request = PathRequest(method, start, goal, self.cost_epoch, search)
+        if eager_expansions > 0:
+            finished = search.step(eager_expansions)
+            self._eager_expansions += search.expansions
+            if finished:
+                self._store(key, search.path)
+                request._complete(search.path)
+                return request
+        self._pending.append(request)
+        self._pending_by_key[key] = request
+        return request
+
+    def request_batch(self, queries, method: str = "astar", eager_expansions: int = 0) -> list[PathRequest]:
+        """
+        Pide varias rutas a la vez (ver `request_path`).
+        Args:
+            queries: Pares (inicio, meta).
+        Returns:
+            list[PathRequest]: Una solicitud por consulta, en el mismo orden.
+        """
+        return [self.request_path(start, goal, method, eager_expansions) for start, goal in queries]
+
+    def cancel(self, request: PathRequest) -> bool:
+        """
+        El llamador ya no espera `request`. Cuando ningún agente la espera
+        se saca de la cola (o del lote remoto) para no gastar presupuesto en ella.
+        Returns:
+            bool: True si la solicitud se descartó.
+        """
+        if request.done:
+            return False
+        request.waiters -= 1
+        if request.waiters > 0:
+            return False
+        if self._pending_by_key.get(request.key) is request:
+            del self._pending_by_key[request.key]
+        if request.search is not None and request in self._pending:
+            self._pending.remove(request)
+        elif request in self._remote_batch:
+            self._remote_batch.remove(request)
+        # Si ya está en un lote enviado, su ruta se ignora al llegar
+        request._cancel()
+        return True
+
+    def attach_pool(self, pool):
+        """Resuelve las búsquedas pendientes en `pool` (un PathWorkerPool) en vez de por partes."""
+        self._pool = pool
+
+    def flush(self):
+        """
+        Envía al pool el lote de solicitudes remotas acumulado. Si los costos
+        cambiaron desde que se pidieron, el lote se cancela (ver `invalidate`)
+        en vez de resolverse con la cuadrícula vieja.
+        """
+        if self._pool is None:
+            return
+        self.sync_cost_model()
+        if not self._remote_batch:
+            return
+        batch = self._remote_batch
+        self._remote_batch = []
+        futures = self._pool.submit([(r.method, r.start, r.goal) for r in batch])
+        self._in_flight.append((futures, self._pool.split(batch)))
+
+    def _collect_remote(self, wait: bool) -> int:
+        """
+        Entrega las rutas de los lotes enviados.
+        Args:
+            wait: Si es True espera a los lotes que no han terminado.
+        Returns:
+            int: Solicitudes completadas.
+        """
+        completed = 0
+        remaining = []
+        for futures, chunks in self._in_flight:
+            if not wait and not all(f.done() for f in futures):
+                remaining.append((futures, chunks))
+                continue
+            for future, requests in zip(futures, chunks):
+                for request, path in zip(requests, future.result()):
+                    if request.cancelled:
+                        continue
+                    self._pending_by_key.pop(request.key, None)
+                    self._store(request.key, path)
+                    request._complete(path)
+                    completed += 1
+        self._in_flight = remaining
+        return completed
+
+    def advance(self, budget_us: float | None = None, max_expansions: int | None = None) -> int:
+        """
+        Avanza las búsquedas pendientes en orden de llegada.
+        Args:
+            budget_us: Tiempo máximo en microsegundos (None = sin límite).
+            max_expansions: Nodos máximos a expandir (None = sin límite).
+        Returns:
+            int: Nodos expandidos en esta llamada.
+        """
+        self.sync_cost_model()
+        if self._in_flight:
+            self._collect_remote(wait=True)
+        if max_expansions is not None:
+            # Lo expandido de inmediato desde el último frame sale del mismo presupuesto
+            max_expansions -= self._eager_expansions
+        self._eager_expansions = 0
+        deadline = None
+        if budget_us is not None:
+            deadline = time.perf_counter_ns() + int(budget_us * 1000)
+
+        expanded = 0
+        while self._pending:
+            chunk = self.CLOCK_CHECK_INTERVAL
+            if max_expansions is not None:
+                chunk = min(chunk, max_expansions - expanded)
+                if chunk <= 0:
+                    break
+
+            request = self._pending[0]
+            search = request.search
+            before = search.expansions
+            finished = search.step(chunk)
+            expanded += search.expansions - before
+
+            if finished:
+                self._pending.popleft()
+                del self._pending_by_key[request.key]
+                self._store(request.key, search.path)
+                request._complete(search.path)
+
+            if deadline is not None and time.perf_counter_ns() >= deadline:
+                break
+
+        return expanded
+
+    def pending_count(self) -> int:
+        return len(self._pending) + len(self._remote_batch) + sum(
+            len(chunk) for _, chunks in self._in_flight for chunk in chunks
+        )
+
+    def repair_path(self, agent, start, goal) -> list[tuple[int, int]]:
+        """
+        Ruta incremental (D* Lite) para `agent` hacia `goal`.
+        El planificador se conserva entre llamadas mientras la meta no cambie,
+        así que un cambio de costos solo repara la zona afectada.
+        Args:
+            agent: Objeto dueño del planificador (p. ej. la estrategia del rival).
+            start: Posición actual del agente.
+            goal: Destino.
+        """
+        from .dstar_lite import DStarLite
+        start = tuple(start)
+        goal = tuple(goal)
+        self.sync_cost_model()
+        planner = self._planners.get(agent)
+        if planner is None or planner.goal != goal:
+            planner = DStarLite(self.cost_model, start, goal)
+            self._planners[agent] = planner
+        return planner.plan(start)
+
+    def drop_planner(self, agent):
+        """Descarta el planificador incremental de `agent`."""
+        self._planners.pop(agent, None)
+
+    def update_weather(self, weather_mult: float):
+        """Actualiza el clima del modelo de costo; no invalida rutas (solo escala tiempos)."""
+        self.cost_model.set_weather(weather_mult)
+
+    def travel_time(self, path: list[tuple[int, int]], speed_factor: float | None = None) -> float:
+        """Tiempo estimado (segundos) de una ruta según el modelo de costo."""
+        return self.cost_model.travel_time(path, speed_factor)
+
+    def sync_cost_model(self):
+        """Aumenta la época si los costos relativos del modelo cambiaron."""
+        if self.cost_model.version != self._model_version:
+            self._model_version = self.cost_model.version
+            self.invalidate()
+
+    def invalidate(self):
+        """Aumenta la época de costo; las rutas previas dejan de ser válidas."""
+        self.cost_epoch += 1
+        self._cache.clear()
+        for request in self._pending:
+            request._cancel()
+        self._pending.clear()
+        for request in self._remote_batch:
+            request._cancel()
+        self._remote_batch.clear()
+        for _, chunks in self._in_flight:
+            for requests in chunks:
+                for request in requests:
+                    request._cancel()
+        self._in_flight.clear()
+        self._pending_by_key.clear()
+        if self._flow_fields is not None:
+            self._flow_fields.clear()
+
+    def stats(self) -> dict:
+        """Contadores de la caché."""
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "size": len(self._cache),
+            "hit_rate": self.hits / total if total else 0.0,
+            "cost_epoch": self.cost_epoch,
+            "pending": self.pending_count(),
+            "flow_fields": len(self._flow_fields) if self._flow_fields is not None else 0,
+        }
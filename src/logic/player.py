@@ -1,3 +1,4 @@
+import logging
 from datetime import datetime, timezone
 from src.config.config import (
     WEATHER_MULTIPLIERS, REP_BONUS_EARLY, REP_BONUS_ON_TIME,
@@ -7,6 +8,8 @@ from src.config.config import (
 )
 from .inventory import Inventory
 
+logger = logging.getLogger(__name__)
+
 
 class Player:
     """Representa al repartidor (jugador)."""
@@ -29,6 +32,11 @@ class Player:
         self.first_late_today = True
         self.total_penalties = 0
 
+        # Estadísticas de entregas (segundos de atraso acumulados)
+        self.deliveries = 0
+        self.late_deliveries = 0
+        self.total_lateness = 0.0
+
     def get_total_weight(self):
         """Calcula peso total del inventario."""
         return self.inventory.current_weight
@@ -37,10 +45,9 @@ class Player:
         """Obtiene multiplicador de clima."""
         return WEATHER_MULTIPLIERS.get(weather_condition, 1.0)
 
-    def calculate_speed(self, weather_condition, surface_weight_tile):
-        """Calcula velocidad actual del jugador."""
+    def get_speed_factor(self):
+        """Velocidad base con los multiplicadores propios del jugador (peso, reputación, resistencia)."""
         total_weight = self.get_total_weight()
-        m_weather = self.get_weather_multiplier(weather_condition)
         m_weight = max(0.8, 1 - 0.03 * total_weight)
         m_rep = 1.03 if self.reputation >= 90 else 1.0
 
@@ -51,8 +58,12 @@ class Player:
         else:
             m_stamina = 1.0
 
-        speed = (self.base_speed * m_weather * m_weight *
-                m_rep * m_stamina * surface_weight_tile)
+        return self.base_speed * m_weight * m_rep * m_stamina
+
+    def calculate_speed(self, weather_condition, surface_weight_tile):
+        """Calcula velocidad actual del jugador."""
+        m_weather = self.get_weather_multiplier(weather_condition)
+        speed = self.get_speed_factor() * m_weather * surface_weight_tile
         return speed
 
     def consume_stamina(self, weather_condition):
@@ -93,7 +104,7 @@ class Player:
             self.inventory.add_order(order)
             return True
         except ValueError as e:
-            print(f"No se puede aceptar: {e}")
+            logger.warning("No se puede aceptar: %s", e)
             return False
 
     def _normalize_datetime(self, dt_string):
@@ -111,14 +122,11 @@ class Player:
 
         order = self.inventory.current_order.order
         
-        # MEJOR SOLUCIÓN: Normalizar ambos datetime a UTC
-        deadline = self._normalize_datetime(order.deadline)
-        
-        # Asegurar que current_time también tenga timezone
+        # Asegurar que current_time tenga timezone (el deadline ya está en UTC)
         if current_time.tzinfo is None:
             current_time = current_time.replace(tzinfo=timezone.utc)
         
-        time_diff = (deadline - current_time).total_seconds()
+        time_diff = order.deadline_ts - current_time.timestamp()
 
         rep_change = 0
         if time_diff >= 0:
@@ -129,6 +137,8 @@ class Player:
             self.deliveries_streak += 1
         else:
             time_late = abs(time_diff)
+            self.late_deliveries += 1
+            self.total_lateness += time_late
             if time_late <= 30:
                 rep_change = REP_PENALTY_SLIGHTLY_LATE
             elif time_late <= 120:
@@ -153,6 +163,7 @@ class Player:
             payout *= 1.05
 
         self.total_income += payout
+        self.deliveries += 1
 
         completed = self.inventory.complete_current_order()
 
@@ -173,13 +184,13 @@ class Player:
             self.inventory.complete_current_order()
             self.deliveries_streak = 0
             
-            print(f"Pedido cancelado. Penalización de reputación y ${int(payout_lost)} al puntaje.")
+            logger.info("Pedido cancelado. Penalización de reputación y $%d al puntaje.", int(payout_lost))
             return True
         return False
 
     def expire_order(self, order_to_expire):
         """Maneja la lógica para un pedido expirado."""
-        print(f"¡El pedido {order_to_expire.id} ha expirado!")
+        logger.info("¡El pedido %s ha expirado!", order_to_expire.id)
         
         self.reputation = max(0, self.reputation - 6)
         
@@ -0,0 +1,66 @@
+import heapq
+import itertools
+
+
+class RivalScheduler:
+    """
+    Agenda de decisiones de muchos rivales (min-heap por tiempo de juego).
+
+    Cada rival decide cada `interval` segundos, pero los turnos iniciales se
+    escalonan a lo largo del intervalo para que no planifiquen todos en el
+    mismo tick. `max_per_tick` acota cuántos deciden por tick: los que no
+    alcanzan quedan al frente del heap y deciden en el siguiente, así el
+    costo por tick no crece con la cantidad de rivales.
+    """
+
+    def __init__(self, interval: float, max_per_tick: int | None = None):
+        self.interval = interval
+        self.max_per_tick = max_per_tick
+        self._heap: list[tuple[float, int, object]] = []
+        self._counter = itertools.count()
+        self.deferred = 0  # ticks en que el tope pospuso alguna decisión
+
+    def __len__(self) -> int:
+        return len(self._heap)
+
+    def add(self, rival, first_turn: float):
+        """Agenda el primer turno de `rival` en el tiempo `first_turn`."""
+        heapq.heappush(self._heap, (first_turn, next(self._counter), rival))
+
+    def add_staggered(self, rivals, now: float = 0.0):
+        """Agenda a `rivals` repartiendo sus primeros turnos en un intervalo."""
+        rivals = list(rivals)
+        for i, rival in enumerate(rivals, start=1):
+            self.add(rival, now + self.interval * i / len(rivals))
+
+    def next_turn(self) -> float | None:
+        """Tiempo del próximo turno (None si no hay rivales)."""
+        return self._heap[0][0] if self._heap else None
+
+    def due(self, now: float) -> list:
+        """
+        Saca los rivales cuyo turno ya llegó (a lo sumo `max_per_tick`) y los
+        vuelve a agendar un intervalo después de su turno.
+        Returns:
+            list: Rivales que deciden en este tick, en orden de turno.
+        """
+        heap = self._heap
+        ready = []
+        while heap and heap[0][0] <= now:
+            if self.max_per_tick is not None and len(ready) >= self.max_per_tick:
+                self.deferred += 1
+                break
+            turn, _, rival = heapq.heappop(heap)
+            ready.append((turn, rival))
+
+        for turn, rival in ready:
+            # Si se atrasó más de un intervalo no se intenta recuperar los turnos perdidos
+            next_turn = turn + self.interval
+            if next_turn <= now:
+                next_turn = now + self.interval
+            heapq.heappush(heap, (next_turn, next(self._counter), rival))
+        return [rival for _, rival in ready]
+
+    def remove(self, rival):
+        self._heap = [entry for entry in self._heap if entry[2] is not rival]
+        heapq.heapify(self._heap)
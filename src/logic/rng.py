@@ -0,0 +1,29 @@
+import random
+
+
+class RandomStreams:
+    """
+    Un generador `random.Random` independiente por subsistema (clima, mapa,
+    rival, partículas...), todos derivados de una sola semilla.
+
+    Cada flujo se siembra con "semilla:nombre", así que lo que consume un
+    subsistema no cambia los números que recibe otro: con la misma semilla
+    y las mismas entradas la partida se repite igual.
+    Sin semilla se usa una aleatoria (se guarda en `seed` para reproducirla).
+    """
+
+    def __init__(self, seed: int | None = None):
+        if seed is None:
+            seed = random.SystemRandom().randrange(2**32)
+        self.seed = seed
+        self._streams: dict[str, random.Random] = {}
+
+    def get(self, name: str) -> random.Random:
+        """Flujo del subsistema `name` (se crea la primera vez)."""
+        stream = self._streams.get(name)
+        if stream is None:
+            stream = self._streams[name] = random.Random(f"{self.seed}:{name}")
+        return stream
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._streams
@@ -0,0 +1,104 @@
+from array import array
+
+
+class Route:
+    """
+    Ruta que un agente va consumiendo paso a paso.
+    Las coordenadas se guardan en dos arreglos de enteros y un cursor marca
+    el siguiente paso, así que avanzar es O(1) (en vez de `list.pop(0)`).
+
+    `origin` es el tile desde el que se calculó la ruta; con él y el cursor
+    se sabe en qué tile debería estar el agente y se detecta si se desvió.
+    """
+
+    __slots__ = ("_xs", "_ys", "cursor", "origin")
+
+    def __init__(self, path=(), origin: tuple[int, int] | None = None):
+        self._xs = array("i", [p[0] for p in path])
+        self._ys = array("i", [p[1] for p in path])
+        self.cursor = 0
+        self.origin = tuple(origin) if origin is not None else None
+
+    def __len__(self) -> int:
+        return len(self._xs) - self.cursor
+
+    def __bool__(self) -> bool:
+        return self.cursor < len(self._xs)
+
+    def __iter__(self):
+        xs, ys = self._xs, self._ys
+        for i in range(self.cursor, len(xs)):
+            yield (xs[i], ys[i])
+
+    def __repr__(self) -> str:
+        return f"Route(remaining={len(self)}, goal={self.goal})"
+
+    @property
+    def remaining(self) -> int:
+        """Pasos que faltan."""
+        return len(self)
+
+    @property
+    def goal(self) -> tuple[int, int] | None:
+        """Último tile de la ruta (None si está vacía)."""
+        if not self._xs:
+            return None
+        return (self._xs[-1], self._ys[-1])
+
+    def peek(self, offset: int = 0) -> tuple[int, int] | None:
+        """Tile a `offset` pasos del cursor sin consumirlo (None si no existe)."""
+        i = self.cursor + offset
+        if i < 0 or i >= len(self._xs):
+            return None
+        return (self._xs[i], self._ys[i])
+
+    def advance(self) -> tuple[int, int] | None:
+        """Consume y retorna el siguiente paso."""
+        step = self.peek()
+        if step is not None:
+            self.cursor += 1
+        return step
+
+    def previous(self) -> tuple[int, int] | None:
+        """Tile donde debería estar el agente: el último paso consumido u `origin`."""
+        if self.cursor == 0:
+            return self.origin
+        return (self._xs[self.cursor - 1], self._ys[self.cursor - 1])
+
+    def sync(self, position) -> bool:
+        """
+        Valida la ruta contra la posición actual del agente.
+        Si el agente ya está en el siguiente paso, lo consume.
+        Returns:
+            bool: False si el agente se desvió de la ruta.
+        """
+        position = tuple(position)
+        if position == self.peek():
+            self.cursor += 1
+            return True
+        expected = self.previous()
+        return expected is None or position == expected
+
+    def skip_to(self, position) -> bool:
+        """
+        Mueve el cursor justo después de `position` si está en lo que falta de la ruta.
+        Returns:
+            bool: False si `position` no está en la ruta (el cursor no cambia).
+        """
+        x, y = position
+        xs, ys = self._xs, self._ys
+        for i in range(self.cursor, len(xs)):
+            if xs[i] == x and ys[i] == y:
+                self.cursor = i + 1
+                return True
+        return False
+
+    def tiles(self) -> list[tuple[int, int]]:
+        """Copia de los pasos que faltan."""
+        return list(self)
+
+    def clear(self):
+        del self._xs[:]
+        del self._ys[:]
+        self.cursor = 0
+        self.origin = None
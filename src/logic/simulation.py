@@ -0,0 +1,407 @@
+from datetime import datetime, timedelta, timezone
+
+from src.config.config import WEATHER_MULTIPLIERS
+
+from .city import City, OrderManager
+from .distance_index import DistanceIndex
+from .order_table import OrderTable
+from .path_service import PathService
+from .player import Player
+from .rival import Rival
+from .rival_scheduler import RivalScheduler
+from .rng import RandomStreams
+from .weather import Weather
+from .strategies.easy_strategy import EasyStrategy
+from .strategies.medium_strategy import MediumStrategy
+from .strategies.hard_strategy import HardStrategy
+
+# 1.3 para version final, 0.6 para testing
+RIVAL_INTERACTION_RATE = 0.6  # segundos entre interacciones del rival
+RIVAL_DECISIONS_PER_TICK = 8  # rivales que deciden como máximo en un tick
+# Nodos de búsqueda de rutas por tick (un presupuesto en tiempo haría que
+# el resultado dependiera de la velocidad de la máquina)
+PATHFINDING_EXPANSIONS_PER_TICK = 1500
+# Tiles por tick para calcular las tablas de distancia de los pedidos liberados
+DISTANCE_FIELD_NODES_PER_TICK = 4000
+FIXED_DT = 1 / 60  # segundos de juego por tick
+WEATHER_TRANSITION_TIME = 4.0  # segundos que tarda en cambiar el clima
+GAME_DURATION = 900
+
+STRATEGIES = {
+    "easy": EasyStrategy,
+    "medium": MediumStrategy,
+    "hard": HardStrategy,
+}
+
+
+class Simulation:
+    """
+    Reglas del juego sin pygame: ciudad, pedidos, clima, jugador, rival y puntaje.
+
+    `Game` la envuelve para dibujar y leer el teclado; sin ventana se puede
+    avanzar con `update(dt)` y mover al jugador con `move_player`, p. ej.
+    para correr muchas partidas seguidas en pruebas o para ajustar rivales.
+
+    Determinismo: `advance` acumula el tiempo real y lo consume en ticks
+    fijos de FIXED_DT, y cada subsistema sortea con su propio flujo de
+    `RandomStreams`. Las acciones del jugador pasan por `execute`, que las
+    anota en `input_log` con el tick en que ocurrieron; `replay` con la misma
+    semilla y el mismo registro reproduce la partida a cualquier velocidad.
+    """
+
+    def __init__(self, map_data: dict, jobs_data: list, weather: Weather,
+                 difficulty: str | list[str] = "hard", game_duration: float = GAME_DURATION,
+                 seed: int | None = None, rival_count: int | None = None,
+                 path_workers: int = 0):
+        """
+        Args:
+            difficulty: Estrategia de los rivales, o una lista con la de cada uno.
+            rival_count: Cantidad de rivales (por defecto uno, o uno por
+                estrategia de la lista, que se repite si faltan).
+            path_workers: Procesos para resolver rutas en paralelo (0 = en
+                este hilo, por partes). Ver `PathWorkerPool`; llamar `close`.
+        """
+        self.streams = RandomStreams(seed)
+        self.rng = self.streams.get("simulation")
+        self.weather = weather
+        self.weather.rng = self.streams.get("weather")
+        self.city = City(map_data)
+        self.path_service = PathService(self.city, frame_expansions=PATHFINDING_EXPANSIONS_PER_TICK)
+        self.path_service.warm_up()
+        self.path_pool = None
+        if path_workers > 0:
+            from .path_pool import PathWorkerPool
+            self.path_pool = PathWorkerPool(self.path_service.cost_model, path_workers)
+            self.path_service.attach_pool(self.path_pool)
+        self.order_manager = OrderManager(
+            jobs_data,
+            DistanceIndex(self.path_service.cost_model, deferred=True),
+            OrderTable(self.path_service.cost_model),
+        )
+        self.path_service.attach_distance_index(self.order_manager.distance_index)
+        self.player = Player(1, 1, self.city.goal)
+
+        self.game_duration = game_duration
+        # Usar UTC para evitar problemas con zona horaria local
+        self.game_start_datetime = datetime(2025, 9, 1, 12, 0, 0, tzinfo=timezone.utc)
+
+        self.elapsed_time = 0.0
+        self.tick = 0
+        self.accumulator = 0.0
+        self.input_log: list[tuple[int, str, tuple]] = []
+        self.game_over = False
+        self.victory = False
+
+        self.current_weather = self.weather.state
+        self.next_weather = self.weather.state
+        self.weather_timer = self.rng.uniform(45, 60)
+        self.weather_transition_time = 0.0
+        self.in_transition = False
+
+        self.message = ""
+        self.message_timer = 0.0
+
+        self.player_moved = False
+
+        difficulties = [difficulty] if isinstance(difficulty, str) else list(difficulty)
+        if rival_count is None:
+            rival_count = len(difficulties)
+        self.rivals: list[Rival] = []
+        spawn_rng = self.streams.get("spawn")
+        for i in range(rival_count):
+            # El primer rival sale de (0, 0) como siempre; el resto en tiles al azar
+            x, y = (0, 0) if i == 0 else self.city.get_random_walkable_position(spawn_rng)
+            rival = Rival(x, y, self.city.goal, None)
+            name = difficulties[i % len(difficulties)].lower()
+            StrategyClass = STRATEGIES.get(name, HardStrategy)
+            rng = self.streams.get("rival" if i == 0 else f"rival.{i}")
+            rival.set_strategy(StrategyClass(self, rival, rng))
+            self.rivals.append(rival)
+
+        self.rival_scheduler = RivalScheduler(RIVAL_INTERACTION_RATE, RIVAL_DECISIONS_PER_TICK)
+        self.rival_scheduler.add_staggered(self.rivals)
+        # Tiempo de juego del último turno de cada rival (id -> elapsed_time)
+        self._last_rival_turn: dict[int, float] = {}
+
+    @property
+    def rival(self) -> Rival | None:
+        """El primer rival (compatibilidad con el juego de un solo rival)."""
+        return self.rivals[0] if self.rivals else None
+
+    @property
+    def seed(self) -> int:
+        return self.streams.seed
+
+    def get_current_game_datetime(self):
+        return self.game_start_datetime + timedelta(seconds=self.elapsed_time)
+
+    def show_message(self, text, duration=2.0):
+        self.message = text
+        self.message_timer = duration
+
+    def move_player(self, dx: int, dy: int) -> bool:
+        """
+        Mueve al jugador un tile si puede (no bloqueado y con resistencia).
+        Returns:
+            bool: True si el jugador se movió.
+        """
+        new_x = self.player.x + dx
+        new_y = self.player.y + dy
+        if self.city.is_blocked(new_x, new_y):
+            self.show_message("No puedes moverte ahí")
+            return False
+        if not self.player.can_move():
+            self.show_message("¡Exhausto! Descansa para recuperarte")
+            return False
+
+        self.player.consume_stamina(self.current_weather)
+        self.player.x = new_x
+        self.player.y = new_y
+        self.player_moved = True
+        self.check_delivery_points()
+        return True
+
+    def cancel_order(self) -> bool:
+        if self.player.cancel_order():
+            self.show_message("Pedido cancelado (-4 reputación)")
+            return True
+        return False
+
+    def view_next_order(self):
+        self.player.inventory.view_next_order()
+        self.show_message("Siguiente pedido")
+
+    def view_prev_order(self):
+        self.player.inventory.view_prev_order()
+        self.show_message("Pedido anterior")
+
+    def set_inventory_view(self, key: str):
+        self.player.inventory.set_view(key)
+        if key == "priority":
+            self.show_message("Ordenado por prioridad")
+        elif key == "deadline":
+            self.show_message("Ordenado por deadline")
+
+    # Acciones del jugador que se pueden registrar y repetir
+    COMMANDS = {
+        "move": "move_player",
+        "accept": "accept_order_at_location",
+        "deliver": "complete_delivery",
+        "cancel": "cancel_order",
+        "next_order": "view_next_order",
+        "prev_order": "view_prev_order",
+        "view": "set_inventory_view",
+    }
+
+    def execute(self, command: str, *args):
+        """
+        Ejecuta una acción del jugador y la anota en `input_log`.
+        Args:
+            command: Una llave de COMMANDS (p. ej. "move" con dx, dy).
+        Returns:
+            Lo que retorne la acción.
+        """
+        method = getattr(self, self.COMMANDS[command])
+        self.input_log.append((self.tick, command, args))
+        return method(*args)
+
+    def accept_order_at_location(self):
+        orders_here = self.order_manager.orders_at((self.player.x, self.player.y))
+        if not orders_here:
+            self.show_message("No hay pedidos en esta ubicación")
+            return
+        order = orders_here[0]
+        if self.player.accept_order(order):
+            self.order_manager.remove_order(order.id)
+            self.show_message(f"Pedido {order.id} aceptado!")
+        else:
+            self.show_message("Inventario lleno")
+
+    def check_delivery_points(self):
+        if self.player.inventory.current_order:
+            dropoff = self.player.inventory.current_order.order.dropoff
+            if (self.player.x, self.player.y) == dropoff:
+                self.show_message("¡Punto de entrega! Presiona ENTER")
+
+    def complete_delivery(self):
+        if self.player.inventory.current_order is None:
+            self.show_message("No hay pedido para entregar")
+            return
+        dropoff = self.player.inventory.current_order.order.dropoff
+        if (self.player.x, self.player.y) != dropoff:
+            self.show_message("Debes estar en el punto de entrega")
+            return
+
+        current_game_time = self.get_current_game_datetime()
+        result = self.player.complete_delivery(current_game_time)
+        if result:
+            msg = f"¡Entregado! +${int(result['payout'])} | Rep: {result['rep_change']:+d}"
+            self.show_message(msg, 3.0)
+
+    def accept_order_at_location_rival(self, rival_player, order):
+        """Permite al rival aceptar un pedido en su ubicación."""
+        if (rival_player.x, rival_player.y) == order.pickup:
+            if rival_player.accept_order(order):
+                self.order_manager.remove_order(order.id)
+                return True
+        return False
+
+    def complete_delivery_rival(self, rival_player):
+        """Permite al rival completar una entrega."""
+        if rival_player.inventory.current_order is None:
+            return False
+
+        dropoff = rival_player.inventory.current_order.order.dropoff
+        if (rival_player.x, rival_player.y) != dropoff:
+            return False
+
+        current_game_time = self.get_current_game_datetime()
+        result = rival_player.complete_delivery(current_game_time)
+        return bool(result)
+
+    def update_weather(self, dt):
+        self.weather_timer -= dt
+        if self.in_transition:
+            self.weather_transition_time += dt
+            if self.weather_transition_time >= WEATHER_TRANSITION_TIME:
+                self.current_weather = self.next_weather
+                self.in_transition = False
+        if self.weather_timer <= 0 and not self.in_transition:
+            self.next_weather = self.weather.next_state()
+            self.weather_timer = self.rng.uniform(45, 60)
+            self.weather_transition_time = 0
+            self.in_transition = True
+
+    def get_current_weather_multiplier(self):
+        if not self.in_transition:
+            return WEATHER_MULTIPLIERS.get(self.current_weather, 1.0)
+        progress = self.weather_transition_time / WEATHER_TRANSITION_TIME
+        current_mult = WEATHER_MULTIPLIERS.get(self.current_weather, 1.0)
+        next_mult = WEATHER_MULTIPLIERS.get(self.next_weather, 1.0)
+        return current_mult + (next_mult - current_mult) * progress
+
+    def update(self, dt):
+        """Avanza la partida `dt` segundos (no hace nada si ya terminó)."""
+        if self.game_over:
+            return
+
+        if not self.player_moved:
+            self.player.recover_stamina(dt*0.22)
+        self.player_moved = False
+
+        self.tick += 1
+        self.elapsed_time += dt
+        self.update_weather(dt)
+        self.path_service.update_weather(self.get_current_weather_multiplier())
+        self.path_service.advance(max_expansions=PATHFINDING_EXPANSIONS_PER_TICK)
+        self.order_manager.update_available(self.elapsed_time)
+        # Las tablas se calculan por partes; mientras tanto se usa Manhattan
+        self.order_manager.distance_index.build(DISTANCE_FIELD_NODES_PER_TICK)
+
+        # Solo se revisa el deadline más próximo (heap del inventario)
+        now_ts = self.game_start_datetime.timestamp() + self.elapsed_time
+        for order in self.player.inventory.pop_expired(now_ts):
+            self.player.expire_order(order)
+            self.show_message(f"Pedido {order.id} expirado! (-6 Rep)", 3.0)
+        for rival in self.rivals:
+            for order in rival.inventory.pop_expired(now_ts):
+                rival.expire_order(order)
+                if rival.strategy:
+                    rival.strategy.order_expired(order)
+
+        if self.message_timer > 0:
+            self.message_timer -= dt
+
+        if self.player.is_defeated():
+            self.end_game(False)
+
+        if self.elapsed_time >= self.game_duration:
+            self.end_game(self.player.has_won())
+
+        self.update_rivals(dt)
+        # Las rutas pedidas en este tick se buscan en paralelo hasta el próximo advance
+        self.path_service.flush()
+
+    def advance(self, frame_dt: float, max_steps: int | None = None) -> int:
+        """
+        Acumula `frame_dt` segundos reales y corre los ticks fijos que quepan.
+        Args:
+            frame_dt: Tiempo transcurrido (multiplicarlo acelera la partida).
+            max_steps: Ticks máximos en esta llamada; el tiempo sobrante se
+                descarta para que un frame lento no encadene más frames lentos.
+        Returns:
+            int: Ticks ejecutados.
+        """
+        self.accumulator += frame_dt
+        steps = 0
+        while self.accumulator >= FIXED_DT and not self.game_over:
+            if max_steps is not None and steps >= max_steps:
+                self.accumulator = 0.0
+                break
+            self.update(FIXED_DT)
+            self.accumulator -= FIXED_DT
+            steps += 1
+        return steps
+
+    def replay(self, input_log, ticks: int | None = None):
+        """
+        Corre la partida tick a tick aplicando las acciones de `input_log`
+        (tuplas (tick, acción, args) como las de `execute`) en su tick.
+        Args:
+            ticks: Ticks a correr (None = hasta que termine la partida).
+        """
+        pending = sorted(input_log, key=lambda entry: entry[0])
+        i = 0
+        end = None if ticks is None else self.tick + ticks
+        while not self.game_over and (end is None or self.tick < end):
+            while i < len(pending) and pending[i][0] <= self.tick:
+                _, command, args = pending[i]
+                self.execute(command, *args)
+                i += 1
+            self.update(FIXED_DT)
+
+    def update_rivals(self, dt):
+        """
+        Los rivales a los que les toca turno (ver RivalScheduler) deciden y se
+        mueven; los demás recuperan resistencia.
+        """
+        now = self.elapsed_time
+        acting = self.rival_scheduler.due(now)
+        for rival in acting:
+            if rival.strategy:
+                # Las estrategias descuentan sus timers con el tiempo desde su turno anterior
+                since_last = now - self._last_rival_turn.get(id(rival), 0.0)
+                rival.strategy.decide_job_action(since_last)
+            self._last_rival_turn[id(rival)] = now
+            rival.decide_next_move(self.city, self.current_weather)
+
+        if len(acting) == len(self.rivals):
+            return
+        acted = {id(rival) for rival in acting}
+        recovery = dt * 0.22
+        for rival in self.rivals:
+            if id(rival) not in acted:
+                rival.recover_stamina(recovery)
+
+    def close(self):
+        """Libera el pool de rutas (si hay)."""
+        if self.path_pool is not None:
+            self.path_service.attach_pool(None)
+            self.path_pool.close()
+            self.path_pool = None
+
+    def calculate_score(self):
+        bonus = 0
+        if self.victory and self.elapsed_time < self.game_duration * 0.8:
+            bonus = 500
+        score_base = self.player.total_income
+        penalties = self.player.total_penalties
+        final_score = score_base + bonus - penalties
+        return int(max(0, final_score))
+
+    def end_game(self, victory):
+        """Marca la partida como terminada (solo la primera vez)."""
+        if self.game_over:
+            return
+        self.game_over = True
+        self.victory = victory
@@ -0,0 +1,121 @@
+class OrderSpatialIndex:
+    """
+    Índice espacial de pedidos abiertos por tile de recogida.
+    - Un hash tile -> pedidos responde "pedidos en este tile" en O(1).
+    - Una rejilla gruesa de cubetas de `bucket_size` x `bucket_size` tiles
+      limita las consultas por radio y de vecinos más cercanos a las
+      cubetas cercanas, en vez de recorrer todos los pedidos.
+    Las distancias son Manhattan (movimiento 4-conectado).
+    Se actualiza de forma incremental al liberar y aceptar pedidos.
+    """
+
+    def __init__(self, bucket_size: int = 8):
+        self.bucket_size = bucket_size
+        self._by_tile: dict[tuple[int, int], dict] = {}
+        self._buckets: dict[tuple[int, int], set] = {}
+        self._tiles_by_id: dict = {}
+
+    def _bucket(self, tile: tuple[int, int]) -> tuple[int, int]:
+        return (tile[0] // self.bucket_size, tile[1] // self.bucket_size)
+
+    def add(self, order_id, tile, order):
+        """Registra un pedido con recogida en `tile`."""
+        tile = tuple(tile)
+        if order_id in self._tiles_by_id:
+            self.remove(order_id)
+        orders = self._by_tile.get(tile)
+        if orders is None:
+            orders = self._by_tile[tile] = {}
+            self._buckets.setdefault(self._bucket(tile), set()).add(tile)
+        orders[order_id] = order
+        self._tiles_by_id[order_id] = tile
+
+    def remove(self, order_id):
+        """Quita un pedido (no hace nada si no está)."""
+        tile = self._tiles_by_id.pop(order_id, None)
+        if tile is None:
+            return
+        orders = self._by_tile[tile]
+        del orders[order_id]
+        if not orders:
+            del self._by_tile[tile]
+            bucket = self._bucket(tile)
+            tiles = self._buckets[bucket]
+            tiles.discard(tile)
+            if not tiles:
+                del self._buckets[bucket]
+
+    def __len__(self) -> int:
+        return len(self._tiles_by_id)
+
+    def __contains__(self, order_id) -> bool:
+        return order_id in self._tiles_by_id
+
+    def groups(self):
+        """Pares (tile, pedidos) de cada tile con recogidas abiertas."""
+        return ((tile, list(orders.values())) for tile, orders in self._by_tile.items())
+
+    def orders_at(self, tile) -> list:
+        """Pedidos con recogida exactamente en `tile` (en orden de llegada)."""
+        orders = self._by_tile.get(tuple(tile))
+        return list(orders.values()) if orders else []
+
+    def within_radius(self, pos, radius: int) -> list:
+        """Pedidos cuya recogida está a distancia Manhattan <= radius de `pos`."""
+        px, py = pos
+        bs = self.bucket_size
+        result = []
+        for bx in range((px - radius) // bs, (px + radius) // bs + 1):
+            for by in range((py - radius) // bs, (py + radius) // bs + 1):
+                for tile in self._buckets.get((bx, by), ()):
+                    if abs(tile[0] - px) + abs(tile[1] - py) <= radius:
+                        result.extend(self._by_tile[tile].values())
+        return result
+
+    def _ring(self, center: tuple[int, int], r: int):
+        """Cubetas a distancia de Chebyshev exactamente r de `center`."""
+        cx, cy = center
+        if r == 0:
+            yield center
+            return
+        for bx in range(cx - r, cx + r + 1):
+            yield (bx, cy - r)
+            yield (bx, cy + r)
+        for by in range(cy - r + 1, cy + r):
+            yield (cx - r, by)
+            yield (cx + r, by)
+
+    def nearest(self, pos, k: int = 1) -> list:
+        """
+        Los k pedidos con recogida más cercana a `pos`.
+        Recorre anillos de cubetas desde la de `pos` y se detiene cuando
+        ningún tile sin revisar puede estar más cerca que el k-ésimo candidato.
+        Returns:
+            list: Pedidos ordenados por distancia.
+        """
+        total = len(self._tiles_by_id)
+        if k <= 0 or total == 0:
+            return []
+        px, py = pos
+        bs = self.bucket_size
+        center = self._bucket((px, py))
+        candidates = []
+        seen = 0
+        r = 0
+        while True:
+            for bucket in self._ring(center, r):
+                for tile in self._buckets.get(bucket, ()):
+                    distance = abs(tile[0] - px) + abs(tile[1] - py)
+                    for order in self._by_tile[tile].values():
+                        candidates.append((distance, seen, order))
+                        seen += 1
+            if seen >= total:
+                break
+            # Cualquier tile fuera de los anillos revisados está a más de r * bs
+            if len(candidates) >= k:
+                candidates.sort(key=lambda c: (c[0], c[1]))
+                if candidates[k - 1][0] <= r * bs:
+                    break
+            r += 1
+        candidates.sort(key=lambda c: (c[0], c[1]))
+        return [order for _, _, order in candidates[:k]]
@@ -1,5 +1,4 @@
 from __future__ import annotations
-import random
 from typing import TYPE_CHECKING
 
 from .strategy import Strategy
@@ -7,7 +6,7 @@ from ..order import Order
 from ..city import City
 
 if TYPE_CHECKING:
-    from ..game import Game
+    from ..simulation import Simulation
 
 class EasyStrategy(Strategy):
     """
@@ -18,10 +17,10 @@ class EasyStrategy(Strategy):
     # Movimientos posibles: Arriba, Abajo, Izquierda, Derecha
     DIRECTIONS = [(-1, 0), (1, 0), (0, -1), (0, 1)]
 
-    def __init__(self, game: Game, rival):
-        super().__init__(game, rival)
+    def __init__(self, game: Simulation, rival, rng=None):
+        super().__init__(game, rival, rng)
         self.target_order_id: str | None = None
-        self.re_evaluation_timer = random.uniform(5.0, 15.0)
+        self.re_evaluation_timer = self.rng.uniform(5.0, 15.0)
         self.last_move: tuple[int, int] | None = None  # Evita devolverse inmediatamente
 
     def _find_path(self, start: tuple[int, int], end: tuple[int, int]) -> list[tuple[int, int]]:
@@ -55,7 +54,7 @@ class EasyStrategy(Strategy):
 
         # 3. Elegir un movimiento al azar válido
         if valid_moves:
-            move = random.choice(valid_moves)
+            move = self.rng.choice(valid_moves)
             self.last_move = move
             return move
         else:
@@ -68,17 +67,14 @@ class EasyStrategy(Strategy):
         Se ejecuta periódicamente (cada tick de actualización).
         """
         city: City = self.game.city
-        current_pos = [self.rival.x, self.rival.y]
+        current_pos = (self.rival.x, self.rival.y)
 
        
         if self.rival.inventory.order_count == 0:
             
             
             if self.target_order_id:
-                available_orders = self.game.order_manager.get_available()
-                is_target_still_available = any(
-                    o["id"] == self.target_order_id for o in available_orders
-                )
+                is_target_still_available = self.game.order_manager.is_available(self.target_order_id)
                 
                 if not is_target_still_available:
                     
@@ -87,31 +83,31 @@ class EasyStrategy(Strategy):
             
             self.re_evaluation_timer -= dt
             if self.re_evaluation_timer <= 0:
-                available_orders = self.game.order_manager.get_available()
+                # Se sortea entre todos los pedidos abiertos con peso 1 / (dist + 1);
+                # la distancia se calcula una vez por tile de recogida
+                available_orders = []
+                weights = []
+                for (px, py), orders in self.game.order_manager.orders_by_pickup():
+                    dist = abs(px - current_pos[0]) + abs(py - current_pos[1])
+                    available_orders.extend(orders)
+                    weights.extend([1 / (dist + 1)] * len(orders))
                 if available_orders:
-                   
-                    def order_weight(order_data):
-                        px, py = order_data['pickup']
-                        dist = abs(px - current_pos[0]) + abs(py - current_pos[1])
-                        return 1 / (dist + 1) 
-
-                    chosen_data = random.choices(
+                    chosen_data = self.rng.choices(
                         available_orders,
-                        weights=[order_weight(o) for o in available_orders],
+                        weights=weights,
                         k=1
                     )[0]
 
-                    self.target_order_id = chosen_data['id']
+                    self.target_order_id = chosen_data.id
 
-                self.re_evaluation_timer = random.uniform(5.0, 15.0)
+                self.re_evaluation_timer = self.rng.uniform(5.0, 15.0)
 
         if self.rival.inventory.order_count == 0 and self.target_order_id:
-            available_orders = self.game.order_manager.get_available()
-            for order_data in available_orders:
-                if order_data['id'] == self.target_order_id and order_data['pickup'] == current_pos:
-                    if self.game.accept_order_at_location_rival(self.rival, order_data):
-                        self.target_order_id = None  
-                        return True
+            order_data = self.game.order_manager.get_order(self.target_order_id)
+            if order_data is not None and order_data.pickup == current_pos:
+                if self.game.accept_order_at_location_rival(self.rival, order_data):
+                    self.target_order_id = None  
+                    return True
 
         if self.rival.inventory.current_order:
             dropoff = self.rival.inventory.current_order.order.dropoff
@@ -1,8 +1,7 @@
 import heapq
 import math
-import random
 from .strategy import Strategy
-from ..city import City
+from ..dispatch_planner import DispatchPlan, DispatchPlanner
 from ..order import Order
 
 class HardStrategy(Strategy):
@@ -10,154 +9,219 @@ class HardStrategy(Strategy):
     Estrategia de dificultad Difícil:
     Implementa el algoritmo A* (A estrella) para planificar rutas óptimas
     entre puntos de recogida y entrega, considerando el costo del terreno y el clima.
+    Lleva varios pedidos a la vez: el orden de las paradas lo decide DispatchPlanner.
     """
 
-    def __init__(self, game: 'Game', rival: 'Rival'):
-        super().__init__(game, rival)
-        self.target_order_id: str | None = None
-        self.current_path: list[tuple[int, int]] = []
-        self.re_evaluation_timer = random.uniform(5.0, 10.0)
-        self.last_weather_multiplier = game.get_current_weather_multiplier()
-        self.max_recalc_interval = 5.0  # segundos entre recalculaciones por clima
-        self.recalc_timer = 0.0
-
-    def _heuristic(self, a: tuple[int, int], b: tuple[int, int]) -> float:
-        return abs(a[0] - b[0]) + abs(a[1] - b[1])
+    # Pedidos abiertos (los de mejor puntaje) que se consideran en cada plan
+    PLAN_CANDIDATES = 6
+    # Margen sobre el tiempo de viaje estimado para los deadlines
+    TRAVEL_SLACK = 1.25
+    # Segundos de juego entre replanificaciones (mínimo, máximo)
+    REPLAN_INTERVAL = (5.0, 10.0)
+    # Sobre 3 de peso cada unidad gasta 0.2 de resistencia extra por paso (ver
+    # Player.consume_stamina), un 40% de los 0.5 base: como la resistencia
+    # limita cuánto se avanza, cada tramo cuesta eso más
+    LOAD_FACTOR = 0.4
+    FREE_LOAD = 3
+
+    def __init__(self, game: 'Simulation', rival: 'Rival', rng=None):
+        super().__init__(game, rival, rng)
+        self.plan: DispatchPlan | None = None
+        self.planner = DispatchPlanner(
+            self._travel_cost,
+            max_weight=rival.inventory.max_weight,
+            load_factor=self.LOAD_FACTOR,
+            free_load=self.FREE_LOAD,
+        )
+        # Segundo de juego (elapsed_time) en que toca rehacer el plan
+        self.next_replan_time = 0.0
+        # Pedidos liberados cuando se armó el plan (un plan vacío espera a que haya más)
+        self._released_at_plan = -1
+        # Entregas de pedidos llevados cuyo campo de distancia se mantiene (id -> tile)
+        self._pinned: dict = {}
 
     def _find_path(self, start: tuple[int, int], goal: tuple[int, int]) -> list[tuple[int, int]]:
         """
-        Implementación clásica del algoritmo A* en una cuadrícula.
-        Considera bloqueos y penalizaciones por clima.
+        Ruta A* delegada al servicio compartido de rutas (con caché).
         """
-        city: City = self.game.city
-        weather_mult = self.game.get_current_weather_multiplier()
-        width, height = city.width, city.height
-
-        open_set = []
-        heapq.heappush(open_set, (0, start))
-        came_from = {}
-        g_score = {start: 0}
-        f_score = {start: self._heuristic(start, goal)}
-
-        while open_set:
-            _, current = heapq.heappop(open_set)
-
-            if current == goal:
-                # Reconstruir el camino
-                path = []
-                while current in came_from:
-                    path.append(current)
-                    current = came_from[current]
-                path.reverse()
-                return path
-
-            for dx, dy in [(-1, 0), (1, 0), (0, -1), (0, 1)]:
-                neighbor = (current[0] + dx, current[1] + dy)
-                x, y = neighbor
-                if not (0 <= x < width and 0 <= y < height):
-                    continue  # fuera del mapa
-                if city.is_blocked(x, y):
-                    continue  # edificio o muro
-
-                # Costo del movimiento (afectado por clima)
-                terrain_cost = 1.0 / weather_mult
-                tentative_g = g_score[current] + terrain_cost
-
-                if tentative_g < g_score.get(neighbor, math.inf):
-                    came_from[neighbor] = current
-                    g_score[neighbor] = tentative_g
-                    f_score[neighbor] = tentative_g + self._heuristic(neighbor, goal)
-                    heapq.heappush(open_set, (f_score[neighbor], neighbor))
-
-        # Si no hay camino, retornar vacío
-        return []
+        return self.game.path_service.find_path(start, goal, method="astar")
 
     def next_move(self) -> tuple[int, int]:
         """
         Retorna el siguiente paso de la ruta planificada.
         """
-        if self.current_path:
-            next_step = self.current_path.pop(0)
-            dx = next_step[0] - self.rival.x
-            dy = next_step[1] - self.rival.y
-            return (dx, dy)
-        else:
-            self.decide_job_action(0)
+        self._collect_path()
+        move = self._follow_route()
+        if move is not None:
+            return move
+        self.decide_job_action(0)
         return (0, 0)
 
-    def _evaluate_order(self, order_data: dict, current_pos: tuple[int, int]) -> float:
-        """Evalúa un pedido con base en la recompensa y distancia estimada."""
+    def _evaluate_order(self, order_data: Order, current_pos: tuple[int, int]) -> float:
+        """Evalúa un pedido con base en la recompensa y la distancia real (tablas precalculadas)."""
     
-        pickup = tuple(order_data["pickup"])
-        dropoff = tuple(order_data["dropoff"])
-        payout = order_data.get("payout", 10)
+        pickup = order_data.pickup
+        dropoff = order_data.dropoff
+        payout = order_data.payout
 
-        distance = abs(pickup[0] - current_pos[0]) + abs(pickup[1] - current_pos[1])
-        delivery_distance = abs(dropoff[0] - pickup[0]) + abs(dropoff[1] - pickup[1])
+        order_manager = self.game.order_manager
+        distance = order_manager.travel_distance(pickup, current_pos)
+        delivery_distance = order_manager.travel_distance(dropoff, pickup)
         weather_mult = self.game.get_current_weather_multiplier()
 
         cost = (distance + delivery_distance) / weather_mult
         return payout - 0.5 * cost
 
+    def _candidates(self, current_pos: tuple[int, int], free_weight: float) -> list[Order]:
+        """
+        Pedidos abiertos con mejor puntaje que caben en el peso libre.
+        Con `OrderTable` se puntúan todos en una pasada vectorizada.
+        """
+        if free_weight <= 0:
+            return []
+        table = self.game.order_manager.get_order_table()
+        if table is not None:
+            distance_weight = 0.5 / self.game.get_current_weather_multiplier()
+            return table.top(
+                current_pos,
+                self.PLAN_CANDIDATES,
+                pickup_weight=distance_weight,
+                delivery_weight=distance_weight,
+                max_weight=free_weight,
+                distance_index=self.game.order_manager.distance_index,
+            )
+
+        available = [o for o in self.game.order_manager.get_available() if o.weight <= free_weight]
+        scored = [(self._evaluate_order(o, current_pos), o) for o in available]
+        best = heapq.nlargest(self.PLAN_CANDIDATES, scored, key=lambda item: item[0])
+        # Un puntaje infinito negativo significa que no hay camino
+        return [order for score, order in best if score != -math.inf]
+
+    def _travel_cost(self, start: tuple[int, int], goal: tuple[int, int]) -> float:
+        """Costo real de start a goal según las tablas de distancia (ver DistanceIndex)."""
+        return self.game.order_manager.travel_distance(goal, start)
+
+    def _pin(self, order: Order):
+        """
+        Mantiene el campo de distancia de la entrega mientras se lleva el pedido:
+        al aceptarlo OrderManager libera sus tablas y el planificador las sigue usando.
+        """
+        index = self.game.order_manager.distance_index
+        if index is not None and order.id not in self._pinned:
+            index.add(order.dropoff)
+            self._pinned[order.id] = order.dropoff
+
+    def _unpin(self, order_id):
+        dropoff = self._pinned.pop(order_id, None)
+        if dropoff is not None:
+            self.game.order_manager.distance_index.release(dropoff)
+
+    def _replan(self, current_pos: tuple[int, int]):
+        """Rehace el plan con lo que se lleva y los mejores pedidos abiertos."""
+        inventory = self.rival.inventory
+        planner = self.planner
+        planner.cost_weight = 0.5 / self.game.get_current_weather_multiplier()
+        # El rival avanza un tile por turno; el margen cubre las pausas por resistencia
+        planner.seconds_per_unit = self.game.rival_scheduler.interval * self.TRAVEL_SLACK
+        now_ts = self.game.get_current_game_datetime().timestamp()
+        elapsed = self.game.elapsed_time
+        remaining_time = self.game.game_duration - elapsed
+        self.next_replan_time = elapsed + self.rng.uniform(*self.REPLAN_INTERVAL)
+        self._released_at_plan = len(self.game.order_manager.released_ids)
+        candidates = self._candidates(current_pos, inventory.max_weight - inventory.current_weight)
+        if self.plan is not None:
+            # Las recogidas del plan anterior siguen en juego: sin ellas el rival
+            # cambia de objetivo cada vez que se mueve y cambia el top de candidatos
+            order_manager = self.game.order_manager
+            ids = {order.id for order in candidates}
+            candidates += [order for order in self.plan.new_orders()
+                           if order.id not in ids and order_manager.is_available(order.id)]
+        self.plan = planner.plan(
+            current_pos,
+            now_ts,
+            inventory.orders_by("deadline"),
+            candidates,
+            inventory.current_weight,
+            # Un pedido que no alcanza a entregarse antes del final no paga
+            horizon_ts=now_ts + remaining_time,
+        )
+
+    def _visit_stops(self, current_pos: tuple[int, int]) -> bool:
+        """
+        Atiende las paradas del plan que están en la posición actual.
+        Si una recogida ya no se puede hacer (otro la tomó) se descarta el plan.
+        Returns:
+            bool: True si se recogió o entregó algún pedido.
+        """
+        acted = False
+        while self.plan is not None and self.plan.next_stop is not None:
+            stop = self.plan.next_stop
+            if stop.pos != current_pos:
+                break
+            order = stop.order
+            if stop.pickup:
+                if not self.game.order_manager.is_available(order.id):
+                    self.plan = None
+                    break
+                # Se fija antes de aceptar para que el campo no se libere y recalcule
+                self._pin(order)
+                if not self.game.accept_order_at_location_rival(self.rival, order):
+                    self._unpin(order.id)
+                    self.plan = None
+                    break
+            else:
+                if not (self.rival.inventory.select(order.id)
+                        and self.game.complete_delivery_rival(self.rival)):
+                    self.plan = None
+                    break
+                self._unpin(order.id)
+            acted = True
+            if self.plan.advance() is None:
+                # Plan terminado: el siguiente se arma desde la posición nueva
+                self.plan = None
+        return acted
+
+    def order_expired(self, order: Order):
+        """El plan tenía su entrega: se libera su campo y se rehace el plan."""
+        self._unpin(order.id)
+        self.plan = None
+
+    def _should_replan(self) -> bool:
+        """
+        Hay que rehacer el plan si no hay uno, si venció su intervalo o si el
+        plan está vacío y desde entonces se liberaron pedidos nuevos.
+        """
+        if self.plan is None or self.game.elapsed_time >= self.next_replan_time:
+            return True
+        return (len(self.plan) == 0
+                and len(self.game.order_manager.released_ids) != self._released_at_plan)
+
     def decide_job_action(self, dt: float):
         """
         Control principal de decisiones del nivel difícil.
-        - Replanifica rutas con A*.
-        - Reevaluación dinámica según clima o resistencia.
+        - Planifica recogidas y entregas de varios pedidos con DispatchPlanner
+          (respetando peso máximo y deadlines) y lo rehace cada 5-10 segundos de
+          juego; sin nada que hacer espera a que se liberen pedidos nuevos.
+        - Planifica rutas con A* (servicio de rutas compartido) hacia la siguiente parada.
+        - Si cambia la época de costo, repara la ruta con D* Lite en vez de rehacerla.
         """
         current_pos = (self.rival.x, self.rival.y)
-        city: City = self.game.city
-
-        if self.rival.inventory.current_order:
-            dropoff = tuple(self.rival.inventory.current_order.order.dropoff)
-
-            if current_pos == dropoff:
-                self.game.complete_delivery_rival(self.rival)
-                self.current_path.clear()
-                self.target_order_id = None
-                return True
-
-            self.recalc_timer += dt
-            current_weather = self.game.get_current_weather_multiplier()
-            if not self.current_path or self.recalc_timer >= self.max_recalc_interval \
-               or current_weather != self.last_weather_multiplier:
-                self.current_path = self._find_path(current_pos, dropoff)
-                self.last_weather_multiplier = current_weather
-                self.recalc_timer = 0.0
-
-        elif self.rival.inventory.order_count == 0:
-            
-            if self.target_order_id:
-                available_orders = self.game.order_manager.get_available()
-                is_target_still_available = any(
-                    o["id"] == self.target_order_id for o in available_orders
-                )
-                
-                if not is_target_still_available:
-                    
-                    self.target_order_id = None
-                    self.current_path.clear()
-                    self.re_evaluation_timer = 0.0 
-            
-            self.re_evaluation_timer -= dt
-            if self.re_evaluation_timer <= 0 or not self.target_order_id:
-                available_orders = self.game.order_manager.get_available()
-                if available_orders:
-                    best_order = max(
-                        available_orders,
-                        key=lambda o: self._evaluate_order(o, current_pos)
-                    )
-                    self.target_order_id = best_order["id"]
-                    pickup = tuple(best_order["pickup"])
-                    self.current_path = self._find_path(current_pos, pickup)
-                self.re_evaluation_timer = random.uniform(5.0, 10.0)
-                
-            if self.target_order_id:
-                available_orders = self.game.order_manager.get_available()
-                for order_data in available_orders:
-                    if order_data["id"] == self.target_order_id and tuple(order_data["pickup"]) == current_pos:
-                        if self.game.accept_order_at_location_rival(self.rival, order_data):
-                            self.current_path.clear()
-                            return True
-
-        return False
\ No newline at end of file
+        self._collect_path()
+        if self.current_path and self.path_epoch != self.game.path_service.cost_epoch:
+            self._repair_path()
+
+        acted = self._visit_stops(current_pos)
+
+        if self._should_replan():
+            self._replan(current_pos)
+            acted = self._visit_stops(current_pos) or acted
+
+        stop = self.plan.next_stop if self.plan is not None else None
+        if stop is None:
+            self._cancel_path()
+            return acted
+
+        if self._route_goal() != stop.pos:
+            self._cancel_path()
+            self._request_path(current_pos, stop.pos)
+        return acted
@@ -1,17 +1,152 @@
 from __future__ import annotations
+import random
 from abc import ABC, abstractmethod
 from typing import TYPE_CHECKING
 
+from ..route import Route
+
 if TYPE_CHECKING:
-    from src.logic.game import Game
+    from src.logic.simulation import Simulation
     from src.logic.rival import Rival
+    from src.logic.order import Order
 
 class Strategy(ABC):
     """Abstract base class for different strategies."""
 
-    def __init__(self, game: 'Game', rival: 'Rival'):
+    # Método de búsqueda que se pide al servicio de rutas
+    PATH_METHOD = "astar"
+    # Nodos que se expanden de inmediato al pedir una ruta; el resto se
+    # resuelve por partes en PathService.advance. Ambos salen del mismo
+    # presupuesto por frame (ver PathService.frame_expansions)
+    EAGER_EXPANSIONS = 2000
+    # Si varios rivales van a la misma meta, seguir el campo de flujo
+    # compartido en lugar de buscar una ruta propia (ver PathService.shared_flow_field)
+    SHARE_FLOW_FIELDS = True
+
+    def __init__(self, game: 'Simulation', rival: 'Rival', rng: random.Random | None = None):
         self.game = game
         self.rival = rival
+        # Generador propio: los sorteos del rival no dependen del resto del juego
+        self.rng = rng if rng is not None else random.Random()
+        self.current_path = Route()
+        self.pending_path = None
+        # Época de costo con la que se calculó current_path
+        self.path_epoch = -1
+        # Meta que se sigue por un campo de flujo compartido (None = se usa current_path)
+        self.flow_goal = None
+
+    def _request_path(self, start: tuple[int, int], goal: tuple[int, int]):
+        """
+        Pide una ruta al servicio sin bloquear el frame.
+        Mientras la búsqueda no termine, el rival sigue su ruta anterior (o espera).
+        Si otros rivales van a la misma meta y hay un campo de flujo listo,
+        no se busca nada: el rival sigue ese campo.
+        """
+        service = self.game.path_service
+        if self.pending_path is not None:
+            service.cancel(self.pending_path)
+            self.pending_path = None
+        self.flow_goal = None
+        if self.SHARE_FLOW_FIELDS:
+            service.head_to(self, goal)
+            if service.shared_flow_field(goal) is not None:
+                self.current_path.clear()
+                self.flow_goal = tuple(goal)
+                return
+        self.pending_path = service.request_path(
+            start, goal, self.PATH_METHOD, eager_expansions=self.EAGER_EXPANSIONS
+        )
+        self._collect_path()
+
+    def _route_goal(self) -> tuple[int, int] | None:
+        """Meta hacia la que va el rival (búsqueda pendiente, campo de flujo o ruta), o None."""
+        if self.pending_path is not None:
+            return self.pending_path.goal
+        if self.flow_goal is not None:
+            return self.flow_goal
+        return self.current_path.goal
+
+    def _collect_path(self) -> bool:
+        """
+        Si la ruta pedida ya está lista, la adopta como current_path.
+        Returns:
+            bool: True si se adoptó una ruta nueva.
+        """
+        request = self.pending_path
+        if request is None or not request.done:
+            return False
+        self.pending_path = None
+        if request.cancelled:
+            return False
+
+        route = Route(request.path, origin=request.start)
+        position = (self.rival.x, self.rival.y)
+        if position != request.start:
+            # El rival avanzó mientras se buscaba: se recorta la ruta si sigue sobre ella
+            if not route.skip_to(position):
+                return False
+
+        self.current_path = route
+        self.path_epoch = request.epoch
+        return True
+
+    def _repair_path(self):
+        """
+        El modelo de costo cambió mientras se seguía current_path: en lugar de
+        descartarla, se repara con el planificador incremental del servicio.
+        """
+        service = self.game.path_service
+        position = (self.rival.x, self.rival.y)
+        goal = self.current_path.goal
+        self.current_path = Route(service.repair_path(self, position, goal), origin=position)
+        self.path_epoch = service.cost_epoch
+
+    def _follow_route(self) -> tuple[int, int] | None:
+        """
+        Dirección hacia el siguiente paso de current_path.
+        El paso solo se consume cuando el rival llega a él, así que un
+        movimiento fallido (sin resistencia, bloqueo) no desalinea la ruta.
+        Si el rival se desvió, la ruta se descarta para volver a planificar.
+        Returns:
+            tuple[int, int] | None: (dx, dy) o None si no hay ruta que seguir.
+        """
+        if self.flow_goal is not None:
+            return self._follow_flow_field()
+        route = self.current_path
+        if not route.sync((self.rival.x, self.rival.y)):
+            self._cancel_path()
+            return None
+        next_step = route.peek()
+        if next_step is None:
+            return None
+        return (next_step[0] - self.rival.x, next_step[1] - self.rival.y)
+
+    def _follow_flow_field(self) -> tuple[int, int] | None:
+        """
+        Dirección del siguiente paso según el campo de flujo compartido hacia flow_goal.
+        Al llegar, o si el campo dejó de estar disponible (p. ej. cambiaron los
+        costos), se deja de seguir y la estrategia vuelve a pedir una ruta.
+        """
+        field = self.game.path_service.shared_flow_field(self.flow_goal)
+        next_step = field.next_step((self.rival.x, self.rival.y)) if field is not None else None
+        if next_step is None:
+            self.flow_goal = None
+            return None
+        return (next_step[0] - self.rival.x, next_step[1] - self.rival.y)
+
+    def _cancel_path(self):
+        """Descarta la ruta actual y cualquier búsqueda pendiente (liberándola en el servicio)."""
+        service = self.game.path_service
+        self.current_path.clear()
+        self.flow_goal = None
+        if self.pending_path is not None:
+            service.cancel(self.pending_path)
+        self.pending_path = None
+        service.leave(self)
+
+    def order_expired(self, order: Order):
+        """El pedido que llevaba el rival venció y salió del inventario."""
+        pass
 
     @abstractmethod
     def _find_path(self, start: tuple[int, int], end: tuple[int, int]) -> list[tuple[int, int]]:
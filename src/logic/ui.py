@@ -1,3 +1,4 @@
+import heapq
 import pygame
 import random
 import math
@@ -5,10 +6,15 @@ import math
 
 class UIManager:
     """Maneja la interfaz gráfica del juego."""
+
+    # Rivales que se listan en el HUD cuando hay varios
+    HUD_RIVAL_RANKING = 5
     
-    def __init__(self, screen_width, screen_height):
+    def __init__(self, screen_width, screen_height, rng: random.Random | None = None):
         self.screen_width = screen_width
         self.screen_height = screen_height
+        # Las partículas del clima usan su propio generador (no afectan la partida)
+        self.rng = rng if rng is not None else random.Random()
         
         # Fuentes
         self.font_small = pygame.font.Font(None, 20)
@@ -67,17 +73,17 @@ class UIManager:
             intensity = 5 if weather == 'storm' else 3 if weather == 'rain' else 1
             for _ in range(intensity):
                 self.rain_particles.append({
-                    'x': random.randint(self.map_offset_x, self.screen_width),
+                    'x': self.rng.randint(self.map_offset_x, self.screen_width),
                     'y': self.map_offset_y,
-                    'speed': random.randint(400, 600)
+                    'speed': self.rng.randint(400, 600)
                 })
         
         if weather in ['wind', 'storm']:
-            if random.random() < 0.1:
+            if self.rng.random() < 0.1:
                 self.wind_particles.append({
                     'x': self.map_offset_x,
-                    'y': random.randint(self.map_offset_y, self.map_offset_y + view_height),
-                    'speed': random.randint(200, 400)
+                    'y': self.rng.randint(self.map_offset_y, self.map_offset_y + view_height),
+                    'speed': self.rng.randint(200, 400)
                 })
         
         # Actualizar lluvia
@@ -120,13 +126,20 @@ class UIManager:
                            (p['x'], p['y']), (p['x'] + 30, p['y']), 2)
         
         # Flash de tormenta
-        if weather == 'storm' and random.random() < 0.01:
+        if weather == 'storm' and self.rng.random() < 0.01:
             flash = pygame.Surface((self.screen_width, self.screen_height), pygame.SRCALPHA)
             flash.fill((255, 255, 255, 150))
             surface.blit(flash, (0, 0))
         
-    def draw_hud(self, surface, player, rival, game_time, weather, elapsed, current_game_time):
-        """Dibuja el HUD principal."""
+    def draw_hud(self, surface, player, rivals, game_time, weather, elapsed, current_game_time):
+        """
+        Dibuja el HUD principal.
+        Args:
+            rivals: Lista de rivales (o un solo rival); se detalla el que más
+                ingresos lleva y, si hay varios, un resumen de los primeros.
+        """
+        if not isinstance(rivals, (list, tuple)):
+            rivals = [rivals]
         panel_rect = pygame.Rect(0, 0, 190, self.screen_height)
         pygame.draw.rect(surface, self.colors['panel'], panel_rect)
         
@@ -200,10 +213,15 @@ class UIManager:
         self._draw_text(surface, f"Pedidos: {player.inventory.order_count}", 10, y,
                        self.font_small, self.colors['text_dim'])
         
+        if not rivals:
+            return
+        rival = max(rivals, key=lambda r: r.total_income)
+
         # Información del Rival 
         y += 40
-        self._draw_text(surface, "Rival:", 10, y, 
-                       self.font_medium, self.colors['rival'])
+        title = "Rival:" if len(rivals) == 1 else f"Rival líder (de {len(rivals)}):"
+        self._draw_text(surface, title, 10, y, 
+                       self.font_medium if len(rivals) == 1 else self.font_small, self.colors['rival'])
         y += 30
         
         # Ingresos del Rival
@@ -240,8 +258,16 @@ class UIManager:
         self._draw_text(surface, f"Pedidos Rival: {rival.inventory.order_count}", 10, y,
                        self.font_small, self.colors['text_dim'])
         y += 20
-        
-    def draw_map(self, surface, city, player_x, player_y, available_orders, rival):
+
+        if len(rivals) > 1:
+            y += 10
+            ranking = heapq.nlargest(self.HUD_RIVAL_RANKING, rivals, key=lambda r: r.total_income)
+            for place, other in enumerate(ranking, start=1):
+                self._draw_text(surface, f"{place}. ${int(other.total_income)} | Rep {int(other.reputation)}",
+                               10, y, self.font_small, self.colors['text_dim'])
+                y += 18
+
+    def draw_map(self, surface, city, player_x, player_y, available_orders, rivals):
         """Dibuja el mapa con cámara centrada"""
         self.update_camera(player_x, player_y, city.width, city.height)
         
@@ -270,7 +296,7 @@ class UIManager:
         
         # Dibujar marcadores de pedidos disponibles
         for order in available_orders:
-            pickup = order['pickup']
+            pickup = order.pickup
             self._draw_map_marker_camera(surface, pickup, (100, 255, 100), "P")
         
         # Dibujar jugador
@@ -280,12 +306,18 @@ class UIManager:
         pygame.draw.rect(surface, self.colors['player'], player_rect)
         pygame.draw.rect(surface, (255, 255, 255), player_rect, 2)
         
-        # Draw rival
-        rx = self.map_offset_x + rival.x * self.tile_size - self.camera_x
-        ry = self.map_offset_y + rival.y * self.tile_size - self.camera_y
-        rival_rect = pygame.Rect(rx + 5, ry + 5, self.tile_size - 12, self.tile_size - 12)
-        pygame.draw.rect(surface, '#FF0000' , rival_rect)
-        pygame.draw.rect(surface, (255, 255, 255), rival_rect, 2)
+        # Dibujar rivales (solo los que caen en la vista)
+        if not isinstance(rivals, (list, tuple)):
+            rivals = [rivals]
+        for rival in rivals:
+            rx = self.map_offset_x + rival.x * self.tile_size - self.camera_x
+            ry = self.map_offset_y + rival.y * self.tile_size - self.camera_y
+            if (rx < self.map_offset_x - self.tile_size or rx > self.screen_width or
+                    ry < self.map_offset_y - self.tile_size or ry > self.screen_height - 100):
+                continue
+            rival_rect = pygame.Rect(rx + 5, ry + 5, self.tile_size - 12, self.tile_size - 12)
+            pygame.draw.rect(surface, '#FF0000' , rival_rect)
+            pygame.draw.rect(surface, (255, 255, 255), rival_rect, 2)
 
     def draw_current_order(self, surface, inventory, city):
         """Dibuja información del pedido actual."""
@@ -342,18 +374,18 @@ class UIManager:
     
     def _draw_order_item(self, surface, order, x, y, width):
         """Dibuja un item de pedido."""
-        color = self.colors['warning'] if order.get('priority', 0) > 0 else self.colors['text']
-        self._draw_text(surface, order['id'], x, y, self.font_small, color)
+        color = self.colors['warning'] if order.priority > 0 else self.colors['text']
+        self._draw_text(surface, order.id, x, y, self.font_small, color)
         
-        if order.get('priority', 0) > 0:
-            self._draw_text(surface, f"⭐{order['priority']}", x + width - 30, y,
+        if order.priority > 0:
+            self._draw_text(surface, f"⭐{order.priority}", x + width - 30, y,
                            self.font_small, self.colors['warning'])
         
         y += 18
-        self._draw_text(surface, f"${order['payout']} | {order['weight']}kg", 
+        self._draw_text(surface, f"${order.payout} | {order.weight}kg", 
                        x, y, self.font_small, self.colors['text_dim'])
         y += 16
-        deadline_time = order['deadline'].split('T')[1][:5]
+        deadline_time = order.deadline.split('T')[1][:5]
         self._draw_text(surface, f"⏰ {deadline_time}", x, y, 
                        self.font_small, self.colors['text_dim'])
     
@@ -5,13 +5,16 @@ class Weather:
     def __init__(
             self,
             initial_state: str,
-            transition: dict[str, dict[str, float]]):
+            transition: dict[str, dict[str, float]],
+            rng: random.Random | None = None):
         self.state = initial_state
         self.transition = transition
+        # Generador propio para que la secuencia de climas dependa solo de su semilla
+        self.rng = rng if rng is not None else random.Random()
 
     def next_state(self) -> str:
         probabilities = self.transition[self.state]
         states = list(probabilities.keys())
         weights = list(probabilities.values())
-        self.state = random.choices(states, weights=weights)[0]
+        self.state = self.rng.choices(states, weights=weights)[0]
         return self.state
\ No newline at end of file
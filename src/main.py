@@ -15,6 +15,7 @@ from src.logic.main_menu import MainMenu
 from src.logic.input_box import InputBox
 from src.logic.game_state import GameState
 from src.logic.button import Button 
+from src.logic.log import configure_console
 
 
 def _format_elapsed(seconds: float) -> str:
@@ -178,6 +179,7 @@ def choose_difficulty_screen(screen, clock):
 
 def main():
     """Punto de entrada del juego."""
+    configure_console()
     pygame.init()
     screen = pygame.display.set_mode((1200, 800))
     pygame.display.set_caption("Courier Quest")
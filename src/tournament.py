@@ -0,0 +1,239 @@
+"""
+Courier Quest - Torneo de estrategias del rival
+tournament.py
+
+Corre partidas sin ventana (Simulation) para cada estrategia y resume
+ingresos, entregas, atrasos y tiempo de CPU por tick. Las partidas se
+reparten entre procesos con ProcessPoolExecutor.
+
+    python -m src.tournament --games 20 --map mapa.json --jobs pedidos.json
+    python -m src.tournament --strategies easy+hard,medium+hard --rivals 10
+"""
+
+import argparse
+import itertools
+import json
+import os
+import statistics
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from src.logic.simulation import FIXED_DT, GAME_DURATION, STRATEGIES, Simulation
+from src.logic.weather import Weather
+
+
+# Escenarios (mapa, pedidos, clima) de este proceso; los recibe cada worker al iniciar
+_scenarios: list[dict] = []
+
+
+def _set_scenarios(scenarios: list[dict]):
+    global _scenarios
+    _scenarios = scenarios
+
+
+def _load_json(path: str):
+    with open(path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    # Mismo formato que el API: {"data": ...}
+    if isinstance(data, dict) and "data" in data:
+        return data["data"]
+    return data
+
+
+def load_scenarios(map_paths=None, jobs_paths=None, weather_path=None) -> list[dict]:
+    """
+    Arma un escenario por cada combinación de mapa y archivo de pedidos.
+    Lo que no se indique se obtiene del API (o su caché) como en el juego.
+    """
+    proxy = None
+    if not map_paths or not jobs_paths or not weather_path:
+        from src.logic.proxy import Proxy
+        proxy = Proxy()
+
+    maps = [(path, _load_json(path)) for path in map_paths] if map_paths else [("api", proxy.get_map())]
+    jobs = [(path, _load_json(path)) for path in jobs_paths] if jobs_paths else [("api", proxy.get_jobs())]
+    if weather_path:
+        weather = _load_json(weather_path)
+        weather = {
+            "initial": weather.get("initial", {}).get("condition", "clear"),
+            "transition": weather.get("transition", {}),
+        }
+    else:
+        api_weather = proxy.get_weather()
+        weather = {"initial": api_weather.state, "transition": api_weather.transition}
+
+    return [
+        {
+            "name": f"{os.path.basename(map_name)} + {os.path.basename(jobs_name)}",
+            "map": map_data,
+            "jobs": jobs_data,
+            "weather": weather,
+        }
+        for (map_name, map_data), (jobs_name, jobs_data) in itertools.product(maps, jobs)
+    ]
+
+
+def play_game(lineup: str, scenario_index: int, seed: int, duration: float,
+              rival_count: int | None = None) -> list[dict]:
+    """
+    Corre una partida completa y retorna sus métricas.
+    Args:
+        lineup: Llave de STRATEGIES, o varias unidas con "+" para enfrentarlas.
+        scenario_index: Índice en los escenarios del proceso.
+        seed: Semilla de la partida (clima, rivales...).
+        duration: Segundos de juego.
+        rival_count: Rivales en la partida (por defecto uno por estrategia).
+    Returns:
+        list[dict]: Una fila por estrategia del lineup (promedio de sus rivales).
+    """
+    scenario = _scenarios[scenario_index]
+    weather = Weather(scenario["weather"]["initial"], scenario["weather"]["transition"])
+    simulation = Simulation(
+        scenario["map"], scenario["jobs"], weather, lineup.split("+"),
+        game_duration=duration, seed=seed, rival_count=rival_count,
+    )
+
+    tick_times = []
+    while not simulation.game_over:
+        start = time.process_time_ns()
+        simulation.update(FIXED_DT)
+        tick_times.append(time.process_time_ns() - start)
+
+    tick_times.sort()
+    timing = {
+        "ticks": len(tick_times),
+        "tick_us_mean": statistics.fmean(tick_times) / 1000,
+        "tick_us_p95": tick_times[int(len(tick_times) * 0.95)] / 1000,
+        "tick_us_max": tick_times[-1] / 1000,
+    }
+
+    by_strategy: dict[str, list] = {}
+    for rival in simulation.rivals:
+        name = next(key for key, cls in STRATEGIES.items() if type(rival.strategy) is cls)
+        by_strategy.setdefault(name, []).append(rival)
+
+    rows = []
+    for strategy, rivals in by_strategy.items():
+        rows.append({
+            "lineup": lineup,
+            "strategy": strategy,
+            "scenario": scenario["name"],
+            "seed": seed,
+            "rivals": len(rivals),
+            "income": statistics.fmean(r.total_income for r in rivals),
+            "deliveries": statistics.fmean(r.deliveries for r in rivals),
+            "late_deliveries": statistics.fmean(r.late_deliveries for r in rivals),
+            "lateness": statistics.fmean(r.total_lateness for r in rivals),
+            "reputation": statistics.fmean(r.reputation for r in rivals),
+            **timing,
+        })
+    return rows
+
+
+def run_tournament(scenarios: list[dict], lineups, games: int, seed: int = 0,
+                   duration: float = GAME_DURATION, workers: int | None = None,
+                   rival_count: int | None = None) -> list[dict]:
+    """
+    Corre `games` partidas por lineup y escenario.
+    La partida i usa la semilla seed + i, así todas las estrategias juegan
+    con el mismo clima. Con workers=1 se corre en este proceso.
+    Returns:
+        list[dict]: Filas de play_game, en el orden de las tareas.
+    """
+    tasks = [
+        (lineup, index, seed + i, duration, rival_count)
+        for lineup in lineups
+        for index in range(len(scenarios))
+        for i in range(games)
+    ]
+    if workers == 1:
+        _set_scenarios(scenarios)
+        results = [play_game(*task) for task in tasks]
+    else:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_set_scenarios,
+                                 initargs=(scenarios,)) as pool:
+            results = list(pool.map(play_game, *zip(*tasks)))
+    return [row for rows in results for row in rows]
+
+
+def summarize(results: list[dict]) -> dict[str, dict]:
+    """Promedios por estrategia (por estrategia dentro de cada lineup si se enfrentan varias)."""
+    by_strategy: dict[str, list[dict]] = {}
+    for result in results:
+        label = result["strategy"]
+        if result["lineup"] != label:
+            label = f"{label} ({result['lineup']})"
+        by_strategy.setdefault(label, []).append(result)
+
+    summary = {}
+    for strategy, rows in by_strategy.items():
+        deliveries = sum(r["deliveries"] for r in rows)
+        late = sum(r["late_deliveries"] for r in rows)
+        lateness = sum(r["lateness"] for r in rows)
+        summary[strategy] = {
+            "games": len(rows),
+            "income": statistics.fmean(r["income"] for r in rows),
+            "income_stdev": statistics.pstdev(r["income"] for r in rows),
+            "deliveries": deliveries / len(rows),
+            "late_ratio": late / deliveries if deliveries else 0.0,
+            "lateness": lateness / late if late else 0.0,
+            "reputation": statistics.fmean(r["reputation"] for r in rows),
+            "tick_us_mean": statistics.fmean(r["tick_us_mean"] for r in rows),
+            "tick_us_p95": max(r["tick_us_p95"] for r in rows),
+            "tick_us_max": max(r["tick_us_max"] for r in rows),
+        }
+    return summary
+
+
+def format_report(summary: dict[str, dict]) -> str:
+    width = max([10] + [len(strategy) for strategy in summary])
+    header = (f"{'Estrategia':<{width}} {'Partidas':>8} {'Ingreso':>10} {'±':>8} {'Entregas':>9} "
+              f"{'% tarde':>8} {'Atraso s':>9} {'Rep':>6} {'µs/tick':>8} {'p95':>8} {'máx':>9}")
+    lines = [header, "-" * len(header)]
+    for strategy, s in summary.items():
+        lines.append(
+            f"{strategy:<{width}} {s['games']:>8} {s['income']:>10.1f} {s['income_stdev']:>8.1f} "
+            f"{s['deliveries']:>9.1f} {s['late_ratio'] * 100:>7.1f}% {s['lateness']:>9.1f} "
+            f"{s['reputation']:>6.1f} {s['tick_us_mean']:>8.1f} {s['tick_us_p95']:>8.1f} "
+            f"{s['tick_us_max']:>9.1f}"
+        )
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Torneo sin ventana de las estrategias del rival.")
+    parser.add_argument("--games", type=int, default=10, help="partidas por estrategia y escenario")
+    parser.add_argument("--strategies", default=",".join(STRATEGIES),
+                        help="estrategias separadas por coma (por defecto todas); "
+                             "unir con + para enfrentarlas en la misma partida")
+    parser.add_argument("--rivals", type=int, default=None,
+                        help="rivales por partida (por defecto uno por estrategia)")
+    parser.add_argument("--map", action="append", dest="maps", help="JSON del mapa (se puede repetir)")
+    parser.add_argument("--jobs", action="append", help="JSON de pedidos (se puede repetir)")
+    parser.add_argument("--weather", help="JSON de transiciones de clima")
+    parser.add_argument("--seed", type=int, default=0, help="semilla de la primera partida")
+    parser.add_argument("--duration", type=float, default=GAME_DURATION, help="segundos de juego")
+    parser.add_argument("--workers", type=int, default=None, help="procesos (por defecto uno por núcleo)")
+    parser.add_argument("--json", help="guarda los resultados de cada partida en este archivo")
+    args = parser.parse_args(argv)
+
+    lineups = [s.strip().lower() for s in args.strategies.split(",") if s.strip()]
+    unknown = [name for lineup in lineups for name in lineup.split("+") if name not in STRATEGIES]
+    if unknown:
+        parser.error(f"estrategias desconocidas: {', '.join(unknown)}")
+
+    scenarios = load_scenarios(args.maps, args.jobs, args.weather)
+    start = time.perf_counter()
+    results = run_tournament(scenarios, lineups, args.games, args.seed, args.duration,
+                             args.workers, args.rivals)
+    elapsed = time.perf_counter() - start
+
+    print(format_report(summarize(results)))
+    print(f"\n{len(lineups) * len(scenarios) * args.games} partidas en {elapsed:.1f} s")
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
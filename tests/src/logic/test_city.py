@@ -0,0 +1,52 @@
+import pytest
+from src.logic.city import City
+
+
+@pytest.fixture
+def city():
+    map_data = {
+        "version": "1.0",
+        "width": 4,
+        "height": 3,
+        "tiles": [
+            ["C", "C", "B", "C"],
+            ["C", "P", "B", "C"],
+            ["C", "C", "C", "X"],
+        ],
+        "legend": {
+            "C": {"name": "calle", "surface_weight": 1.00},
+            "P": {"name": "parque", "surface_weight": 0.95},
+            "B": {"name": "edificio", "blocked": True},
+        },
+        "goal": 1000,
+    }
+    return City(map_data)
+
+
+def test_packed_grid_size(city):
+    assert len(city.blocked) == city.width * city.height
+    assert len(city.surface) == city.width * city.height
+
+
+def test_is_blocked(city):
+    assert not city.is_blocked(0, 0)
+    assert city.is_blocked(2, 0)
+    assert city.is_blocked(2, 1)
+    # Tile sin leyenda y fuera del mapa se consideran bloqueados
+    assert city.is_blocked(3, 2)
+    assert city.is_blocked(-1, 0)
+    assert city.is_blocked(4, 0)
+
+
+def test_surface_weight(city):
+    assert city.get_surface_weight(0, 0) == 1.0
+    assert city.get_surface_weight(1, 1) == pytest.approx(0.95)
+    assert city.get_surface_weight(10, 10) == 1.0
+
+
+def test_packed_grid_matches_tiles(city):
+    for y in range(city.height):
+        for x in range(city.width):
+            tile = city.get_tile(x, y)
+            expected = city.legend.get(tile, {"blocked": True}).get("blocked", False)
+            assert city.blocked[city.index(x, y)] == int(expected)
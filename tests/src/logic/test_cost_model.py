@@ -0,0 +1,70 @@
+import pytest
+from src.logic.city import City
+from src.logic.cost_model import CostModel
+from src.logic.path_service import PathService, astar
+
+
+@pytest.fixture
+def city():
+    # Un parque (P) en el centro: atravesarlo es más corto pero más lento
+    rows = [
+        "CCCCC",
+        "CPPPC",
+        "CPPPC",
+        "CPPPC",
+        "CCCCC",
+    ]
+    return City({
+        "width": 5,
+        "height": 5,
+        "tiles": [list(r) for r in rows],
+        "legend": {
+            "C": {"surface_weight": 1.0},
+            "P": {"surface_weight": 0.4},
+            "B": {"blocked": True},
+        },
+        "goal": 1000,
+    })
+
+
+def test_tile_costs(city):
+    model = CostModel(city)
+    assert model.tile_cost(0, 0) == 1.0
+    assert model.tile_cost(2, 2) == pytest.approx(2.5)
+    assert model.tile_cost(-1, 0) == float("inf")
+    assert model.min_tile_cost == 1.0
+    assert not model.is_uniform()
+
+
+def test_astar_avoids_slow_surface(city):
+    model = CostModel(city)
+    path = astar(model, (2, 0), (2, 4))
+    # Por el parque: 3 tiles lentos + 1 calle = 8.5; rodeando: 8 tiles de calle = 8.0
+    assert model.path_cost(path) == pytest.approx(8.0)
+    assert (2, 2) not in path
+    model_fast_park = CostModel(city)
+    model_fast_park.tile_costs[city.index(2, 2)] = 1.0
+    model_fast_park.tile_costs[city.index(2, 1)] = 1.0
+    model_fast_park.tile_costs[city.index(2, 3)] = 1.0
+    assert len(astar(model_fast_park, (2, 0), (2, 4))) == 4
+
+
+def test_weather_scales_time_not_route(city):
+    model = CostModel(city, speed_factor=3.0, weather_mult=1.0)
+    path = astar(model, (0, 0), (4, 4))
+    clear_time = model.travel_time(path)
+    model.set_weather(0.75)
+    assert astar(model, (0, 0), (4, 4)) == path
+    assert model.travel_time(path) == pytest.approx(clear_time / 0.75)
+
+
+def test_service_epoch_follows_model_version(city):
+    service = PathService(city)
+    service.find_path((0, 0), (4, 4))
+    service.update_weather(0.8)
+    service.find_path((0, 0), (4, 4))
+    assert service.cost_epoch == 0
+    assert service.hits == 1
+    service.cost_model.rebuild()
+    service.find_path((0, 0), (4, 4))
+    assert service.cost_epoch == 1
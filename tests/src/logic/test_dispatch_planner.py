@@ -0,0 +1,142 @@
+import itertools
+import math
+
+from src.logic.city import City
+from src.logic.cost_model import CostModel
+from src.logic.dispatch_planner import DispatchPlanner, Stop
+from src.logic.distance_index import DistanceIndex
+from src.logic.order import Order
+
+
+def _order(order_id, pickup, dropoff, payout=100, deadline=1000.0, weight=1):
+    return Order(order_id, list(pickup), list(dropoff), payout, deadline, weight, 0, 0)
+
+
+def _manhattan(a, b):
+    return abs(a[0] - b[0]) + abs(a[1] - b[1])
+
+
+def _route(plan):
+    return [(stop.order.id, "P" if stop.pickup else "D") for stop in plan.stops]
+
+
+def _assert_valid(plan, carried=(), max_weight=10):
+    """Cada recogida va antes de su entrega y nunca se excede el peso."""
+    load = sum(order.weight for order in carried)
+    picked = set()
+    for stop in plan.stops:
+        if stop.pickup:
+            picked.add(stop.order.id)
+            load += stop.order.weight
+        else:
+            assert stop.order.id in picked or stop.order in carried
+            load -= stop.order.weight
+        assert load <= max_weight
+
+
+def test_bundles_orders_along_the_same_way():
+    planner = DispatchPlanner(_manhattan)
+    a = _order("A", (1, 0), (9, 0))
+    b = _order("B", (2, 0), (8, 0))
+    plan = planner.plan((0, 0), 0.0, [], [a, b])
+    assert _route(plan) == [("A", "P"), ("B", "P"), ("B", "D"), ("A", "D")]
+    assert plan.cost == 9
+    assert plan.value == 200 - 9
+
+
+def test_respects_weight_capacity():
+    planner = DispatchPlanner(_manhattan, max_weight=10)
+    a = _order("A", (1, 0), (5, 0), weight=6)
+    b = _order("B", (2, 0), (6, 0), weight=6)
+    plan = planner.plan((0, 0), 0.0, [], [a, b])
+    _assert_valid(plan)
+    assert len(plan.new_orders()) == 2
+    # Con lo que ya se lleva solo cabe uno
+    carried = _order("C", (0, 0), (3, 0), weight=3)
+    plan = planner.plan((0, 0), 0.0, [carried], [a, b], load=3)
+    _assert_valid(plan, [carried])
+
+
+def test_skips_orders_that_would_arrive_late():
+    planner = DispatchPlanner(_manhattan, seconds_per_unit=1.0)
+    on_time = _order("A", (1, 0), (4, 0), deadline=10.0)
+    late = _order("B", (0, 5), (0, 30), payout=500, deadline=20.0)
+    plan = planner.plan((0, 0), 0.0, [], [on_time, late])
+    assert [order.id for order in plan.new_orders()] == ["A"]
+    assert plan.lateness == 0
+
+
+def test_new_orders_do_not_delay_carried_deliveries():
+    planner = DispatchPlanner(_manhattan, seconds_per_unit=1.0)
+    carried = _order("C", (0, 0), (5, 0), deadline=6.0)
+    detour = _order("D", (0, 4), (0, 8), payout=5)
+    plan = planner.plan((0, 0), 0.0, [carried], [detour])
+    assert _route(plan)[0] == ("C", "D")
+    assert plan.lateness == 0
+
+
+def test_load_factor_makes_heavy_detours_expensive():
+    heavy = _order("H", (1, 0), (9, 0), payout=20, weight=8)
+    light = _order("L", (1, 0), (9, 0), payout=20, weight=2)
+    free = DispatchPlanner(_manhattan)
+    assert free.plan((0, 0), 0.0, [], [heavy]).new_orders() == [heavy]
+    planner = DispatchPlanner(_manhattan, load_factor=0.4, free_load=3)
+    # Con 5 de peso extra los 8 tiles cargados cuestan el triple: 1 + 8 * 3 > 20
+    assert planner.plan((0, 0), 0.0, [], [heavy]).new_orders() == []
+    plan = planner.plan((0, 0), 0.0, [], [light])
+    assert plan.new_orders() == [light] and plan.cost == 9
+
+
+def test_horizon_limits_new_orders():
+    planner = DispatchPlanner(_manhattan)
+    order = _order("A", (1, 0), (20, 0))
+    assert planner.plan((0, 0), 0.0, [], [order], horizon_ts=10.0).new_orders() == []
+    assert planner.plan((0, 0), 0.0, [], [order], horizon_ts=30.0).new_orders() == [order]
+
+
+def test_local_search_matches_best_order_of_deliveries():
+    planner = DispatchPlanner(_manhattan)
+    carried = [
+        _order("A", (0, 0), (7, 7)),
+        _order("B", (0, 0), (1, 1)),
+        _order("C", (0, 0), (7, 0)),
+        _order("D", (0, 0), (0, 7)),
+        _order("E", (0, 0), (4, 4)),
+    ]
+    plan = planner.plan((0, 0), 0.0, carried, [])
+    best = min(
+        sum(_manhattan(a, b) for a, b in zip([(0, 0)] + [o.dropoff for o in perm],
+                                             [o.dropoff for o in perm]))
+        for perm in itertools.permutations(carried)
+    )
+    assert plan.cost == best
+    assert sorted(stop.order.id for stop in plan.stops) == ["A", "B", "C", "D", "E"]
+
+
+def test_plan_advances_and_uses_grid_distances():
+    city = City({
+        "width": 5, "height": 3,
+        "tiles": [list("CCBCC"), list("CCBCC"), list("CCCCC")],
+        "legend": {"C": {"surface_weight": 1.0}, "B": {"blocked": True}},
+        "goal": 1000,
+    })
+    index = DistanceIndex(CostModel(city))
+    order = _order("A", (1, 0), (3, 0))
+    index.add_order(order)
+    planner = DispatchPlanner(lambda a, b: index.distance(b, a))
+    plan = planner.plan((0, 0), 0.0, [], [order])
+    # La pared obliga a bajar hasta la fila 2: 1 + 6 en vez de 1 + 2
+    assert plan.cost == 7
+    assert plan.next_stop.pos == (1, 0)
+    assert plan.advance().pos == (3, 0)
+    assert plan.advance() is None and len(plan) == 0
+
+
+def test_unreachable_carried_order_stays_in_plan():
+    blocked = (9, 9)
+    planner = DispatchPlanner(lambda a, b: math.inf if b == blocked else _manhattan(a, b))
+    stuck = _order("S", (0, 0), blocked)
+    plan = planner.plan((0, 0), 0.0, [stuck], [_order("A", (1, 0), (2, 0))])
+    assert [stop.order.id for stop in plan.stops] == ["S"]
+    assert plan.cost == math.inf
+    assert repr(Stop(stuck, False)) == "Stop(S, dropoff, (9, 9))"
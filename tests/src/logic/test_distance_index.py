@@ -0,0 +1,120 @@
+import math
+import pytest
+from src.logic.city import City, OrderManager
+from src.logic.cost_model import CostModel
+from src.logic.distance_index import DistanceIndex, distance_field
+from src.logic.path_service import astar
+
+
+def _city(rows, park_weight=0.5):
+    return City({
+        "width": len(rows[0]),
+        "height": len(rows),
+        "tiles": [list(r) for r in rows],
+        "legend": {
+            "C": {"surface_weight": 1.0},
+            "P": {"surface_weight": park_weight},
+            "B": {"blocked": True},
+        },
+        "goal": 1000,
+    })
+
+
+@pytest.fixture
+def city():
+    return _city([
+        "CCCBCCC",
+        "CPCBCPC",
+        "CCCBCCC",
+        "CCCCCCC",
+    ])
+
+
+def test_field_matches_astar(city):
+    model = CostModel(city)
+    target = (6, 0)
+    field = distance_field(model, target)
+    for y in range(city.height):
+        for x in range(city.width):
+            if city.is_blocked(x, y):
+                assert field[city.index(x, y)] == math.inf
+                continue
+            expected = model.path_cost(astar(model, (x, y), target))
+            assert field[city.index(x, y)] == pytest.approx(expected)
+
+
+def test_uniform_field_uses_manhattan_around_walls():
+    city = _city(["CCBCC", "CCBCC", "CCCCC"])
+    field = distance_field(CostModel(city), (4, 0))
+    assert field[city.index(0, 0)] == 8
+
+
+def test_order_manager_indexes_released_orders(city):
+    orders = [
+        {"id": "A", "pickup": [0, 0], "dropoff": [6, 0], "release_time": 0},
+        {"id": "B", "pickup": [0, 0], "dropoff": [4, 3], "release_time": 50},
+    ]
+    index = DistanceIndex(CostModel(city))
+    manager = OrderManager(orders, index)
+
+    manager.update_available(0)
+    assert (0, 0) in index and (6, 0) in index
+    # Rodea el muro: distancia real 12, Manhattan sería 6
+    assert manager.travel_distance((6, 0), (0, 0)) == 12
+
+    manager.update_available(60)
+    assert len(index) == 3
+    manager.remove_order("A")
+    assert (6, 0) not in index
+    assert (0, 0) in index  # todavía lo usa el pedido B
+    # Sin tabla: se usa Manhattan
+    assert manager.travel_distance((6, 0), (0, 0)) == 6
+
+
+def test_deferred_index_builds_fields_under_a_budget(city):
+    orders = [{"id": "A", "pickup": [0, 0], "dropoff": [6, 0], "release_time": 0}]
+    model = CostModel(city)
+    index = DistanceIndex(model, deferred=True)
+    manager = OrderManager(orders, index)
+
+    manager.update_available(0)
+    assert (6, 0) in index and not index.is_ready((6, 0))
+    assert index.pending() == 2
+    # Mientras el campo no está listo se usa Manhattan
+    assert manager.travel_distance((6, 0), (0, 0)) == 6
+
+    assert index.build(max_nodes=5) == 0
+    while index.pending():
+        index.build(max_nodes=5)
+    assert manager.travel_distance((6, 0), (0, 0)) == 12
+    assert index.field((6, 0)) == distance_field(model, (6, 0))
+
+    # Un cambio de costos vuelve a encolar los campos en vez de recalcularlos en el acto
+    generation = index.generation
+    city.set_tile(3, 3, "B")
+    model.update_tiles([(3, 3)])
+    assert manager.travel_distance((6, 0), (0, 0)) == 6
+    assert index.generation > generation and index.pending() == 2
+    index.build()
+    assert manager.travel_distance((6, 0), (0, 0)) == math.inf
+
+
+def test_released_tiles_are_skipped_in_the_queue(city):
+    index = DistanceIndex(CostModel(city), deferred=True)
+    index.add((6, 0))
+    index.add((0, 3))
+    index.release((6, 0))
+    assert index.pending() == 1
+    assert index.build() == 1
+    assert index.is_ready((0, 3)) and not index.is_ready((6, 0))
+
+
+def test_pending_counts_requeued_tiles_once(city):
+    index = DistanceIndex(CostModel(city), deferred=True)
+    index.add((6, 0))
+    index.release((6, 0))
+    index.add((6, 0))
+    assert len(index._queue) == 2 and index.pending() == 1
+    generation = index.generation
+    assert index.build() == 1
+    assert index.ready_since(generation) == [(6, 0)]
@@ -0,0 +1,114 @@
+import random
+import pytest
+from src.logic.city import City
+from src.logic.cost_model import CostModel
+from src.logic.dstar_lite import DStarLite
+from src.logic.path_service import PathService, astar
+
+
+def _city(seed, size):
+    rng = random.Random(seed)
+    tiles = [[rng.choice("CCCCCCPB") for _ in range(size)] for _ in range(size)]
+    return City({
+        "width": size,
+        "height": size,
+        "tiles": tiles,
+        "legend": {
+            "C": {"surface_weight": 1.0},
+            "P": {"surface_weight": 0.5},
+            "B": {"blocked": True},
+        },
+        "goal": 1000,
+    })
+
+
+@pytest.mark.parametrize("seed", [1, 2, 3])
+def test_dstar_lite_matches_astar_under_changes(seed):
+    city = _city(seed, 20)
+    model = CostModel(city)
+    rng = random.Random(seed)
+    walkable = [(x, y) for y in range(20) for x in range(20) if not city.is_blocked(x, y)]
+    start, goal = rng.sample(walkable, 2)
+    planner = DStarLite(model, start, goal)
+    position = start
+
+    for _ in range(10):
+        path = planner.plan(position)
+        expected = astar(model, position, goal)
+        assert model.path_cost(path) == pytest.approx(model.path_cost(expected))
+        assert bool(path) == bool(expected)
+        if len(path) > 1:
+            position = path[0]
+
+        changed = []
+        for _ in range(3):
+            tile = (rng.randrange(20), rng.randrange(20))
+            if tile not in (position, goal):
+                city.set_tile(*tile, rng.choice("CPB"))
+                changed.append(tile)
+        model.update_tiles(changed)
+
+
+def _open_city(size):
+    return City({
+        "width": size, "height": size,
+        "tiles": [["C"] * size for _ in range(size)],
+        "legend": {"C": {"surface_weight": 1.0}, "P": {"surface_weight": 0.5}, "B": {"blocked": True}},
+        "goal": 1000,
+    })
+
+
+def test_repair_is_cheaper_than_new_search():
+    # Cuadras de 3x3 separadas por calles; el bloqueo ocurre cerca del agente
+    city = _open_city(40)
+    for y in range(40):
+        for x in range(40):
+            if x % 4 != 0 and y % 4 != 0:
+                city.set_tile(x, y, "B")
+    model = CostModel(city)
+    goal = (36, 36)
+    planner = DStarLite(model, (0, 0), goal)
+    path = planner.plan((0, 0))
+    position = path[3]
+    blocked_tile = path[6]
+
+    city.set_tile(*blocked_tile, "B")
+    model.update_tiles([blocked_tile])
+    before = planner.expansions
+    repaired = planner.plan(position)
+    assert blocked_tile not in repaired
+    assert repaired[-1] == goal
+    assert model.path_cost(repaired) == pytest.approx(model.path_cost(astar(model, position, goal)))
+
+    fresh = DStarLite(model, position, goal)
+    fresh.plan(position)
+    assert planner.expansions - before < fresh.expansions / 2
+
+
+def test_changes_since():
+    city = _open_city(10)
+    model = CostModel(city)
+    version = model.version
+    assert model.changes_since(version) == set()
+    city.set_tile(1, 1, "B")
+    model.update_tiles([(1, 1)])
+    city.set_tile(2, 2, "P")
+    model.update_tiles([(2, 2)])
+    assert model.changes_since(version) == {(1, 1), (2, 2)}
+    assert not model.is_uniform()
+    assert model.changes_since(version - 1) is None
+    model.rebuild()
+    assert model.changes_since(version) is None
+
+
+def test_service_repair_path_keeps_planner_per_agent():
+    city = _city(5, 15)
+    service = PathService(city)
+    agent = object.__new__(type("Agent", (), {}))
+    walkable = [(x, y) for y in range(15) for x in range(15) if not city.is_blocked(x, y)]
+    start, goal = walkable[0], walkable[-1]
+    first = service.repair_path(agent, start, goal)
+    planner = service._planners[agent]
+    second = service.repair_path(agent, start, goal)
+    assert service._planners[agent] is planner
+    assert first == second
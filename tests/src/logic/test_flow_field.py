@@ -0,0 +1,160 @@
+import math
+import pytest
+from src.logic.city import City
+from src.logic.cost_model import CostModel
+from src.logic.flow_field import FlowField, FlowFieldCache
+from src.logic.path_service import PathService, astar
+
+
+def _city(rows):
+    return City({
+        "width": len(rows[0]),
+        "height": len(rows),
+        "tiles": [list(r) for r in rows],
+        "legend": {
+            "C": {"surface_weight": 1.0},
+            "P": {"surface_weight": 0.4},
+            "B": {"blocked": True},
+        },
+        "goal": 1000,
+    })
+
+
+@pytest.fixture
+def city():
+    return _city([
+        "CCCBCCC",
+        "CPCBCPC",
+        "CCCBCCC",
+        "CCCCCCC",
+    ])
+
+
+def test_path_from_matches_astar_cost(city):
+    model = CostModel(city)
+    goal = (6, 0)
+    field = FlowField(model, goal)
+    for y in range(city.height):
+        for x in range(city.width):
+            if city.is_blocked(x, y) or (x, y) == goal:
+                continue
+            path = field.path_from((x, y))
+            assert path[-1] == goal
+            assert model.path_cost(path) == pytest.approx(model.path_cost(astar(model, (x, y), goal)))
+
+
+def test_next_step_is_adjacent_and_descends(city):
+    model = CostModel(city)
+    field = FlowField(model, (6, 0))
+    pos = (0, 0)
+    step = field.next_step(pos)
+    assert abs(step[0] - pos[0]) + abs(step[1] - pos[1]) == 1
+    assert field.cost(step) < field.cost(pos)
+    assert field.next_step((6, 0)) is None
+
+
+def test_unreachable_and_out_of_bounds():
+    city = _city([
+        "CBC",
+        "CBC",
+    ])
+    field = FlowField(CostModel(city), (2, 0))
+    assert field.next_step((0, 0)) is None
+    assert field.cost((0, 0)) == math.inf
+    assert field.path_from((0, 0)) == []
+    assert field.next_step((9, 9)) is None
+
+
+def test_cache_shares_and_evicts(city):
+    cache = FlowFieldCache(CostModel(city), max_fields=2)
+    first = cache.get((6, 0))
+    assert cache.get((6, 0)) is first
+    cache.get((0, 3))
+    cache.get((0, 0))
+    assert len(cache) == 2
+    assert (6, 0) not in cache
+    assert cache.hits == 1 and cache.misses == 3
+
+
+def test_cache_rebuilds_on_cost_change(city):
+    model = CostModel(city)
+    cache = FlowFieldCache(model)
+    before = cache.get((6, 0))
+    city.set_tile(3, 3, "B")
+    model.update_tiles([(3, 3)])
+    after = cache.get((6, 0))
+    assert after is not before
+    assert after.next_step((0, 0)) is None
+
+
+def test_service_flow_step(city):
+    service = PathService(city)
+    assert service.flow_step((5, 0), (6, 0)) == (6, 0)
+    assert service.flow_step([6, 0], (6, 0)) is None
+    assert service.stats()["flow_fields"] == 1
+    service.invalidate()
+    assert service.stats()["flow_fields"] == 0
+
+
+class _Agent:
+    pass
+
+
+def test_shared_field_needs_two_agents_and_a_ready_table(city):
+    from src.logic.distance_index import DistanceIndex
+    service = PathService(city)
+    index = DistanceIndex(service.cost_model, deferred=True)
+    service.attach_distance_index(index)
+    goal = (6, 0)
+    index.add(goal)
+    first, second = _Agent(), _Agent()
+
+    service.head_to(first, goal)
+    assert service.shared_flow_field(goal) is None
+    service.head_to(second, goal)
+    # La tabla aún no está lista: no se calcula nada en el momento
+    assert service.shared_flow_field(goal) is None
+    assert service.stats()["flow_fields"] == 0
+
+    index.build()
+    field = service.shared_flow_field(goal)
+    assert field.integration is index.field(goal)
+    assert field.next_step((5, 0)) == (6, 0)
+    service.leave(second)
+    assert service.shared_flow_field(goal) is None
+    service.head_to(first, (0, 0))
+    service.head_to(second, goal)
+    assert service.shared_flow_field(goal) is None
+
+
+def test_rivals_to_the_same_goal_share_the_field():
+    from src.logic.simulation import Simulation
+    from src.logic.weather import Weather
+    map_data = {
+        "width": 8, "height": 4,
+        "tiles": [list("CCCBCCCC"), list("CCCBCCCC"), list("CCCBCCCC"), list("CCCCCCCC")],
+        "legend": {"C": {"surface_weight": 1.0}, "B": {"blocked": True}},
+        "goal": 1000,
+    }
+    simulation = Simulation(map_data, [], Weather("clear", {"clear": {"clear": 1}}), "hard",
+                            seed=1, rival_count=2)
+    goal = (7, 0)
+    simulation.order_manager.distance_index.add(goal)
+    simulation.order_manager.distance_index.build()
+    first, second = (rival.strategy for rival in simulation.rivals)
+    first._request_path((0, 0), goal)
+    assert first.flow_goal is None and first._route_goal() == goal
+    second._request_path((second.rival.x, second.rival.y), goal)
+    assert second.flow_goal == goal and second.pending_path is None
+
+    rival = second.rival
+    for _ in range(40):
+        move = second._follow_route()
+        if move is None:
+            break
+        rival.x += move[0]
+        rival.y += move[1]
+        assert not simulation.city.is_blocked(rival.x, rival.y)
+    assert (rival.x, rival.y) == goal and second.flow_goal is None
+    second._cancel_path()
+    assert simulation.path_service.shared_flow_field(goal) is None
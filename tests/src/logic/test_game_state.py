@@ -0,0 +1,22 @@
+from src.logic.game_state import GameState
+from src.logic.inventory import Inventory
+from src.logic.order import Order
+from src.logic.player import Player
+
+
+def test_saved_inventory_keeps_every_order_field(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    state = GameState()
+    player = Player(0, 0, 1000)
+    inventory = Inventory()
+    order = Order("A", (1, 2), (3, 4), 150, "2025-09-01T12:10:00", 2, 1, 45)
+    inventory.add_order(order)
+
+    state.save_game(1, player, inventory, {"elapsed_time": 10.0}, "Ana")
+    loaded = [Order.from_dict(data) for data in state.load_game(1)["inventory"]]
+
+    assert len(loaded) == 1
+    restored = loaded[0]
+    for field in ("id", "pickup", "dropoff", "payout", "deadline", "deadline_ts",
+                  "weight", "priority", "release_time"):
+        assert getattr(restored, field) == getattr(order, field)
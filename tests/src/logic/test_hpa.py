@@ -0,0 +1,114 @@
+import random
+import pytest
+from src.logic.city import City
+from src.logic.cost_model import CostModel
+from src.logic.hpa import HierarchicalPathfinder
+from src.logic.path_service import PathService, astar
+
+
+@pytest.fixture
+def city():
+    rng = random.Random(7)
+    size = 40
+    tiles = []
+    for y in range(size):
+        row = []
+        for x in range(size):
+            if x % 5 in (2, 3) and y % 5 in (2, 3):
+                row.append("B")
+            elif rng.random() < 0.1:
+                row.append("P")
+            else:
+                row.append("C")
+        tiles.append(row)
+    # Muro con un solo hueco para forzar rodeos entre clusters
+    for y in range(size):
+        if y != 35:
+            tiles[y][20] = "B"
+    return City({
+        "width": size,
+        "height": size,
+        "tiles": tiles,
+        "legend": {
+            "C": {"surface_weight": 1.0},
+            "P": {"surface_weight": 0.5},
+            "B": {"blocked": True},
+        },
+        "goal": 1000,
+    })
+
+
+def _assert_valid(city, start, goal, path):
+    prev = start
+    for step in path:
+        assert abs(step[0] - prev[0]) + abs(step[1] - prev[1]) == 1
+        assert not city.is_blocked(*step)
+        prev = step
+    assert path[-1] == goal
+
+
+def test_hpa_paths_are_valid_and_near_optimal(city):
+    model = CostModel(city)
+    hierarchy = HierarchicalPathfinder(model, cluster_size=8)
+    rng = random.Random(1)
+    walkable = [(x, y) for y in range(city.height) for x in range(city.width)
+                if not city.is_blocked(x, y)]
+    for _ in range(25):
+        start, goal = rng.sample(walkable, 2)
+        optimal = astar(model, start, goal)
+        path = hierarchy.find_path(start, goal)
+        _assert_valid(city, start, goal, path)
+        assert model.path_cost(path) <= model.path_cost(optimal) * 1.5
+
+
+def test_hpa_crosses_wall_through_gap(city):
+    model = CostModel(city)
+    hierarchy = HierarchicalPathfinder(model, cluster_size=8)
+    path = hierarchy.find_path((0, 0), (39, 0))
+    _assert_valid(city, (0, 0), (39, 0), path)
+    assert (20, 35) in path
+
+
+def test_hpa_unreachable_and_trivial(city):
+    hierarchy = HierarchicalPathfinder(CostModel(city), cluster_size=8)
+    assert hierarchy.find_path((0, 0), (20, 0)) == []  # meta bloqueada
+    assert hierarchy.find_path((0, 0), (0, 0)) == []
+
+
+def test_hpa_search_is_resumable(city):
+    hierarchy = HierarchicalPathfinder(CostModel(city), cluster_size=8)
+    search = hierarchy.search((0, 0), (39, 39))
+    steps = 0
+    while not search.step(1):
+        steps += 1
+    assert steps > 1
+    _assert_valid(city, (0, 0), (39, 39), search.path)
+
+
+def test_hpa_is_exact_between_neighbouring_clusters(city):
+    model = CostModel(city)
+    # Con clusters de 20 todos son vecinos y el A* local cubre el mapa
+    hierarchy = HierarchicalPathfinder(model, cluster_size=20)
+    rng = random.Random(3)
+    walkable = [(x, y) for y in range(city.height) for x in range(city.width)
+                if not city.is_blocked(x, y)]
+    for _ in range(25):
+        start, goal = rng.sample(walkable, 2)
+        path = hierarchy.find_path(start, goal)
+        _assert_valid(city, start, goal, path)
+        assert model.path_cost(path) == pytest.approx(model.path_cost(astar(model, start, goal)))
+
+
+def test_path_service_uses_hpa_on_large_maps_only_for_auto(city):
+    service = PathService(city)
+    service.HPA_MIN_AREA = city.width * city.height
+    service.HPA_CLUSTER_SIZE = 8
+    path = service.find_path((0, 0), (39, 39), method="auto")
+    _assert_valid(city, (0, 0), (39, 39), path)
+    assert service.get_hierarchy().node_count() > 0
+    assert ("hpa", (0, 0), (39, 39), 0) in service._cache
+    # Un "astar" explícito sigue siendo óptimo
+    path = service.find_path((0, 0), (39, 39))
+    assert ("astar", (0, 0), (39, 39), 0) in service._cache
+    model = service.cost_model
+    assert model.path_cost(path) == model.path_cost(astar(model, (0, 0), (39, 39)))
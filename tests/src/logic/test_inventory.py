@@ -0,0 +1,130 @@
+import math
+import pickle
+import pytest
+from datetime import datetime, timezone
+from src.logic.inventory import Inventory
+from src.logic.order import Order, parse_deadline
+
+
+def _order(order_id, deadline, weight=1, priority=0):
+    return Order(order_id, [0, 0], [1, 1], 100, deadline, weight, priority, 0)
+
+
+def _ts(text):
+    return datetime.fromisoformat(text).replace(tzinfo=timezone.utc).timestamp()
+
+
+def test_parse_deadline():
+    assert parse_deadline("2025-09-01T12:00:00") == _ts("2025-09-01T12:00:00")
+    assert parse_deadline("2025-09-01T14:00:00+02:00") == _ts("2025-09-01T12:00:00")
+    assert parse_deadline(None) == math.inf
+    assert parse_deadline(12.5) == 12.5
+
+
+def test_pop_expired_returns_only_past_deadlines_in_order():
+    inventory = Inventory()
+    inventory.add_order(_order("late", "2025-09-01T12:10:00"))
+    inventory.add_order(_order("early", "2025-09-01T12:05:00"))
+    inventory.add_order(_order("later", "2025-09-01T12:30:00"))
+
+    assert inventory.pop_expired(_ts("2025-09-01T12:05:00")) == []
+    expired = inventory.pop_expired(_ts("2025-09-01T12:20:00"))
+    assert [o.id for o in expired] == ["early", "late"]
+    assert inventory.next_deadline() == _ts("2025-09-01T12:30:00")
+
+
+def test_removed_orders_are_skipped():
+    inventory = Inventory()
+    inventory.add_order(_order("A", "2025-09-01T12:05:00"))
+    inventory.add_order(_order("B", "2025-09-01T12:06:00"))
+    inventory.complete_current_order()
+    inventory.remove_order_by_id("B")
+    assert inventory.pop_expired(_ts("2025-09-01T13:00:00")) == []
+    assert inventory.next_deadline() is None
+
+
+def test_order_is_immutable_and_picklable():
+    order = Order("A", [1, 2], [3, 4], 100, "2025-09-01T12:00:00", 2, 1, 5)
+    assert order.pickup == (1, 2) and order.dropoff == (3, 4)
+    with pytest.raises(AttributeError):
+        order.payout = 0
+    with pytest.raises(AttributeError):
+        order.extra = 1
+    clone = pickle.loads(pickle.dumps(order))
+    assert (clone.id, clone.pickup, clone.deadline_ts, clone.release_time) == \
+        (order.id, order.pickup, order.deadline_ts, 5.0)
+    assert Order.from_dict(order) is order
+    assert Order.from_dict(order.to_dict()).dropoff == (3, 4)
+
+
+def test_remove_by_id_uses_index_and_keeps_links():
+    inventory = Inventory(max_weight=20)
+    for order_id in "ABCD":
+        inventory.add_order(_order(order_id, "2025-09-01T12:05:00"))
+    assert "C" in inventory
+    assert inventory.remove_order_by_id("C")
+    assert not inventory.remove_order_by_id("C")
+    assert "C" not in inventory and inventory.get_order("C") is None
+    ids = []
+    node = inventory.first
+    while node:
+        ids.append(node.order.id)
+        node = node.next
+    assert ids == ["A", "B", "D"]
+    assert inventory.last.prev.order.id == "B"
+
+
+def test_sort_keeps_current_order_and_index():
+    inventory = Inventory(max_weight=20)
+    for order_id, priority in (("A", 0), ("B", 2), ("C", 1)):
+        inventory.add_order(_order(order_id, "2025-09-01T12:05:00", priority=priority))
+    inventory.view_next_order()
+    inventory.sort_inventory(lambda o: o.priority)
+    assert inventory.current_order.order.id == "B"
+    assert inventory.first.order.id == "B"
+    assert inventory.get_order("A").id == "A"
+    inventory.complete_current_order()
+    assert "B" not in inventory
+
+
+def _filled_inventory():
+    inventory = Inventory(max_weight=50)
+    inventory.add_order(Order("A", [0, 0], [1, 1], 100, "2025-09-01T12:30:00", 4, 0, 0))
+    inventory.add_order(Order("B", [0, 0], [1, 1], 300, "2025-09-01T12:10:00", 2, 2, 0))
+    inventory.add_order(Order("C", [0, 0], [1, 1], 150, "2025-09-01T12:20:00", 1, 1, 0))
+    return inventory
+
+
+def test_views_stay_sorted():
+    inventory = _filled_inventory()
+    assert [o.id for o in inventory.orders_by("priority")] == ["B", "C", "A"]
+    assert [o.id for o in inventory.orders_by("deadline")] == ["B", "C", "A"]
+    assert [o.id for o in inventory.orders_by("value")] == ["B", "C", "A"]
+    assert inventory.most_urgent().id == "B"
+    assert inventory.next_by("deadline", "C").id == "A"
+    inventory.remove_order_by_id("B")
+    assert inventory.most_urgent().id == "C"
+    assert inventory.first_by("priority").id == "C"
+
+
+def test_navigation_follows_active_view():
+    inventory = _filled_inventory()
+    inventory.set_view("deadline")
+    assert inventory.current_order.order.id == "A"
+    inventory.view_prev_order()
+    assert inventory.current_order.order.id == "C"
+    inventory.view_prev_order()
+    assert inventory.current_order.order.id == "B"
+    # Al completar, avanza al siguiente de la vista
+    inventory.complete_current_order()
+    assert inventory.current_order.order.id == "C"
+    with pytest.raises(ValueError):
+        inventory.set_view("color")
+
+
+def test_select_makes_order_current():
+    inventory = _filled_inventory()
+    assert inventory.select("C")
+    assert inventory.current_order.order.id == "C"
+    assert inventory.complete_current_order().id == "C"
+    assert not inventory.select("C")
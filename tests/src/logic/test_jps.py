@@ -0,0 +1,61 @@
+import random
+import pytest
+from src.logic.city import City
+from src.logic.cost_model import CostModel
+from src.logic.jps import JumpPointSearch, JumpTable
+from src.logic.path_service import PathService, astar
+
+
+def _random_city(seed, size, density):
+    rng = random.Random(seed)
+    tiles = [["B" if rng.random() < density else "C" for _ in range(size)] for _ in range(size)]
+    return City({
+        "width": size,
+        "height": size,
+        "tiles": tiles,
+        "legend": {
+            "C": {"surface_weight": 1.0},
+            "B": {"blocked": True},
+        },
+        "goal": 1000,
+    })
+
+
+@pytest.mark.parametrize("seed,size,density", [
+    (1, 12, 0.2), (2, 25, 0.3), (3, 40, 0.1), (4, 30, 0.35),
+])
+def test_jps_matches_astar_length(seed, size, density):
+    city = _random_city(seed, size, density)
+    model = CostModel(city)
+    assert model.is_uniform()
+    table = JumpTable(model)
+    rng = random.Random(seed)
+    walkable = [(x, y) for y in range(size) for x in range(size) if not city.is_blocked(x, y)]
+    for _ in range(40):
+        start, goal = rng.sample(walkable, 2)
+        expected = astar(model, start, goal)
+        path = JumpPointSearch(model, start, goal, table).run()
+        assert len(path) == len(expected)
+        prev = start
+        for step in path:
+            assert abs(step[0] - prev[0]) + abs(step[1] - prev[1]) == 1
+            assert not city.is_blocked(*step)
+            prev = step
+
+
+def test_jps_pushes_fewer_nodes_on_open_grid():
+    city = _random_city(0, 60, 0.0)
+    model = CostModel(city)
+    search = JumpPointSearch(model, (0, 0), (59, 59))
+    path = search.run()
+    assert len(path) == 118
+    assert search.heap_pushes < 10
+
+
+def test_service_uses_jps_for_uniform_costs():
+    city = _random_city(5, 20, 0.2)
+    service = PathService(city)
+    assert service._resolve_method("astar") == "jps"
+    assert service._resolve_method("greedy") == "greedy"
+    table = service.get_jump_table()
+    assert service.get_jump_table() is table
@@ -0,0 +1,73 @@
+import logging
+from src.logic.inventory import Inventory
+from src.logic.log import (
+    LOGIC_LOGGER, RingBufferHandler, attach_ring_buffer, configure_console, detach_handler, ring_buffer,
+)
+from src.logic.order import Order
+
+
+def _order(order_id):
+    return Order(order_id, [0, 0], [1, 1], 100, "2025-09-01T12:00:00", 1, 0, 0)
+
+
+def test_ring_buffer_captures_inventory_events():
+    handler = attach_ring_buffer(capacity=2)
+    try:
+        inventory = Inventory()
+        inventory.add_order(_order("A"))
+        inventory.add_order(_order("B"))
+        inventory.complete_current_order()
+        assert handler.messages() == ["Order B added to inventory.", "Order A completed!"]
+        assert handler.records[-1].name == "src.logic.inventory"
+    finally:
+        detach_handler(handler)
+
+
+def test_disabled_level_skips_formatting():
+    class Exploding:
+        def __str__(self):
+            raise AssertionError("no se debe formatear")
+
+    logger = logging.getLogger("src.logic.inventory")
+    handler = RingBufferHandler()
+    logger.addHandler(handler)
+    previous = logger.level
+    logger.setLevel(logging.WARNING)
+    try:
+        logger.info("Order %s added to inventory.", Exploding())
+        assert len(handler.records) == 0
+    finally:
+        logger.setLevel(previous)
+        logger.removeHandler(handler)
+
+
+def test_detach_restores_the_logger_level():
+    logger = logging.getLogger(LOGIC_LOGGER)
+    previous = logger.level
+    logger.setLevel(logging.WARNING)
+    try:
+        with ring_buffer() as handler:
+            assert logger.level == logging.DEBUG
+            assert handler in logger.handlers
+        assert logger.level == logging.WARNING
+        assert handler not in logger.handlers
+        assert not logger.isEnabledFor(logging.INFO)
+    finally:
+        logger.setLevel(previous)
+
+
+def test_debug_records_only_reach_the_ring_buffer():
+    logger = logging.getLogger("src.logic.inventory")
+    console = configure_console(logging.INFO)
+    shown = RingBufferHandler()  # hace las veces de la terminal
+    console.emit = shown.emit
+    try:
+        with ring_buffer() as handler:
+            logger.debug("solo en el buffer")
+            logger.info("en ambos")
+        logger.debug("en ninguno")
+        assert [r.getMessage() for r in handler.records] == ["solo en el buffer", "en ambos"]
+        assert [r.getMessage() for r in shown.records] == ["en ambos"]
+        assert console.level == logging.NOTSET
+    finally:
+        detach_handler(console)
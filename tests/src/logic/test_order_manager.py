@@ -0,0 +1,87 @@
+from src.logic.city import OrderManager
+from src.logic.order import Order
+
+
+def _order(order_id, release_time, pickup=(0, 0)):
+    return {
+        "id": order_id,
+        "pickup": list(pickup),
+        "dropoff": [1, 1],
+        "payout": 100,
+        "deadline": "2025-09-01T12:10:00",
+        "weight": 1,
+        "priority": 0,
+        "release_time": release_time,
+    }
+
+
+def test_releases_only_due_orders_in_release_order():
+    manager = OrderManager([_order("C", 30), _order("A", 0), _order("B", 10)])
+    manager.update_available(0)
+    assert [o.id for o in manager.get_available()] == ["A"]
+    assert manager.next_release_time() == 10
+    manager.update_available(45)
+    assert [o.id for o in manager.get_available()] == ["A", "B", "C"]
+    assert manager.next_release_time() is None
+
+
+def test_release_is_idempotent_and_removal_sticks():
+    manager = OrderManager([_order("A", 0), _order("B", 0)])
+    manager.update_available(5)
+    manager.remove_order("A")
+    manager.update_available(10)
+    assert [o.id for o in manager.get_available()] == ["B"]
+
+
+def test_duplicate_ids_released_once():
+    manager = OrderManager([_order("A", 0), _order("A", 5)])
+    manager.update_available(10)
+    assert len(manager.get_available()) == 1
+
+
+def test_lookup_and_removal_by_id():
+    manager = OrderManager([_order("A", 0), _order("B", 0), _order("C", 0)])
+    manager.update_available(0)
+    assert manager.is_available("B")
+    assert manager.get_order("B").id == "B"
+    manager.remove_order("B")
+    manager.remove_order("missing")
+    assert not manager.is_available("B")
+    assert manager.get_order("B") is None
+    assert manager.available_count() == 2
+    assert [o.id for o in manager.get_available()[:5]] == ["A", "C"]
+
+
+def test_available_view_is_reused_until_changed():
+    manager = OrderManager([_order("A", 0), _order("B", 5)])
+    manager.update_available(0)
+    view = manager.get_available()
+    assert manager.get_available() is view
+    manager.update_available(5)
+    assert manager.get_available() is not view
+    assert manager.available_orders == manager.get_available()
+
+
+def test_spatial_queries_follow_release_and_removal():
+    manager = OrderManager([
+        _order("A", 0, (2, 2)),
+        _order("B", 0, (2, 2)),
+        _order("C", 0, (10, 3)),
+        _order("D", 50, (1, 2)),
+    ])
+    manager.update_available(0)
+    assert [o.id for o in manager.orders_at((2, 2))] == ["A", "B"]
+    assert [o.id for o in manager.nearest_orders((0, 0), 2)] == ["A", "B"]
+    manager.update_available(50)
+    assert manager.nearest_orders((0, 0), 1)[0].id == "D"
+    manager.remove_order("A")
+    assert [o.id for o in manager.orders_at([2, 2])] == ["B"]
+    assert {o.id for o in manager.orders_within((2, 2), 1)} == {"B", "D"}
+
+
+def test_orders_are_ingested_as_order_objects():
+    manager = OrderManager([_order("A", 3, (4, 5))])
+    order = manager.all_orders[0]
+    assert isinstance(order, Order)
+    assert order.pickup == (4, 5)
+    assert order.release_time == 3.0
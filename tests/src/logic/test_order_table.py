@@ -0,0 +1,214 @@
+import math
+import time
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from src.logic.city import City, OrderManager
+from src.logic.cost_model import CostModel
+from src.logic.distance_index import DistanceIndex
+from src.logic.order import Order
+from src.logic.order_table import OrderTable
+
+
+def _city(rows):
+    return City({
+        "width": len(rows[0]),
+        "height": len(rows),
+        "tiles": [list(r) for r in rows],
+        "legend": {
+            "C": {"surface_weight": 1.0},
+            "P": {"surface_weight": 0.4},
+            "B": {"blocked": True},
+        },
+        "goal": 1000,
+    })
+
+
+def _job(order_id, pickup, dropoff, payout=100, weight=1, release_time=0):
+    return {
+        "id": order_id, "pickup": list(pickup), "dropoff": list(dropoff),
+        "payout": payout, "deadline": "2025-09-01T12:10:00",
+        "weight": weight, "priority": 0, "release_time": release_time,
+    }
+
+
+@pytest.fixture
+def city():
+    return _city([
+        "CCCBCCC",
+        "CPCBCPC",
+        "CCCBCCC",
+        "CCCCCCC",
+    ])
+
+
+def _manager(city, jobs):
+    model = CostModel(city)
+    manager = OrderManager(jobs, DistanceIndex(model), OrderTable(model))
+    manager.update_available(0)
+    return model, manager
+
+
+def test_scores_match_per_order_evaluation(city):
+    jobs = [
+        _job("A", (6, 0), (0, 3), payout=300),
+        _job("B", (1, 1), (2, 0), payout=120),
+        _job("C", (4, 2), (6, 3), payout=200, weight=5),
+    ]
+    model, manager = _manager(city, jobs)
+    table = manager.get_order_table()
+    pos = (0, 0)
+    scores = table.score(pos, pickup_weight=0.5, delivery_weight=0.5,
+                         distance_index=manager.distance_index)
+    for row, order in enumerate(table.orders):
+        expected = order.payout - 0.5 * (
+            manager.travel_distance(order.pickup, pos) + manager.travel_distance(order.dropoff, order.pickup)
+        )
+        assert scores[row] == pytest.approx(expected, abs=1e-4)
+
+
+def test_best_respects_weight_and_reachability(city):
+    jobs = [
+        _job("heavy", (1, 0), (2, 0), payout=500, weight=8),
+        _job("light", (6, 3), (5, 3), payout=100, weight=1),
+    ]
+    model, manager = _manager(city, jobs)
+    table = manager.get_order_table()
+    best, _ = table.best((0, 0), max_weight=5)
+    assert best.id == "light"
+    best, score = table.best((0, 0), max_weight=0)
+    assert best is None and score == -math.inf
+
+
+def test_top_returns_best_viable_orders_in_order(city):
+    jobs = [
+        _job("near", (1, 0), (2, 0), payout=100),
+        _job("rich", (6, 3), (5, 3), payout=400),
+        _job("heavy", (0, 1), (0, 2), payout=900, weight=8),
+        _job("far", (6, 0), (6, 1), payout=50),
+    ]
+    model, manager = _manager(city, jobs)
+    table = manager.get_order_table()
+    top = table.top((0, 0), 2, pickup_weight=0.5, max_weight=5)
+    assert [order.id for order in top] == ["rich", "near"]
+    assert [order.id for order in table.top((0, 0), 10, max_weight=5)] == ["rich", "near", "far"]
+    assert table.top((0, 0), 3, max_weight=0) == []
+
+
+def test_table_follows_order_manager(city):
+    jobs = [_job(f"J{i}", (i, 3), (0, 0)) for i in range(4)]
+    model, manager = _manager(city, jobs)
+    table = manager.order_table
+    manager.remove_order("J1")
+    assert len(table) == 3 and "J1" not in table
+    for row, order in enumerate(table.orders):
+        assert table.pickup_x[row] == order.pickup[0]
+        assert table._rows[order.id] == row
+
+
+def test_delivery_column_refreshes_on_cost_change(city):
+    model, manager = _manager(city, [_job("A", (0, 0), (6, 0))])
+    before = manager.get_order_table().delivery[0]
+    city.set_tile(3, 3, "B")
+    model.update_tiles([(3, 3)])
+    assert manager.get_order_table().delivery[0] == math.inf
+    assert before == 12
+
+
+def test_delivery_column_follows_deferred_fields(city):
+    model = CostModel(city)
+    index = DistanceIndex(model, deferred=True)
+    manager = OrderManager([_job("A", (0, 0), (6, 0))], index, OrderTable(model))
+    manager.update_available(0)
+    assert manager.get_order_table().delivery[0] == 6
+    index.build()
+    assert manager.get_order_table().delivery[0] == 12
+
+
+def test_delivery_refresh_only_reads_new_dropoff_fields(city, monkeypatch):
+    model = CostModel(city)
+    index = DistanceIndex(model, deferred=True)
+    jobs = [_job("A", (0, 0), (6, 0)), _job("B", (1, 0), (6, 0)), _job("C", (0, 3), (0, 0))]
+    manager = OrderManager(jobs, index, OrderTable(model))
+    manager.update_available(0)
+    table = manager.get_order_table()
+    assert list(table.delivery[:3]) == [6, 5, 3]
+
+    def no_per_row_calls(*args):
+        raise AssertionError("la tabla no debe recalcular fila por fila")
+
+    monkeypatch.setattr(manager, "travel_distance", no_per_row_calls)
+    # Al quedar listo el campo de (6, 0) se releen las filas de A y B
+    while not index.is_ready((6, 0)):
+        index.build(max_nodes=1)
+    assert list(manager.get_order_table().delivery[:3]) == [12, 11, 3]
+    index.build()
+    assert list(manager.get_order_table().delivery[:3]) == [12, 11, 3]
+
+
+def test_scoring_ten_thousand_orders_is_fast():
+    model = CostModel(_city(["C" * 100] * 100))
+    index = DistanceIndex(model)
+    table = OrderTable(model)
+    rng = np.random.default_rng(0)
+    pickups = [tuple(int(v) for v in rng.integers(0, 100, 2)) for _ in range(50)]
+    for tile in pickups:
+        index.add(tile)
+    for i in range(10_000):
+        x, y = pickups[i % len(pickups)]
+        dx, dy = (int(v) for v in rng.integers(0, 100, 2))
+        order = Order(i, (x, y), (dx, dy), 100, None, 1, 0, 0)
+        table.add(order, abs(dx - x) + abs(dy - y))
+    table.best((50, 50), pickup_weight=0.5, delivery_weight=0.5, distance_index=index)
+    start = time.perf_counter()
+    for _ in range(20):
+        table.best((50, 50), pickup_weight=0.5, delivery_weight=0.5, distance_index=index)
+    assert (time.perf_counter() - start) / 20 < 0.001
+
+
+def test_scoring_reads_pickup_fields_without_building_any():
+    model = CostModel(_city(["C" * 100] * 100))
+    index = DistanceIndex(model)
+    table = OrderTable(model)
+    rng = np.random.default_rng(1)
+    pickups = [tuple(int(v) for v in rng.integers(0, 100, 2)) for _ in range(20)]
+    for tile in pickups:
+        index.add(tile)
+    for i in range(1000):
+        order = Order(i, pickups[i % len(pickups)], (0, 0), 100, None, 1, 0, 0)
+        table.add(order, 0)
+    fields = len(index)
+    distances = table.pickup_distances((50, 50), index)
+    assert distances[3] == abs(pickups[3][0] - 50) + abs(pickups[3][1] - 50)
+    start = time.perf_counter()
+    for _ in range(20):
+        table.best((50, 50), pickup_weight=0.5, distance_index=index)
+    assert (time.perf_counter() - start) / 20 < 0.002
+    assert len(index) == fields
+
+
+def test_pickup_slots_follow_fields_and_rows(city):
+    model = CostModel(city)
+    index = DistanceIndex(model, deferred=True)
+    table = OrderTable(model)
+    orders = [Order(i, (6, 0), (0, 0), 100, None, 1, 0, 0) for i in range(3)]
+    orders.append(Order(3, (0, 3), (0, 0), 100, None, 1, 0, 0))
+    for order in orders:
+        index.add(order.pickup)
+        table.add(order, 0)
+    # Sin campos listos: Manhattan
+    assert list(table.pickup_distances((0, 0), index)) == [6, 6, 6, 3]
+    index.build()
+    assert list(table.pickup_distances((0, 0), index)) == [12, 12, 12, 3]
+    # Las filas movidas al quitar conservan su slot; un tile sin pedidos lo libera
+    table.remove(0)
+    table.remove(3)
+    assert list(table.pickup_distances((0, 0), index)) == [12, 12]
+    assert (0, 3) not in table._slots
+    # Un cambio de costos descarta los campos: vuelve a Manhattan hasta recalcularlos
+    city.set_tile(3, 3, "B")
+    model.update_tiles([(3, 3)])
+    assert list(table.pickup_distances((0, 0), index)) == [6, 6]
+    index.build()
+    assert list(table.pickup_distances((0, 0), index)) == [math.inf, math.inf]
@@ -0,0 +1,114 @@
+import pytest
+
+from src.logic.city import City
+from src.logic.path_pool import PathWorkerPool
+from src.logic.path_service import PathService
+
+
+@pytest.fixture
+def city():
+    # Muro con un hueco abajo y un parque (más caro) en medio del camino corto
+    rows = [
+        "CCCBCCCC",
+        "CPPBCCCC",
+        "CPPBCCCC",
+        "CCCCCCCC",
+    ]
+    return City({
+        "width": 8,
+        "height": 4,
+        "tiles": [list(r) for r in rows],
+        "legend": {
+            "C": {"surface_weight": 1.0},
+            "P": {"surface_weight": 0.5},
+            "B": {"blocked": True},
+        },
+        "goal": 1000,
+    })
+
+
+@pytest.fixture
+def service(city):
+    service = PathService(city)
+    pool = PathWorkerPool(service.cost_model, workers=2)
+    service.attach_pool(pool)
+    yield service
+    pool.close()
+
+
+def _cost(service, path):
+    return sum(service.cost_model.tile_costs[y * service.city.width + x] for x, y in path)
+
+
+def test_batch_is_resolved_by_the_pool(city, service):
+    queries = [((0, 0), (7, 0)), ((1, 1), (7, 3)), ((0, 3), (4, 0)), ((0, 0), (3, 0))]
+    requests = service.request_batch(queries)
+    assert not any(r.done for r in requests)
+    assert service.pending_count() == 4
+
+    service.flush()
+    service.advance()
+    assert all(r.done and not r.cancelled for r in requests)
+    assert requests[3].path == []  # meta bloqueada
+    reference = PathService(city)
+    for (start, goal), request in zip(queries[:3], requests[:3]):
+        assert request.path[-1] == goal
+        assert _cost(service, request.path) == pytest.approx(_cost(service, reference.find_path(start, goal)))
+    assert service.pending_count() == 0
+
+
+def test_results_are_cached_and_shared(service):
+    first = service.request_path((0, 0), (7, 0))
+    again = service.request_path((0, 0), (7, 0))
+    assert again is first
+    service.flush()
+    service.advance()
+    cached = service.request_path((0, 0), (7, 0))
+    assert cached.done and cached.path == first.path
+    assert service.stats()["hits"] == 1
+
+
+def test_greedy_runs_in_the_pool(service):
+    request = service.request_path((0, 0), (7, 3), method="greedy")
+    service.flush()
+    service.advance()
+    assert request.path[-1] == (7, 3)
+
+
+def test_eager_expansions_are_left_to_the_pool(service):
+    request = service.request_path((0, 0), (1, 0), eager_expansions=100)
+    # Ni las rutas cortas se buscan en el hilo del juego
+    assert not request.done and service.pending_count() == 1
+    service.flush()
+    service.advance()
+    assert request.path == [(1, 0)]
+    assert service._pool.queries == 1
+
+
+def test_invalidate_cancels_batches(city, service):
+    request = service.request_path((0, 0), (7, 0))
+    service.flush()
+    city.set_tile(4, 3, "B")
+    service.cost_model.update_tiles([(4, 3)])
+    service.advance()
+    assert request.cancelled
+    # La siguiente consulta usa la cuadrícula republicada
+    request = service.request_path((0, 0), (7, 0))
+    service.flush()
+    service.advance()
+    assert request.path == []
+
+
+def test_flush_cancels_requests_made_before_a_cost_change(city, service):
+    request = service.request_path((0, 0), (7, 0))
+    city.set_tile(4, 3, "B")
+    service.cost_model.update_tiles([(4, 3)])
+    service.flush()
+    assert request.cancelled
+    assert service._pool.queries == 0
+    # La consulta repetida usa la época y la cuadrícula nuevas
+    request = service.request_path((0, 0), (7, 0))
+    assert request.epoch == service.cost_epoch
+    service.flush()
+    service.advance()
+    assert request.path == []
@@ -0,0 +1,161 @@
+import pytest
+from src.logic.city import City
+from src.logic.path_service import PathService
+
+
+@pytest.fixture
+def city():
+    # 'B' forma un muro con un hueco en la fila inferior
+    rows = [
+        "CCCBCCC",
+        "CCCBCCC",
+        "CCCBCCC",
+        "CCCCCCC",
+    ]
+    return City({
+        "width": 7,
+        "height": 4,
+        "tiles": [list(r) for r in rows],
+        "legend": {
+            "C": {"surface_weight": 1.0},
+            "B": {"blocked": True},
+        },
+        "goal": 1000,
+    })
+
+
+def _is_valid(city, start, path):
+    prev = start
+    for step in path:
+        assert abs(step[0] - prev[0]) + abs(step[1] - prev[1]) == 1
+        assert not city.is_blocked(*step)
+        prev = step
+    return True
+
+
+def test_astar_shortest_path(city):
+    service = PathService(city)
+    path = service.find_path((0, 0), (6, 0))
+    assert path[-1] == (6, 0)
+    assert len(path) == 12  # rodea el muro por la fila 3
+    assert _is_valid(city, (0, 0), path)
+
+
+def test_greedy_path_reaches_goal(city):
+    service = PathService(city)
+    path = service.find_path((0, 0), (6, 0), method="greedy")
+    assert path[-1] == (6, 0)
+    assert _is_valid(city, (0, 0), path)
+
+
+def test_unreachable_goal(city):
+    service = PathService(city)
+    assert service.find_path((0, 0), (3, 0)) == []
+
+
+def test_cache_hits_and_copies(city):
+    service = PathService(city)
+    first = service.find_path((0, 0), (6, 0))
+    first.pop(0)
+    second = service.find_path([0, 0], [6, 0])
+    assert service.hits == 1
+    assert service.misses == 1
+    assert len(second) == 12
+
+
+def test_invalidate_bumps_epoch(city):
+    service = PathService(city)
+    service.find_path((0, 0), (6, 0))
+    service.invalidate()
+    service.find_path((0, 0), (6, 0))
+    assert service.cost_epoch == 1
+    assert service.misses == 2
+
+
+def test_lru_eviction(city):
+    service = PathService(city, cache_size=2)
+    service.find_path((0, 0), (1, 0))
+    service.find_path((0, 0), (2, 0))
+    service.find_path((0, 0), (1, 0))  # refresca la primera
+    service.find_path((0, 0), (0, 1))  # expulsa (2, 0)
+    assert service.stats()["size"] == 2
+    service.find_path((0, 0), (1, 0))
+    assert service.hits == 2
+    service.find_path((0, 0), (2, 0))
+    assert service.misses == 4
+
+
+def test_request_path_resolves_in_slices(city):
+    service = PathService(city)
+    request = service.request_path((0, 0), (6, 0))
+    assert not request.done
+    assert service.pending_count() == 1
+
+    rounds = 0
+    while not request.done:
+        expanded = service.advance(max_expansions=3)
+        assert expanded <= 3
+        rounds += 1
+    assert rounds > 1
+    assert request.path == service.find_path((0, 0), (6, 0))
+    assert service.hits == 1
+
+
+def test_request_path_shares_pending_and_uses_cache(city):
+    service = PathService(city)
+    first = service.request_path((0, 0), (6, 0))
+    second = service.request_path((0, 0), (6, 0))
+    assert first is second
+    service.advance()
+    assert first.done
+    cached = service.request_path((0, 0), (6, 0))
+    assert cached.done and cached.path == first.path
+
+
+def test_eager_request_completes_short_routes(city):
+    service = PathService(city)
+    request = service.request_path((0, 0), (2, 0), eager_expansions=100)
+    assert request.done
+    assert request.path == [(1, 0), (2, 0)]
+    assert service.pending_count() == 0
+
+
+def test_invalidate_cancels_pending(city):
+    service = PathService(city)
+    request = service.request_path((0, 0), (6, 0))
+    service.invalidate()
+    assert request.done and request.cancelled
+    assert service.pending_count() == 0
+
+
+def test_cancel_drops_request_once_nobody_waits(city):
+    service = PathService(city)
+    first = service.request_path((0, 0), (6, 0))
+    shared = service.request_path((0, 0), (6, 0))
+    assert first is shared and first.waiters == 2
+    assert not service.cancel(first)
+    assert service.pending_count() == 1
+    assert service.cancel(shared)
+    assert first.cancelled and service.pending_count() == 0
+    assert service.advance() == 0
+    # Una solicitud nueva ya no reutiliza la cancelada
+    again = service.request_path((0, 0), (6, 0))
+    assert again is not first and not again.done
+
+
+def test_eager_expansions_come_out_of_the_frame_budget(city):
+    service = PathService(city, frame_expansions=3)
+    request = service.request_path((0, 0), (6, 0), method="greedy", eager_expansions=100)
+    assert not request.done
+    assert request.search.expansions == 3
+    # El presupuesto del frame ya se gastó: la siguiente no expande de inmediato
+    other = service.request_path((0, 0), (6, 3), method="greedy", eager_expansions=100)
+    assert other.search.expansions == 0
+    assert service.advance(max_expansions=3) == 0
+    assert service.advance(max_expansions=3) == 3
+
+
+def test_searches_must_implement_step(city):
+    from src.logic.path_service import _ResumableSearch
+    with pytest.raises(TypeError):
+        _ResumableSearch(None, (0, 0), (1, 0))
@@ -0,0 +1,51 @@
+import pytest
+
+from src.logic.rival_scheduler import RivalScheduler
+
+
+def test_staggers_first_turns_across_the_interval():
+    scheduler = RivalScheduler(interval=0.6)
+    scheduler.add_staggered(["a", "b", "c"])
+    assert scheduler.due(0.19) == []
+    assert scheduler.due(0.2) == ["a"]
+    assert scheduler.due(0.4) == ["b"]
+    assert scheduler.due(0.6) == ["c"]
+    assert scheduler.next_turn() == pytest.approx(0.8)
+
+
+def test_each_rival_acts_once_per_interval():
+    scheduler = RivalScheduler(interval=0.5)
+    scheduler.add_staggered(range(10))
+    counts = [0] * 10
+    t = 0.0
+    for _ in range(600):
+        t += 1 / 60
+        for rival in scheduler.due(t):
+            counts[rival] += 1
+    assert all(19 <= c <= 20 for c in counts)
+
+
+def test_max_per_tick_defers_the_rest():
+    scheduler = RivalScheduler(interval=1.0, max_per_tick=2)
+    for rival in "abcde":
+        scheduler.add(rival, 0.0)
+    assert scheduler.due(0.0) == ["a", "b"]
+    assert scheduler.due(0.0) == ["c", "d"]
+    assert scheduler.due(0.0) == ["e"]
+    assert scheduler.deferred == 2
+    assert len(scheduler) == 5
+
+
+def test_late_rival_does_not_burst_missed_turns():
+    scheduler = RivalScheduler(interval=0.5)
+    scheduler.add("a", 0.0)
+    assert scheduler.due(3.0) == ["a"]
+    assert scheduler.due(3.0) == []
+    assert scheduler.next_turn() == 3.5
+
+
+def test_remove():
+    scheduler = RivalScheduler(interval=0.5)
+    scheduler.add_staggered(["a", "b"])
+    scheduler.remove("a")
+    assert scheduler.due(10) == ["b"]
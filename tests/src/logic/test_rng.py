@@ -0,0 +1,23 @@
+from src.logic.rng import RandomStreams
+
+
+def test_streams_are_reproducible():
+    a = RandomStreams(42)
+    b = RandomStreams(42)
+    assert [a.get("weather").random() for _ in range(5)] == [b.get("weather").random() for _ in range(5)]
+
+
+def test_streams_are_independent():
+    a = RandomStreams(42)
+    b = RandomStreams(42)
+    for _ in range(100):
+        a.get("ui").random()
+    assert a.get("weather").random() == b.get("weather").random()
+    assert a.get("weather") is a.get("weather")
+    assert "ui" in a and "ui" not in b
+
+
+def test_random_seed_is_recorded():
+    streams = RandomStreams()
+    replay = RandomStreams(streams.seed)
+    assert streams.get("rival").random() == replay.get("rival").random()
@@ -0,0 +1,48 @@
+from src.logic.route import Route
+
+
+def test_advance_and_remaining():
+    route = Route([(1, 0), (2, 0), (2, 1)], origin=(0, 0))
+    assert len(route) == 3
+    assert route.peek() == (1, 0)
+    assert route.peek(2) == (2, 1)
+    assert route.peek(3) is None
+    assert route.advance() == (1, 0)
+    assert route.remaining == 2
+    assert route.tiles() == [(2, 0), (2, 1)]
+    assert route.goal == (2, 1)
+
+
+def test_empty_route():
+    route = Route()
+    assert not route
+    assert route.peek() is None
+    assert route.advance() is None
+    assert route.goal is None
+
+
+def test_sync_consumes_step_when_agent_arrives():
+    route = Route([(1, 0), (2, 0)], origin=(0, 0))
+    assert route.sync((0, 0))
+    assert route.remaining == 2
+    assert route.sync([1, 0])
+    assert route.remaining == 1
+    # El agente no se movió (p. ej. sin resistencia): la ruta sigue válida
+    assert route.sync((1, 0))
+    assert route.peek() == (2, 0)
+
+
+def test_sync_detects_drift():
+    route = Route([(1, 0), (2, 0)], origin=(0, 0))
+    assert not route.sync((0, 1))
+    assert route.remaining == 2
+
+
+def test_skip_to_and_clear():
+    route = Route([(1, 0), (2, 0), (3, 0)], origin=(0, 0))
+    assert route.skip_to((2, 0))
+    assert route.peek() == (3, 0)
+    assert not route.skip_to((1, 0))
+    route.clear()
+    assert not route
+    assert route.goal is None
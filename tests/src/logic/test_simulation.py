@@ -0,0 +1,270 @@
+import json
+
+import pytest
+
+from src.logic.simulation import FIXED_DT, Simulation
+from src.logic.weather import Weather
+
+
+def _map_data():
+    tiles = [["C"] * 16 for _ in range(16)]
+    for y in range(4, 12):
+        tiles[y][8] = "B"
+    return {
+        "width": 16,
+        "height": 16,
+        "tiles": tiles,
+        "legend": {
+            "C": {"name": "calle", "surface_weight": 1.00},
+            "B": {"name": "edificio", "blocked": True},
+        },
+        "goal": 1000,
+    }
+
+
+def _weather():
+    with open("tests/data/weather.json", "r") as f:
+        data = json.load(f)["data"]
+    return Weather(initial_state=data["initial"]["condition"], transition=data["transition"])
+
+
+@pytest.fixture
+def jobs():
+    with open("tests/data/pedidos.json", "r") as f:
+        return json.load(f)
+
+
+@pytest.fixture
+def simulation(jobs):
+    return Simulation(_map_data(), jobs, _weather(), "hard")
+
+
+def test_runs_a_full_game_headless(jobs):
+    simulation = Simulation(_map_data(), jobs, _weather(), "medium", game_duration=120)
+    while not simulation.game_over:
+        simulation.update(0.1)
+    assert simulation.elapsed_time == pytest.approx(120, abs=0.11)
+    assert simulation.victory is False
+    assert simulation.rival.total_income > 0
+    assert simulation.rival.deliveries > 0
+    assert simulation.calculate_score() == 0
+
+
+def test_hard_rival_carries_several_orders():
+    # Recogidas juntas y entregas al otro lado de la pared: conviene llevarlos a la vez
+    jobs = [
+        {"id": f"J{i}", "pickup": [2, 2 + i], "dropoff": [13, 3 + i], "payout": 150,
+         "deadline": "2025-09-01T12:10:00", "weight": 2, "priority": 0, "release_time": 0}
+        for i in range(4)
+    ]
+    simulation = Simulation(_map_data(), jobs, _weather(), "hard", game_duration=120, seed=3)
+    rival = simulation.rival
+    most_carried = 0
+    while not simulation.game_over:
+        simulation.update(0.1)
+        most_carried = max(most_carried, rival.inventory.order_count)
+        assert rival.inventory.current_weight <= rival.inventory.max_weight
+    assert most_carried > 1
+    assert rival.deliveries > 0
+    # Las entregas que se llevan no pierden sus tablas de distancia
+    index = simulation.order_manager.distance_index
+    assert all(order.dropoff in index for order in rival.inventory.orders_by("deadline"))
+
+
+def test_hard_rival_replans_on_game_time(monkeypatch):
+    from src.logic.strategies.hard_strategy import HardStrategy
+    jobs = [
+        {"id": "J0", "pickup": [2, 2], "dropoff": [13, 3], "payout": 150,
+         "deadline": "2025-09-01T12:10:00", "weight": 2, "priority": 0, "release_time": 30},
+    ]
+    simulation = Simulation(_map_data(), jobs, _weather(), "hard", game_duration=60, seed=3)
+    replans = []
+    replan = HardStrategy._replan
+
+    def counting(self, current_pos):
+        replans.append(simulation.elapsed_time)
+        replan(self, current_pos)
+
+    monkeypatch.setattr(HardStrategy, "_replan", counting)
+    while simulation.elapsed_time < 29:
+        simulation.update(FIXED_DT)
+    # Sin pedidos no replanifica en cada turno, sino cada 5-10 segundos de juego
+    assert 3 <= len(replans) <= 6
+    assert all(5.0 <= b - a <= 10.0 for a, b in zip(replans, replans[1:]))
+    # Un pedido nuevo se planifica en el siguiente turno
+    while simulation.elapsed_time < 31:
+        simulation.update(FIXED_DT)
+    assert replans[-1] >= 30
+    assert simulation.rival.strategy.plan is not None and len(simulation.rival.strategy.plan) == 2
+
+
+def test_rival_orders_expire_too(jobs):
+    from src.logic.order import Order
+    simulation = Simulation(_map_data(), jobs, _weather(), ["hard", "medium"],
+                            game_duration=60, seed=2)
+    overdue = {"id": "X", "pickup": [1, 1], "dropoff": [15, 15], "payout": 100,
+               "deadline": "2025-09-01T12:00:01", "weight": 1, "priority": 0, "release_time": 0}
+    for rival in simulation.rivals:
+        rival.inventory.add_order(Order.from_dict(overdue))
+    simulation.rivals[0].strategy._pin(simulation.rivals[0].inventory.orders_by("deadline")[0])
+    reputation = simulation.rivals[0].reputation
+    while simulation.elapsed_time < 1.5:
+        simulation.update(FIXED_DT)
+    for rival in simulation.rivals:
+        assert all(order.id != "X" for order in rival.inventory.orders_by("deadline"))
+        assert rival.reputation == reputation - 6
+    assert simulation.rivals[0].strategy._pinned == {}
+
+
+def test_easy_rival_weights_every_open_order():
+    jobs = [
+        {"id": f"J{i}", "pickup": [xy, xy], "dropoff": [15, 0], "payout": 100,
+         "deadline": "2025-09-01T12:10:00", "weight": 1, "priority": 0, "release_time": 0}
+        for i, xy in enumerate((1, 1, 3, 14))
+    ]
+    simulation = Simulation(_map_data(), jobs, _weather(), "easy", seed=4)
+    simulation.order_manager.update_available(0)
+    strategy = simulation.rival.strategy
+    draws = []
+
+    def choices(population, weights, k):
+        draws.append(dict(zip((order.id for order in population), weights)))
+        return population[:k]
+
+    strategy.rng.choices = choices
+    strategy.re_evaluation_timer = 0
+    strategy.decide_job_action(0.1)
+    # Los pedidos lejanos también pueden salir, con peso 1 / (distancia + 1)
+    assert draws == [{"J0": 1 / 3, "J1": 1 / 3, "J2": 1 / 7, "J3": 1 / 29}]
+
+
+def test_rival_strategies_get_the_time_since_their_last_turn(jobs):
+    simulation = Simulation(_map_data(), jobs, _weather(), ["easy", "medium", "hard"],
+                            game_duration=60, seed=1)
+    elapsed = {id(rival): [] for rival in simulation.rivals}
+    for rival in simulation.rivals:
+        decide = rival.strategy.decide_job_action
+
+        def recording(dt, decide=decide, times=elapsed[id(rival)]):
+            times.append(dt)
+            return decide(dt)
+
+        rival.strategy.decide_job_action = recording
+    while simulation.elapsed_time < 10:
+        simulation.update(FIXED_DT)
+    for times in elapsed.values():
+        # Los timers de 5-15 s avanzan al ritmo del juego, no FIXED_DT por turno
+        assert sum(times) == pytest.approx(10, abs=0.61)
+        assert all(dt == pytest.approx(0.6, abs=0.02) for dt in times[1:])
+
+
+def test_move_player_respects_blocked_tiles(simulation):
+    simulation.player.x, simulation.player.y = 7, 5
+    assert simulation.move_player(1, 0) is False
+    assert (simulation.player.x, simulation.player.y) == (7, 5)
+    assert simulation.message == "No puedes moverte ahí"
+    assert simulation.move_player(0, 1) is True
+    assert (simulation.player.x, simulation.player.y) == (7, 6)
+
+
+def test_player_accepts_and_delivers(simulation):
+    simulation.update(0.1)
+    order = simulation.order_manager.get_available()[0]
+    simulation.player.x, simulation.player.y = order.pickup
+    simulation.accept_order_at_location()
+    assert not simulation.order_manager.is_available(order.id)
+
+    simulation.player.x, simulation.player.y = order.dropoff
+    simulation.complete_delivery()
+    assert simulation.player.total_income > 0
+    assert simulation.message.startswith("¡Entregado!")
+
+
+def test_game_ends_once(simulation):
+    simulation.end_game(True)
+    simulation.end_game(False)
+    assert simulation.game_over and simulation.victory
+
+
+def _snapshot(simulation):
+    rival, player = simulation.rival, simulation.player
+    return (
+        simulation.tick,
+        simulation.current_weather,
+        simulation.weather_timer,
+        (player.x, player.y, player.stamina, player.total_income),
+        (rival.x, rival.y, rival.total_income, rival.reputation),
+        [o.id for o in simulation.order_manager.get_available()],
+    )
+
+
+def _input_log():
+    log = []
+    for tick in range(0, 3000, 7):
+        log.append((tick, "move", ((1, 0), (0, 1), (-1, 0), (0, -1))[tick % 4]))
+        if tick % 5 == 0:
+            log.append((tick, "accept", ()))
+    return log
+
+
+def test_same_seed_and_inputs_replay_identically(jobs):
+    runs = []
+    for _ in range(2):
+        simulation = Simulation(_map_data(), jobs, _weather(), "hard", game_duration=60, seed=7)
+        simulation.replay(_input_log())
+        runs.append((_snapshot(simulation), simulation.input_log))
+    assert runs[0] == runs[1]
+    assert runs[0][1] == _input_log()[:len(runs[0][1])]
+
+
+def test_frame_rate_does_not_change_outcome(jobs):
+    snapshots = []
+    for frame_dt in (1 / 60, 1 / 24, 0.5):
+        simulation = Simulation(_map_data(), jobs, _weather(), "medium", game_duration=30, seed=3)
+        while not simulation.game_over:
+            simulation.advance(frame_dt)
+        snapshots.append(_snapshot(simulation))
+    assert snapshots[0] == snapshots[1] == snapshots[2]
+
+
+def test_advance_caps_ticks_per_call(simulation):
+    assert simulation.advance(1.0, max_steps=4) == 4
+    assert simulation.accumulator == 0.0
+    assert simulation.advance(0.001) == 0
+
+
+def test_many_rivals_share_the_game(jobs):
+    simulation = Simulation(_map_data(), jobs, _weather(), ["easy", "hard"],
+                            game_duration=60, seed=5, rival_count=6)
+    assert len(simulation.rivals) == 6
+    assert simulation.rival is simulation.rivals[0]
+    assert (simulation.rival.x, simulation.rival.y) == (0, 0)
+    assert all(not simulation.city.is_blocked(r.x, r.y) for r in simulation.rivals)
+    assert [type(r.strategy).__name__ for r in simulation.rivals[:3]] == [
+        "EasyStrategy", "HardStrategy", "EasyStrategy"]
+
+    acted_per_tick = []
+    while not simulation.game_over:
+        before = [(r.x, r.y) for r in simulation.rivals]
+        simulation.update(FIXED_DT)
+        acted_per_tick.append(sum(b != (r.x, r.y) for b, r in zip(before, simulation.rivals)))
+    # Los turnos escalonados evitan que todos se muevan en el mismo tick
+    assert max(acted_per_tick) <= 2
+    assert sum(r.deliveries for r in simulation.rivals) > 0
+
+
+def test_path_pool_keeps_games_reproducible(jobs):
+    # Con la configuración por defecto de las estrategias las rutas pasan por el pool
+    snapshots = []
+    for _ in range(2):
+        simulation = Simulation(_map_data(), jobs, _weather(), "hard", game_duration=40,
+                                seed=9, path_workers=2)
+        try:
+            while not simulation.game_over:
+                simulation.advance(0.25)
+            assert simulation.path_pool.queries > 0
+            snapshots.append(_snapshot(simulation))
+        finally:
+            simulation.close()
+    assert snapshots[0] == snapshots[1]
+    assert snapshots[0][4][2] > 0  # el rival entregó algo
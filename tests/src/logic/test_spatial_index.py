@@ -0,0 +1,57 @@
+import random
+from src.logic.spatial_index import OrderSpatialIndex
+
+
+def _brute_nearest(orders, pos, k):
+    return sorted(
+        abs(t[0] - pos[0]) + abs(t[1] - pos[1]) for t in orders.values()
+    )[:k]
+
+
+def test_nearest_matches_brute_force():
+    rng = random.Random(7)
+    index = OrderSpatialIndex(bucket_size=4)
+    tiles = {}
+    for i in range(300):
+        tile = (rng.randrange(60), rng.randrange(60))
+        tiles[i] = tile
+        index.add(i, tile, i)
+    for _ in range(50):
+        pos = (rng.randrange(60), rng.randrange(60))
+        k = rng.randint(1, 12)
+        found = index.nearest(pos, k)
+        distances = [abs(tiles[i][0] - pos[0]) + abs(tiles[i][1] - pos[1]) for i in found]
+        assert distances == _brute_nearest(tiles, pos, k)
+
+
+def test_within_radius_matches_brute_force():
+    rng = random.Random(3)
+    index = OrderSpatialIndex(bucket_size=5)
+    tiles = {i: (rng.randrange(40), rng.randrange(40)) for i in range(200)}
+    for i, tile in tiles.items():
+        index.add(i, tile, i)
+    pos, radius = (20, 17), 6
+    expected = {i for i, t in tiles.items() if abs(t[0] - pos[0]) + abs(t[1] - pos[1]) <= radius}
+    assert set(index.within_radius(pos, radius)) == expected
+
+
+def test_remove_cleans_buckets():
+    index = OrderSpatialIndex()
+    index.add("A", (1, 1), "a")
+    index.add("B", (1, 1), "b")
+    index.remove("A")
+    index.remove("missing")
+    assert index.orders_at((1, 1)) == ["b"]
+    index.remove("B")
+    assert len(index) == 0
+    assert index.orders_at((1, 1)) == []
+    assert index.nearest((0, 0), 3) == []
+    assert index._buckets == {}
+
+
+def test_readd_moves_order():
+    index = OrderSpatialIndex()
+    index.add("A", (1, 1), "a")
+    index.add("A", (30, 30), "a")
+    assert index.orders_at((1, 1)) == []
+    assert index.nearest((29, 29)) == ["a"]
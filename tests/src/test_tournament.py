@@ -0,0 +1,62 @@
+import json
+
+import pytest
+
+from src import tournament
+from tests.src.logic.test_simulation import _map_data
+
+
+@pytest.fixture
+def scenario_files(tmp_path):
+    map_path = tmp_path / "mapa.json"
+    map_path.write_text(json.dumps({"data": _map_data()}))
+    return [str(map_path)], ["tests/data/pedidos.json"], "tests/data/weather.json"
+
+
+def test_load_scenarios_from_files(scenario_files):
+    scenarios = tournament.load_scenarios(*scenario_files)
+    assert len(scenarios) == 1
+    assert scenarios[0]["map"]["width"] == 16
+    assert scenarios[0]["weather"]["initial"] in scenarios[0]["weather"]["transition"]
+
+
+def test_tournament_is_reproducible(scenario_files):
+    scenarios = tournament.load_scenarios(*scenario_files)
+    first = tournament.run_tournament(scenarios, ["easy", "hard"], games=2, duration=20, workers=1)
+    second = tournament.run_tournament(scenarios, ["easy", "hard"], games=2, duration=20, workers=1)
+    strip = lambda rows: [{k: v for k, v in r.items() if not k.startswith("tick_us")} for r in rows]
+    assert strip(first) == strip(second)
+    assert [r["seed"] for r in first] == [0, 1, 0, 1]
+    assert all(r["ticks"] == 1200 for r in first)
+
+
+def test_process_pool_matches_inline(scenario_files):
+    scenarios = tournament.load_scenarios(*scenario_files)
+    inline = tournament.run_tournament(scenarios, ["medium"], games=2, duration=10, workers=1)
+    pooled = tournament.run_tournament(scenarios, ["medium"], games=2, duration=10, workers=2)
+    assert [r["income"] for r in pooled] == [r["income"] for r in inline]
+
+
+def test_cli_prints_report(scenario_files, capsys, tmp_path):
+    maps, jobs, weather = scenario_files
+    out = tmp_path / "resultados.json"
+    tournament.main([
+        "--games", "1", "--strategies", "hard", "--map", maps[0], "--jobs", jobs[0],
+        "--weather", weather, "--duration", "5", "--workers", "1", "--json", str(out),
+    ])
+    report = capsys.readouterr().out
+    assert "hard" in report
+    assert json.loads(out.read_text())[0]["strategy"] == "hard"
+
+
+def test_cli_rejects_unknown_strategy(scenario_files):
+    with pytest.raises(SystemExit):
+        tournament.main(["--strategies", "expert"])
+
+
+def test_lineup_reports_each_strategy(scenario_files):
+    scenarios = tournament.load_scenarios(*scenario_files)
+    rows = tournament.run_tournament(scenarios, ["easy+hard"], games=1, duration=10,
+                                     workers=1, rival_count=4)
+    assert [(r["strategy"], r["rivals"]) for r in rows] == [("easy", 2), ("hard", 2)]
+    assert set(tournament.summarize(rows)) == {"easy (easy+hard)", "hard (easy+hard)"}